@@ -1716,14 +1716,21 @@ def remove_dead_plugins2(client, dst_region: str, dst_agent: str) -> None:
         agents = client.globalcontroller.get_agent_list(dst_region)
         logger.info(f"Found {len(agents)} agents in region {dst_region}")
 
+        # Request every agent's plugin list in one round-trip
+        with client.messaging.batch() as batch:
+            for agent in agents:
+                batch.global_agent_msgevent(True, 'CONFIG', {'action': 'pluginlist'}, dst_region, agent['name'])
+
         # Check each agent for plugins to remove
-        for agent in agents:
+        for agent, plugin_reply in zip(agents, batch.results):
             agent_name = agent['name']
             logger.info(f"Checking agent: {agent_name}")
 
             # Get plugin list for this agent
             try:
-                reply = client.agents.list_plugin_agent(dst_region, agent_name)
+                if isinstance(plugin_reply, Exception):
+                    raise plugin_reply
+                reply = client.agents.decode_plugin_list(plugin_reply)
 
                 # Look for filerepo plugins to remove
                 for plugin in reply:
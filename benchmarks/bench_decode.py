@@ -0,0 +1,125 @@
+"""
+Benchmark of where large compressed replies are decoded in an asyncio client.
+
+Decodes ``agentslist`` fields of several fleet sizes through
+``pycrescolib.decoding.reply_decoder`` forced into each mode (inline on
+the loop, thread pool, process pool). For every size and mode it reports:
+
+- time to decode one field
+- the longest stall of a 1 ms heartbeat task on the same loop
+- fields per second with several decodes in flight at once
+
+The fleet size where the thread mode starts to cut the stall without
+costing time is where ``DECODE_THRESHOLD`` belongs.
+
+Usage:
+    python -m benchmarks.bench_decode [--agents 100 1000 10000 100000] [--codec json] [--json results.json]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from pycrescolib import utils
+from pycrescolib.decoding import reply_decoder
+
+from .common import environment, make_agent_list_reply, print_table, write_results
+
+MODES = ('inline', 'thread', 'process')
+
+
+def _decoder(mode, workers):
+    """A reply_decoder that sends every field to ``mode``."""
+    if mode == 'inline':
+        return reply_decoder(threads=0)
+    if mode == 'thread':
+        return reply_decoder(threshold=0, threads=workers)
+    return reply_decoder(threads=0, processes=workers, process_threshold=0)
+
+
+async def _timed(decoder, param, concurrency):
+    """Decode ``concurrency`` copies of ``param`` at once while a heartbeat runs.
+
+    Returns:
+        (elapsed seconds, longest heartbeat gap in seconds)
+    """
+    gaps = []
+    done = asyncio.Event()
+
+    async def heartbeat():
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0.005)
+    start = time.perf_counter()
+    await asyncio.gather(*[decoder.decode_async(param) for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    done.set()
+    await beat
+    return elapsed, max(gaps)
+
+
+async def bench_size(count, modes, rounds, concurrency, workers):
+    """Run every mode on an agent list of ``count`` agents."""
+    param = make_agent_list_reply(count)['agentslist']
+    rows = []
+    for mode in modes:
+        decoder = _decoder(mode, workers)
+        try:
+            await decoder.decode_async(param)  # Start the pool
+            single = [await _timed(decoder, param, 1) for _ in range(rounds)]
+            batch = [await _timed(decoder, param, concurrency) for _ in range(rounds)]
+        finally:
+            decoder.close()
+        rows.append({
+            'agents': count,
+            'field_bytes': len(param),
+            'mode': mode,
+            'decode_ms': min(elapsed for elapsed, _ in single) * 1e3,
+            'stall_ms': min(gap for _, gap in single) * 1e3,
+            'fields_per_s': concurrency / min(elapsed for elapsed, _ in batch),
+        })
+    return rows
+
+
+async def run(args):
+    """Run the benchmark and return the results dict."""
+    results = {'environment': environment(), 'config': vars(args).copy(), 'rows': []}
+    for count in args.agents:
+        results['rows'].extend(await bench_size(count, args.modes, args.rounds, args.concurrency, args.workers))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--agents', type=int, nargs='+', default=[100, 1000, 10000, 100000],
+                        help='Fleet sizes to decode')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES), help='Modes to compare')
+    parser.add_argument('--codec', choices=utils.JSON_CODECS, help='JSON codec (default: the fastest installed)')
+    parser.add_argument('--workers', type=int, default=2, help='Threads or processes per pool')
+    parser.add_argument('--concurrency', type=int, default=4, help='Decodes in flight for the fields/s column')
+    parser.add_argument('--rounds', type=int, default=3, help='Rounds per mode; the best is reported')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    if args.codec:
+        # Worker processes pick the codec up from the environment on import
+        os.environ['PYCRESCOLIB_JSON_CODEC'] = args.codec
+        utils.set_json_codec(args.codec)
+
+    results = asyncio.run(run(args))
+    results['codec'] = utils.get_json_codec()
+
+    print_table([[row['agents'], row['field_bytes'], row['mode'], f"{row['decode_ms']:.1f}",
+                  f"{row['stall_ms']:.1f}", f"{row['fields_per_s']:.1f}"] for row in results['rows']],
+                ['agents', 'field bytes', 'mode', 'decode (ms)', 'loop stall (ms)', 'fields/s'])
+    write_results(results, args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Startup benchmark: how long importing the client takes in a fresh interpreter.
+
+Each round starts a new Python process, times ``import <module>`` and
+records which heavy, lazily loaded dependencies were pulled in anyway. One
+extra run with ``-X importtime`` lists the slowest modules by self time.
+
+Usage:
+    python -m benchmarks.bench_import [--module pycrescolib.clientlib] [--rounds 20] [--json results.json]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from .common import environment, print_table, write_results
+
+# Modules that should only be imported when the feature using them is used.
+# zipfile is not one of them: websockets imports it on every run.
+LAZY_MODULES = (
+    'cryptography.x509',
+    'http.server',
+    'pycrescolib.dataplane',
+    'pycrescolib.logstreamer',
+)
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'ms': elapsed * 1000, 'loaded': [name for name in {lazy!r} if name in sys.modules]}}))
+"""
+
+
+def time_import(module, rounds):
+    """Import ``module`` in ``rounds`` fresh interpreters.
+
+    Returns:
+        Dict with best and median milliseconds and the lazy modules loaded
+    """
+    code = _PROBE.format(module=module, lazy=LAZY_MODULES)
+    timings = []
+    loaded = set()
+    for _ in range(rounds):
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result['ms'])
+        loaded.update(result['loaded'])
+
+    return {
+        'best_ms': min(timings),
+        'median_ms': statistics.median(timings),
+        'rounds': rounds,
+        'eagerly_loaded': sorted(loaded),
+    }
+
+
+def slowest_modules(module, top):
+    """Run ``-X importtime`` once and return the ``top`` modules by self time."""
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, check=True).stderr
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        entries.append({'module': name.strip(), 'self_us': int(self_us), 'cumulative_us': int(cumulative_us)})
+    entries.sort(key=lambda entry: entry['self_us'], reverse=True)
+    return entries[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--module', nargs='+', default=['pycrescolib.clientlib'], help='Modules to import')
+    parser.add_argument('--rounds', type=int, default=20, help='Fresh interpreters per module')
+    parser.add_argument('--top', type=int, default=15, help='Slowest modules to list')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    results = {'environment': environment(), 'modules': {}}
+    for module in args.module:
+        results['modules'][module] = time_import(module, args.rounds)
+        results['modules'][module]['slowest'] = slowest_modules(module, args.top)
+
+    rows = [[module, f"{stats['best_ms']:.1f}", f"{stats['median_ms']:.1f}", ', '.join(stats['eagerly_loaded']) or '-']
+            for module, stats in results['modules'].items()]
+    print_table(rows, ['module', 'best (ms)', 'median (ms)', 'lazy modules loaded'])
+
+    for module, stats in results['modules'].items():
+        print(f"\nSlowest imports under {module} (self time):")
+        print_table([[entry['module'], entry['self_us'], entry['cumulative_us']] for entry in stats['slowest']],
+                    ['module', 'self (us)', 'cumulative (us)'])
+
+    write_results(results, args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Micro-benchmark of the JSON codecs on the message envelope hot path.
+
+Compares every installed backend from ``pycrescolib.utils.JSON_CODECS`` on
+realistic ``listagents`` traffic: encoding the request envelope, parsing the
+reply envelope, and decoding the nested gzip+base64 agent list.
+
+Usage:
+    python -m benchmarks.bench_json_codec [--agents 10 1000 10000] [--json results.json]
+"""
+import argparse
+
+from pycrescolib import utils
+
+from .common import environment, make_agent_list_reply, measure, print_table, write_results
+
+
+def run(agent_counts, repeat=5):
+    """Run the benchmark for every installed codec.
+
+    Returns:
+        Results dict keyed by codec, then case, then agent count
+    """
+    previous = utils.get_json_codec()
+    results = {'environment': environment(), 'codecs': {}}
+
+    request = {
+        'message_info': {
+            'message_type': 'global_controller_msgevent',
+            'message_event_type': 'EXEC',
+            'is_rpc': True,
+            'request_id': '12345',
+        },
+        'message_payload': {'action': 'listagents', 'action_region': 'region-1'},
+    }
+
+    try:
+        for codec in utils.JSON_CODECS:
+            try:
+                utils.set_json_codec(codec)
+            except ImportError:
+                continue
+
+            cases = results['codecs'][codec] = {}
+            cases['encode_request'] = measure(lambda: utils.json_dumps(request), repeat)
+
+            for count in agent_counts:
+                reply_text = utils.json_dumps(make_agent_list_reply(count))
+                compressed = utils.json_loads(reply_text)['agentslist']
+
+                cases[f'parse_reply_{count}'] = measure(lambda: utils.json_loads(reply_text), repeat)
+                cases[f'decode_agentslist_{count}'] = measure(
+                    lambda: utils.json_deserialize(utils.decompress_param(compressed)), repeat)
+                cases[f'decompress_json_{count}'] = measure(
+                    lambda: utils.decompress_json(compressed), repeat)
+    finally:
+        utils.set_json_codec(previous)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--agents', type=int, nargs='+', default=[10, 1000, 10000],
+                        help='Agent list sizes to test')
+    parser.add_argument('--repeat', type=int, default=5, help='Rounds per case')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    results = run(args.agents, args.repeat)
+
+    baseline = results['codecs']['json']
+    rows = []
+    for codec, cases in results['codecs'].items():
+        for case, stats in cases.items():
+            speedup = baseline[case]['best_us'] / stats['best_us']
+            rows.append([codec, case, f"{stats['best_us']:.1f}", f"{speedup:.2f}x"])
+    print_table(rows, ['codec', 'case', 'best (us)', 'vs json'])
+
+    write_results(results, args.json)
+
+
+if __name__ == '__main__':
+    main()
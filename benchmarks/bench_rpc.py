@@ -0,0 +1,248 @@
+"""
+End-to-end benchmark of clientlib RPCs against a controller.
+
+By default every case runs against a local ``pycrescolib.standin`` server,
+so results depend only on the client and the machine. Cases:
+
+- connect: time to open the apisocket and read the controller identity
+- latency: percentiles of sequential ``getagentinfo`` round-trips
+- throughput: sustained RPC/s and latency with 1..N caller threads
+- upload: ``jardata`` upload throughput for several payload sizes
+- decode: ``get_agent_list`` cost and client-side decode for several fleet sizes
+
+Usage:
+    python -m benchmarks.bench_rpc [--cases latency throughput] [--threads 1 4 16] [--json results.json]
+"""
+import argparse
+import logging
+import os
+import threading
+import time
+
+from pycrescolib.clientlib import clientlib
+from pycrescolib.standin import standin_server
+from pycrescolib.utils import compress_param, decompress_json, encode_data, json_dumps
+from pycrescolib.wsconfig import PRESETS
+
+from .common import environment, make_agent_list_reply, measure, percentiles, print_table, write_results
+
+CASES = ('connect', 'latency', 'throughput', 'upload', 'decode')
+
+SERVICE_KEY = 'benchmark'
+
+
+def _connect(port, pool_size=1, websocket='throughput'):
+    client = clientlib('localhost', port, SERVICE_KEY, pool_size=pool_size, websocket=websocket)
+    if not client.connect():
+        raise RuntimeError(f"Could not connect to localhost:{port}")
+    return client
+
+
+def bench_connect(port, rounds, websocket):
+    """Open and close ``rounds`` clients and time each connect."""
+    samples = []
+    for _ in range(rounds):
+        client = clientlib('localhost', port, SERVICE_KEY, websocket=websocket)
+        start = time.perf_counter()
+        connected = client.connect()
+        samples.append(time.perf_counter() - start)
+        client.close()
+        if not connected:
+            raise RuntimeError(f"Could not connect to localhost:{port}")
+    return percentiles(samples)
+
+
+def bench_latency(client, agents, calls):
+    """Time ``calls`` sequential getagentinfo round-trips."""
+    samples = []
+    for index in range(calls):
+        agent = agents[index % len(agents)]
+        start = time.perf_counter()
+        client.agents.get_agent_info(agent['region'], agent['name'])
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+def bench_throughput(client, agents, threads, duration):
+    """Run ``threads`` callers for ``duration`` seconds and report RPC/s.
+
+    Each caller walks its own slice of the fleet, so identical requests are
+    never in flight together and nothing is coalesced.
+    """
+    deadline = time.perf_counter() + duration
+    samples = [[] for _ in range(threads)]
+    errors = [0] * threads
+
+    def caller(worker):
+        index = worker
+        while time.perf_counter() < deadline:
+            agent = agents[index % len(agents)]
+            index += threads
+            start = time.perf_counter()
+            reply = client.agents.get_agent_info(agent['region'], agent['name'])
+            samples[worker].append(time.perf_counter() - start)
+            if not reply:
+                errors[worker] += 1
+
+    workers = [threading.Thread(target=caller, args=(worker,)) for worker in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    merged = [sample for worker_samples in samples for sample in worker_samples]
+    result = percentiles(merged)
+    result.update({'threads': threads, 'rpc_per_s': len(merged) / elapsed, 'errors': sum(errors)})
+    return result
+
+
+def bench_upload(client, size_mb, rounds):
+    """Upload ``size_mb`` of random jardata ``rounds`` times, the way upload_plugin_agent does."""
+    jar = os.urandom(int(size_mb * 1024 * 1024))
+    configparams = compress_param(json_dumps({'pluginname': 'io.cresco.benchmark', 'version': '1.0'}))
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        payload = {'action': 'pluginupload', 'configparams': configparams, 'jardata': encode_data(jar)}
+        reply = client.messaging.global_agent_msgevent(True, 'CONFIG', payload, 'region-0', 'agent-000000',
+                                                       timeout=120.0)
+        samples.append(time.perf_counter() - start)
+        if not reply:
+            raise RuntimeError(f"Upload of {size_mb} MB failed")
+    result = percentiles(samples)
+    result.update({'size_mb': size_mb, 'mb_per_s': size_mb / min(samples)})
+    return result
+
+
+def bench_decode(count, repeat, websocket):
+    """Time ``get_agent_list`` for a fleet of ``count`` agents served by a dedicated stand-in.
+
+    The client-side decode of the same reply is timed on its own, so the
+    transport share of the round-trip can be told apart. A reply the client
+    cannot receive (e.g. one over the websocket frame limit) is reported as
+    an error instead of a timing.
+    """
+    reply = make_agent_list_reply(count)
+    result = {
+        'agents': count,
+        'reply_bytes': len(json_dumps(reply)),
+        'decode_us': measure(lambda: decompress_json(reply['agentslist']), repeat=3)['best_us'],
+    }
+
+    with standin_server(port=0, agents=count, service_key=SERVICE_KEY) as server:
+        client = _connect(server.port, websocket=websocket)
+        try:
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                agents = client.globalcontroller.get_agent_list()
+                samples.append(time.perf_counter() - start)
+                if len(agents) != count:
+                    result['error'] = f"expected {count} agents, got {len(agents)}"
+                    return result
+            result.update(percentiles(samples))
+            return result
+        finally:
+            client.close()
+
+
+def run(args):
+    """Run the selected cases and return the results dict."""
+    results = {'environment': environment(), 'config': vars(args).copy(), 'cases': {}}
+    cases = results['cases']
+
+    server = None
+    port = args.port
+    if port is None:
+        server = standin_server(port=0, agents=args.fleet, regions=10, latency=args.server_latency,
+                                service_key=SERVICE_KEY).start()
+        port = server.port
+    try:
+        if 'connect' in args.cases:
+            cases['connect'] = bench_connect(port, args.connect_rounds, args.websocket)
+
+        if any(case in args.cases for case in ('latency', 'throughput', 'upload')):
+            client = _connect(port, args.pool_size, args.websocket)
+            try:
+                agents = client.globalcontroller.get_agent_list() or [{'region': 'region-0', 'name': 'agent-000000'}]
+                if 'latency' in args.cases:
+                    bench_latency(client, agents, min(100, args.calls))  # Warm up
+                    cases['latency'] = bench_latency(client, agents, args.calls)
+                if 'throughput' in args.cases:
+                    cases['throughput'] = [bench_throughput(client, agents, threads, args.duration)
+                                           for threads in args.threads]
+                if 'upload' in args.cases:
+                    cases['upload'] = [bench_upload(client, size, args.upload_rounds) for size in args.upload_mb]
+            finally:
+                client.close()
+    finally:
+        if server is not None:
+            server.stop()
+
+    if 'decode' in args.cases:
+        cases['decode'] = [bench_decode(count, args.decode_rounds, args.websocket) for count in args.agents]
+
+    return results
+
+
+def report(results):
+    """Print one table per case."""
+    cases = results['cases']
+    if 'connect' in cases or 'latency' in cases:
+        rows = [[name] + [f"{cases[name][key]:.2f}" for key in ('p50', 'p90', 'p99', 'max')]
+                for name in ('connect', 'latency') if name in cases]
+        print_table(rows, ['case', 'p50 (ms)', 'p90 (ms)', 'p99 (ms)', 'max (ms)'])
+        print()
+    if 'throughput' in cases:
+        print_table([[row['threads'], f"{row['rpc_per_s']:.0f}", f"{row['p50']:.2f}", f"{row['p99']:.2f}", row['errors']]
+                     for row in cases['throughput']],
+                    ['threads', 'rpc/s', 'p50 (ms)', 'p99 (ms)', 'errors'])
+        print()
+    if 'upload' in cases:
+        print_table([[row['size_mb'], f"{row['mb_per_s']:.1f}", f"{row['p50']:.1f}"] for row in cases['upload']],
+                    ['size (MB)', 'best MB/s', 'p50 (ms)'])
+        print()
+    if 'decode' in cases:
+        print_table([[row['agents'], row['reply_bytes'], row['error'] if 'error' in row else f"{row['p50']:.2f}",
+                      f"{row['decode_us'] / 1000:.2f}"]
+                     for row in cases['decode']],
+                    ['agents', 'reply bytes', 'get_agent_list p50 (ms)', 'decode (ms)'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--cases', nargs='+', choices=CASES, default=list(CASES), help='Cases to run')
+    parser.add_argument('--port', type=int,
+                        help=f"Existing controller on localhost to use (service key '{SERVICE_KEY}'); "
+                             "default: start a stand-in")
+    parser.add_argument('--fleet', type=int, default=1000, help='Agents in the stand-in fleet')
+    parser.add_argument('--server-latency', type=float, default=0.0, help='Seconds the stand-in adds per reply')
+    parser.add_argument('--pool-size', type=int, default=1, help='apisocket connections per client')
+    parser.add_argument('--websocket', choices=sorted(PRESETS), default='throughput',
+                        help='Websocket size/compression preset of the client')
+    parser.add_argument('--connect-rounds', type=int, default=20, help='Clients opened for the connect case')
+    parser.add_argument('--calls', type=int, default=2000, help='Sequential calls for the latency case')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8, 16],
+                        help='Caller thread counts for the throughput case')
+    parser.add_argument('--duration', type=float, default=3.0, help='Seconds per throughput run')
+    parser.add_argument('--upload-mb', type=float, nargs='+', default=[1, 8, 32], help='Upload sizes in MB')
+    parser.add_argument('--upload-rounds', type=int, default=3, help='Uploads per size')
+    parser.add_argument('--agents', type=int, nargs='+', default=[10, 1000, 100000],
+                        help='Fleet sizes for the decode case')
+    parser.add_argument('--decode-rounds', type=int, default=10, help='get_agent_list calls per fleet size')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    # Per-call INFO logging would dominate the timings
+    logging.getLogger('pycrescolib').setLevel(logging.ERROR)
+    logging.getLogger('websockets').setLevel(logging.CRITICAL)
+
+    results = run(args)
+    report(results)
+    write_results(results, args.json)
+
+
+if __name__ == '__main__':
+    main()
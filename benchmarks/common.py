@@ -0,0 +1,109 @@
+"""
+Shared helpers for the pycrescolib benchmarks.
+
+Run benchmarks from the repository root as modules, for example
+``python -m benchmarks.bench_json_codec``.
+"""
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from pycrescolib.standin import make_agent_list
+from pycrescolib.utils import compress_param
+
+
+def make_agent_list_reply(count: int, seed: int = 0) -> Dict[str, Any]:
+    """Build a ``listagents`` reply as the controller sends it (gzip+base64 inside JSON)."""
+    return {'agentslist': compress_param(json.dumps(make_agent_list(count, seed)))}
+
+
+def measure(func: Callable[[], Any], repeat: int = 5, min_time: float = 0.2) -> Dict[str, float]:
+    """Time ``func`` and return per-call statistics in microseconds.
+
+    Each of ``repeat`` rounds calls ``func`` enough times to run for at
+    least ``min_time`` seconds.
+
+    Args:
+        func: Zero-argument callable to time
+        repeat: Number of rounds
+        min_time: Minimum duration of a round in seconds
+
+    Returns:
+        Dict with best, median and number of calls per round
+    """
+    # Calibrate the number of calls per round
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 10 ** 6:
+            break
+        number *= 2
+
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        rounds.append((time.perf_counter() - start) / number * 1e6)
+
+    return {'best_us': min(rounds), 'median_us': statistics.median(rounds), 'calls': number}
+
+
+def percentiles(samples: List[float], scale: float = 1e3) -> Dict[str, float]:
+    """Summarize raw timings in seconds as p50/p90/p99/max, in milliseconds by default.
+
+    Args:
+        samples: Individual timings in seconds
+        scale: Factor applied to every value (1e3 for milliseconds)
+
+    Returns:
+        Dict with count, mean, p50, p90, p99 and max
+    """
+    if not samples:
+        return {'count': 0}
+    ordered = sorted(samples)
+
+    def rank(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * scale
+
+    return {
+        'count': len(ordered),
+        'mean': statistics.fmean(ordered) * scale,
+        'p50': rank(0.50),
+        'p90': rank(0.90),
+        'p99': rank(0.99),
+        'max': ordered[-1] * scale,
+    }
+
+
+def environment() -> Dict[str, str]:
+    """Describe the interpreter the results were taken on."""
+    return {
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+    }
+
+
+def write_results(results: Dict[str, Any], path: Optional[str]):
+    """Write results as JSON to ``path`` if given."""
+    if path:
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {path}")
+
+
+def print_table(rows: List[List[Any]], headers: List[str]):
+    """Print rows as a simple aligned table."""
+    table = [headers] + [[str(cell) for cell in row] for row in rows]
+    widths = [max(len(row[i]) for row in table) for i in range(len(headers))]
+    for index, row in enumerate(table):
+        print('  '.join(cell.ljust(width) for cell, width in zip(row, widths)))
+        if index == 0:
+            print('  '.join('-' * width for width in widths))
@@ -4,7 +4,7 @@ Admin module for Cresco administrative operations.
 import logging
 from typing import Dict, Any, Optional
 
-from .base_classes import CrescoMessageBase
+from .base_classes import CrescoMessageBase, operation
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -20,6 +20,7 @@ class admin(CrescoMessageBase):
         """
         super().__init__(messaging)
 
+    @operation("Error stopping controller")
     def stopcontroller(self, dst_region: str, dst_agent: str) -> None:
         """Stop a controller.
         
@@ -27,18 +28,15 @@ class admin(CrescoMessageBase):
             dst_region: Destination region
             dst_agent: Destination agent
         """
-        try:
-            message_event_type = 'CONFIG'
-            message_payload = {'action': 'stopcontroller'}
+        message_event_type = 'CONFIG'
+        message_payload = {'action': 'stopcontroller'}
 
-            logger.info(f"Stopping controller on {dst_region}/{dst_agent}")
-            self.messaging.global_agent_msgevent(
-                False, message_event_type, message_payload, dst_region, dst_agent
-            )
-        except Exception as e:
-            logger.error(f"Error stopping controller: {e}")
-            raise
+        logger.info(f"Stopping controller on {dst_region}/{dst_agent}")
+        yield self.messaging.global_agent_msgevent(
+            False, message_event_type, message_payload, dst_region, dst_agent
+        )
 
+    @operation("Error restarting controller")
     def restartcontroller(self, dst_region: str, dst_agent: str) -> None:
         """Restart a controller.
         
@@ -46,18 +44,15 @@ class admin(CrescoMessageBase):
             dst_region: Destination region
             dst_agent: Destination agent
         """
-        try:
-            message_event_type = 'CONFIG'
-            message_payload = {'action': 'restartcontroller'}
+        message_event_type = 'CONFIG'
+        message_payload = {'action': 'restartcontroller'}
 
-            logger.info(f"Restarting controller on {dst_region}/{dst_agent}")
-            self.messaging.global_agent_msgevent(
-                False, message_event_type, message_payload, dst_region, dst_agent
-            )
-        except Exception as e:
-            logger.error(f"Error restarting controller: {e}")
-            raise
+        logger.info(f"Restarting controller on {dst_region}/{dst_agent}")
+        yield self.messaging.global_agent_msgevent(
+            False, message_event_type, message_payload, dst_region, dst_agent
+        )
 
+    @operation("Error restarting framework")
     def restartframework(self, dst_region: str, dst_agent: str) -> None:
         """Restart the framework.
         
@@ -65,18 +60,15 @@ class admin(CrescoMessageBase):
             dst_region: Destination region
             dst_agent: Destination agent
         """
-        try:
-            message_event_type = 'CONFIG'
-            message_payload = {'action': 'restartframework'}
+        message_event_type = 'CONFIG'
+        message_payload = {'action': 'restartframework'}
 
-            logger.info(f"Restarting framework on {dst_region}/{dst_agent}")
-            self.messaging.global_agent_msgevent(
-                False, message_event_type, message_payload, dst_region, dst_agent
-            )
-        except Exception as e:
-            logger.error(f"Error restarting framework: {e}")
-            raise
+        logger.info(f"Restarting framework on {dst_region}/{dst_agent}")
+        yield self.messaging.global_agent_msgevent(
+            False, message_event_type, message_payload, dst_region, dst_agent
+        )
 
+    @operation("Error killing JVM")
     def killjvm(self, dst_region: str, dst_agent: str) -> None:
         """Kill the JVM process.
         
@@ -84,14 +76,16 @@ class admin(CrescoMessageBase):
             dst_region: Destination region
             dst_agent: Destination agent
         """
-        try:
-            message_event_type = 'CONFIG'
-            message_payload = {'action': 'killjvm'}
+        message_event_type = 'CONFIG'
+        message_payload = {'action': 'killjvm'}
 
-            logger.warning(f"Killing JVM on {dst_region}/{dst_agent}")
-            self.messaging.global_agent_msgevent(
-                False, message_event_type, message_payload, dst_region, dst_agent
-            )
-        except Exception as e:
-            logger.error(f"Error killing JVM: {e}")
-            raise
+        logger.warning(f"Killing JVM on {dst_region}/{dst_agent}")
+        yield self.messaging.global_agent_msgevent(
+            False, message_event_type, message_payload, dst_region, dst_agent
+        )
+
+
+class admin_async(admin):
+    """Awaitable administrative operations for use with the asyncio client."""
+
+    asynchronous = True
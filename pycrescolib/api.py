@@ -4,7 +4,8 @@ API module for Cresco API operations.
 import logging
 from typing import Dict, Any, Optional, Tuple
 
-from .base_classes import CrescoMessageBase
+from .base_classes import CrescoMessageBase, operation
+from .cache import cached
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -46,6 +47,7 @@ class api(CrescoMessageBase):
         """
         return self.messaging.get_plugin()
 
+    @operation()
     def get_global_region(self) -> Optional[str]:
         """Get the global region.
         
@@ -53,10 +55,11 @@ class api(CrescoMessageBase):
             Global region or None
         """
         if self.global_region is None:
-            self.get_global_info()
+            yield self.get_global_info()
 
         return self.global_region
 
+    @operation()
     def get_global_agent(self) -> Optional[str]:
         """Get the global agent.
         
@@ -64,29 +67,36 @@ class api(CrescoMessageBase):
             Global agent or None
         """
         if self.global_agent is None:
-            self.get_global_info()
+            yield self.get_global_info()
 
         return self.global_agent
 
+    @cached('globalinfo')
+    @operation("Error getting global info", default=(None, None))
     def get_global_info(self) -> Tuple[Optional[str], Optional[str]]:
         """Get global information.
         
         Returns:
             Tuple of (global_region, global_agent)
         """
-        try:
-            message_event_type = 'EXEC'
-            message_payload = {'action': 'globalinfo'}
-
-            plugin_name = self.get_api_plugin_name()
-            logger.debug(f"Getting global info for plugin {plugin_name}")
-            
-            reply = self.messaging.plugin_msgevent(True, message_event_type, message_payload, plugin_name)
-            
-            self.global_region = reply.get('global_region')
-            self.global_agent = reply.get('global_agent')
-            
-            return self.global_region, self.global_agent
-        except Exception as e:
-            logger.error(f"Error getting global info: {e}")
-            return None, None
+        message_event_type = 'EXEC'
+        message_payload = {'action': 'globalinfo'}
+
+        plugin_name = self.get_api_plugin_name()
+        logger.debug(f"Getting global info for plugin {plugin_name}")
+
+        reply = yield self.messaging.plugin_msgevent(True, message_event_type, message_payload, plugin_name)
+
+        self.global_region = reply.get('global_region')
+        self.global_agent = reply.get('global_agent')
+
+        return self.global_region, self.global_agent
+
+
+class api_async(api):
+    """Awaitable API operations for use with the asyncio client.
+
+    Name lookups come from the connection certificate and stay synchronous.
+    """
+
+    asynchronous = True
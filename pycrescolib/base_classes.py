@@ -1,18 +1,98 @@
 """
 Base classes for the Cresco library to reduce code duplication.
 """
+import asyncio
+import copy
+import functools
+import inspect
 import json
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, Generator, Optional, Tuple
 
 import backoff
 
+from .utils import compress_param, encode_data, get_jar_info, json_serialize, read_jar
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+_RAISE = object()
+
+
+def operation(error: Optional[str] = None, default: Any = _RAISE) -> Callable:
+    """Write a component operation once for the sync and asyncio clients.
+
+    The decorated method is a generator that yields every step which talks
+    to the controller or blocks: calls on ``self.messaging``, ``self._decode``,
+    ``self._offload`` or another operation. The value of each ``yield`` is
+    the step's result. On a synchronous component the steps already are
+    results and the method returns its value. On an asynchronous one
+    (``asynchronous = True``) they are awaitables, and the method returns a
+    coroutine that awaits each in turn::
+
+        @operation("Error getting agent info", default={})
+        def get_agent_info(self, dst_region, dst_agent):
+            reply = yield self.messaging.global_agent_msgevent(True, 'CONFIG', {'action': 'getagentinfo'},
+                                                               dst_region, dst_agent)
+            return reply.get('agent-data', {})
+
+    Args:
+        error: Message logged with any exception the operation raises; None
+            lets exceptions through unlogged
+        default: Returned (a copy of it) instead of re-raising a logged exception
+    """
+    def decorator(func: Callable[..., Generator]) -> Callable:
+        log = logging.getLogger(func.__module__)
+
+        def failed(e: Exception) -> Any:
+            if error is None:
+                raise e
+            log.error(f"{error}: {e}")
+            if default is _RAISE:
+                raise e
+            return copy.copy(default)
+
+        def run(steps: Generator) -> Any:
+            try:
+                value = None
+                while True:
+                    value = steps.send(value)
+            except StopIteration as stop:
+                return stop.value
+            except Exception as e:
+                return failed(e)
+
+        async def run_async(steps: Generator) -> Any:
+            try:
+                value, exc = None, None
+                while True:
+                    step = steps.send(value) if exc is None else steps.throw(exc)
+                    value, exc = None, None
+                    try:
+                        value = await step if inspect.isawaitable(step) else step
+                    except Exception as e:
+                        exc = e  # Raised where the step was yielded, as it is when synchronous
+            except StopIteration as stop:
+                return stop.value
+            except Exception as e:
+                return failed(e)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            steps = func(self, *args, **kwargs)
+            return run_async(steps) if self.asynchronous else run(steps)
+        return wrapper
+
+    return decorator
+
+
 class CrescoMessageBase:
     """Base class for all Cresco message interactions."""
-    
+
+    # Whether ``messaging`` is the coroutine-based variant, making every
+    # ``operation`` of the component return a coroutine
+    asynchronous = False
+
     def __init__(self, messaging):
         """Initialize with a messaging interface.
         
@@ -20,7 +100,42 @@ class CrescoMessageBase:
             messaging: The messaging interface to use for communication
         """
         self.messaging = messaging
-    
+
+    def _offload(self, func: Callable, *args) -> Any:
+        """Run blocking work such as reading a JAR, off the event loop when asynchronous.
+
+        Returns:
+            ``func(*args)``, or an awaitable of it on an asynchronous component
+        """
+        if self.asynchronous:
+            return asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+        return func(*args)
+
+    @staticmethod
+    def _jar_payload(action: str, jar_file_path: str, with_data: bool) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Build the payload of a message carrying a plugin JAR's manifest.
+
+        Args:
+            action: Controller action
+            jar_file_path: Path to JAR file
+            with_data: Whether to include the JAR itself as ``jardata``
+
+        Returns:
+            Tuple of (JAR manifest parameters, message payload)
+        """
+        if with_data:
+            # Get data from jar, reading it once
+            configparams, jar_data = read_jar(jar_file_path)
+        else:
+            configparams, jar_data = get_jar_info(jar_file_path), None
+        message_payload = {
+            'action': action,
+            'configparams': compress_param(json_serialize(configparams))
+        }
+        if with_data:
+            message_payload['jardata'] = encode_data(jar_data)
+        return configparams, message_payload
+
     def _prepare_message(self, 
                         message_type: str, 
                         message_event_type: str, 
@@ -0,0 +1,180 @@
+"""
+Per-destination circuit breakers for agent and plugin messages.
+
+A destination that keeps timing out gets its breaker opened, and calls to it
+fail at once instead of each waiting out its timeout. Other destinations on
+the same socket are unaffected. After ``reset_timeout`` seconds a probe call
+is let through; if it succeeds the breaker closes again.
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .metrics import registry as default_registry
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Gauge values for cresco_circuit_state
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+BreakerKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+class circuit_open(Exception):
+    """Raised when a message is not sent because its destination's breaker is open."""
+
+
+class circuit_breaker:
+    """State of one destination's breaker. Guarded by ``breaker_registry``'s lock."""
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0  # Consecutive failures
+        self.opened_at: Optional[float] = None
+        self.probes = 0  # Half-open calls in flight
+
+
+class breaker_registry:
+    """Circuit breakers keyed by ``(dst_region, dst_agent, dst_plugin)``.
+
+    Only timeouts count as failures: they are what an unreachable agent
+    produces, while a dropped socket affects every destination and is
+    handled by the reconnect logic instead. Controller messages have no
+    destination and are never blocked.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, half_open_calls: int = 1,
+                 metrics=None):
+        """Initialize with every breaker closed.
+
+        Args:
+            failure_threshold: Consecutive timeouts that open a breaker
+            reset_timeout: Seconds a breaker stays open before a probe is allowed
+            half_open_calls: Probe calls allowed at once while half-open
+            metrics: MetricsRegistry for breaker state (default: the shared registry)
+        """
+        if failure_threshold < 1:
+            raise ValueError("Failure threshold must be at least 1")
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.metrics = metrics if metrics is not None else default_registry
+        self._lock = threading.Lock()
+        self._breakers: Dict[BreakerKey, circuit_breaker] = {}
+
+    @staticmethod
+    def key(message_info: Dict[str, Any]) -> Optional[BreakerKey]:
+        """Breaker key of a message, or None if it has no agent destination."""
+        if 'dst_agent' not in message_info:
+            return None
+        return message_info.get('dst_region'), message_info.get('dst_agent'), message_info.get('dst_plugin')
+
+    def _set_state(self, key: BreakerKey, breaker: circuit_breaker, state: str):
+        """Change a breaker's state and publish it."""
+        if breaker.state != state:
+            logger.warning(f"Circuit for {'/'.join(part for part in key if part)} is now {state}")
+        breaker.state = state
+        labels = {'dst_region': key[0], 'dst_agent': key[1], 'dst_plugin': key[2]}
+        self.metrics.set('cresco_circuit_state', labels, _STATE_VALUES[state])
+
+    def allow(self, message_info: Dict[str, Any]):
+        """Check that a message may be sent to its destination.
+
+        Args:
+            message_info: Message metadata
+
+        Raises:
+            circuit_open: If the destination's breaker is open, or half-open
+                with all probe slots taken
+        """
+        key = self.key(message_info)
+        if key is None:
+            return
+
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None or breaker.state == CLOSED:
+                return
+
+            if breaker.state == OPEN and time.monotonic() - breaker.opened_at >= self.reset_timeout:
+                self._set_state(key, breaker, HALF_OPEN)
+            if breaker.state == HALF_OPEN and breaker.probes < self.half_open_calls:
+                breaker.probes += 1
+                return
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - breaker.opened_at))
+
+        self.metrics.inc('cresco_circuit_rejected_total', {'dst_region': key[0], 'dst_agent': key[1]})
+        raise circuit_open(f"Circuit for {'/'.join(part for part in key if part)} is open, "
+                           f"next probe in {retry_in:.1f}s")
+
+    def record(self, message_info: Dict[str, Any], success: Optional[bool]):
+        """Record the outcome of a message that ``allow`` let through.
+
+        Args:
+            message_info: Message metadata
+            success: True for a reply, False for a timeout, None for an
+                outcome that says nothing about the destination
+        """
+        key = self.key(message_info)
+        if key is None:
+            return
+
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                if success is not False:
+                    return
+                breaker = self._breakers[key] = circuit_breaker()
+
+            half_open = breaker.state == HALF_OPEN
+            if half_open:
+                breaker.probes = max(0, breaker.probes - 1)
+
+            if success:
+                breaker.failures = 0
+                if breaker.state != CLOSED:
+                    self._set_state(key, breaker, CLOSED)
+                # A healthy destination needs no entry
+                del self._breakers[key]
+            elif success is False:
+                breaker.failures += 1
+                if half_open or breaker.failures >= self.failure_threshold:
+                    breaker.opened_at = time.monotonic()
+                    self._set_state(key, breaker, OPEN)
+
+    def reset(self, dst_region: Optional[str] = None, dst_agent: Optional[str] = None):
+        """Close breakers by hand, all of them or those of one region or agent."""
+        with self._lock:
+            for key in list(self._breakers):
+                if (dst_region is None or key[0] == dst_region) and (dst_agent is None or key[1] == dst_agent):
+                    self._set_state(key, self._breakers.pop(key), CLOSED)
+
+    def states(self) -> Dict[str, Dict[str, Any]]:
+        """State of every breaker that is not plainly closed.
+
+        Returns:
+            Dict of 'region/agent[/plugin]' to state, consecutive failures and
+            seconds until the next probe
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                '/'.join(part for part in key if part): {
+                    'state': breaker.state,
+                    'failures': breaker.failures,
+                    'retry_in': (max(0.0, self.reset_timeout - (now - breaker.opened_at))
+                                 if breaker.state == OPEN else 0.0),
+                }
+                for key, breaker in self._breakers.items()
+            }
+
+
+default_registry.describe('cresco_circuit_state', 'Destination circuit breaker state (0 closed, 1 half-open, 2 open)')
+default_registry.describe('cresco_circuit_rejected_total', 'Messages failed fast by an open circuit breaker')
@@ -0,0 +1,243 @@
+"""
+Opt-in cache for read-only controller queries.
+
+Component methods such as ``globalcontroller.get_agent_list`` are wrapped
+with ``cached``. When their messaging layer has a ``response_cache``, the
+decoded result is kept for a per-action TTL, so repeated polling skips the
+round-trip, the JSON parse and the decompression. Any CONFIG message sent
+through the same messaging layer drops the entries it may have changed.
+"""
+import asyncio
+import functools
+import inspect
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .metrics import registry as default_registry
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Seconds a result stays fresh, by action
+DEFAULT_TTLS = {
+    'listagents': 10.0,
+    'listregions': 30.0,
+    'resourceinfo': 5.0,
+    'getagentinfo': 10.0,
+    'pluginlist': 10.0,
+    'globalinfo': 300.0,
+}
+
+# Actions sent as CONFIG events that only read state and never invalidate
+READ_ONLY_ACTIONS = frozenset({
+    'getagentinfo', 'pluginlist', 'pluginstatus', 'iscontrolleractive', 'getcontrollerstatus',
+    'getlog', 'getbroadcastdiscovery', 'listagents', 'listregions', 'listplugins', 'repolist',
+    'resourceinfo', 'globalinfo', 'getgpipelinestatus', 'getgpipeline',
+})
+
+_MISSING = object()
+
+
+class response_cache:
+    """Size-bounded LRU cache with per-action TTLs and scoped invalidation.
+
+    Every entry has a scope of (region, agent); None means the entry covers
+    every region or every agent in its region. Values are stored pickled and
+    every hit returns a fresh copy, so a caller changing its result cannot
+    change what other callers get.
+
+    ``generation`` counts invalidations. A reader takes it before querying
+    the controller and passes it to ``put``, which drops the value if an
+    invalidation happened in between: the reply may predate the change.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, default_ttl: float = 5.0,
+                 max_entries: int = 256, metrics=None):
+        """Initialize an empty cache.
+
+        Args:
+            ttls: Seconds to keep results per action, merged over ``DEFAULT_TTLS``
+            default_ttl: Seconds for actions with no entry in ``ttls``
+            max_entries: Entries kept before the least recently used is evicted
+            metrics: MetricsRegistry for hit/miss counters (default: the shared registry)
+        """
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.metrics = metrics if metrics is not None else default_registry
+        self._lock = threading.Lock()
+        self.generation = 0
+        # key -> (expires_at, region, agent, pickled value), oldest use first
+        self._entries: "OrderedDict[Hashable, Tuple[float, Optional[str], Optional[str], Any]]" = OrderedDict()
+
+    def get(self, action: str, key: Hashable) -> Any:
+        """Return a fresh cached value, or ``_MISSING``."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                blob = entry[3]
+            else:
+                if entry is not None:
+                    del self._entries[key]
+                blob = None
+
+        # Unpickling copies the value several times faster than copy.deepcopy
+        value = pickle.loads(blob) if blob is not None else _MISSING
+        self.metrics.inc('cresco_cache_hits_total' if value is not _MISSING else 'cresco_cache_misses_total',
+                         {'action': action})
+        return value
+
+    def put(self, action: str, key: Hashable, value: Any, region: Optional[str] = None,
+            agent: Optional[str] = None, generation: Optional[int] = None):
+        """Store a value for the TTL of its action.
+
+        Args:
+            action: Controller action the value came from
+            key: Cache key
+            value: Decoded result
+            region: Region the result describes, or None for every region
+            agent: Agent the result describes, or None for the whole region
+            generation: ``generation`` read before the query was sent; the
+                value is not stored if the cache was invalidated since
+        """
+        ttl = self.ttls.get(action, self.default_ttl)
+        if ttl <= 0:
+            return
+        try:
+            blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.debug(f"Not caching {action} result: {e}")
+            return
+
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                logger.debug(f"Not caching {action} result: invalidated while it was read")
+                return
+            self._entries[key] = (time.monotonic() + ttl, region, agent, blob)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, region: Optional[str] = None, agent: Optional[str] = None) -> int:
+        """Drop every entry a change on ``region``/``agent`` may have affected.
+
+        With no region everything is dropped. Otherwise fleet-wide entries,
+        region-wide entries for ``region`` and entries for ``agent`` go;
+        entries for other agents and regions stay.
+
+        Args:
+            region: Region that changed, or None for an unknown scope
+            agent: Agent that changed, or None for the whole region
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            self.generation += 1
+            if region is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+            else:
+                stale = [key for key, (_, entry_region, entry_agent, _) in self._entries.items()
+                         if entry_region is None
+                         or (entry_region == region and (agent is None or entry_agent in (None, agent)))]
+                for key in stale:
+                    del self._entries[key]
+                dropped = len(stale)
+
+        if dropped:
+            logger.debug(f"Invalidated {dropped} cached responses for region={region}, agent={agent}")
+        return dropped
+
+    def clear(self):
+        """Drop every entry."""
+        self.invalidate()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+def _cacheable(value: Any) -> bool:
+    """False for the empty values components return on errors, e.g. {} or (None, None)."""
+    if isinstance(value, tuple):
+        return any(item is not None for item in value)
+    return bool(value)
+
+
+def cached(action: str) -> Callable:
+    """Cache a read-only component method in its messaging layer's ``response_cache``.
+
+    The entry is scoped by the method's ``dst_region`` and ``dst_agent``
+    arguments when it has them. Empty results are not cached, since the
+    components also return them on errors, and neither are results of
+    queries that overlapped an invalidating CONFIG. Works on plain methods,
+    coroutines, and ``operation`` methods of asynchronous components, which
+    return coroutines; without a cache the method is called directly.
+
+    Args:
+        action: Controller action the method issues, used for the TTL
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def lookup(self, args, kwargs):
+            cache = getattr(self.messaging, 'cache', None)
+            if cache is None:
+                return None, None, None
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            arguments.pop('self', None)
+            key = (type(self).__name__, func.__name__, tuple(sorted(arguments.items())))
+            try:
+                hash(key)
+            except TypeError:
+                return None, None, None
+            return cache, key, (arguments.get('dst_region'), arguments.get('dst_agent'))
+
+        @functools.wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            cache, key, scope = lookup(self, args, kwargs)
+            if cache is None:
+                return await func(self, *args, **kwargs)
+            value = cache.get(action, key)
+            if value is _MISSING:
+                generation = cache.generation
+                value = await func(self, *args, **kwargs)
+                if _cacheable(value):
+                    cache.put(action, key, value, *scope, generation=generation)
+            return value
+
+        if asyncio.iscoroutinefunction(func):
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if getattr(self, 'asynchronous', False):
+                return async_wrapper(self, *args, **kwargs)
+            cache, key, scope = lookup(self, args, kwargs)
+            if cache is None:
+                return func(self, *args, **kwargs)
+            value = cache.get(action, key)
+            if value is _MISSING:
+                generation = cache.generation
+                value = func(self, *args, **kwargs)
+                if _cacheable(value):
+                    cache.put(action, key, value, *scope, generation=generation)
+            return value
+        return wrapper
+
+    return decorator
+
+
+default_registry.describe('cresco_cache_hits_total', 'Read-only queries answered from the response cache')
+default_registry.describe('cresco_cache_misses_total', 'Read-only queries sent to the controller')
@@ -7,17 +7,30 @@ import asyncio
 import time
 import threading
 import concurrent.futures
-from typing import Optional, Dict, Any, Callable
+from typing import TYPE_CHECKING, Optional, Dict, Any, Callable, Union
 from contextlib import contextmanager
 
-from .admin import admin
-from .agents import agents
-from .api import api
-from .dataplane import dataplane
-from .globalcontroller import globalcontroller
-from .logstreamer import logstreamer
+from .admin import admin, admin_async
+from .agents import agents, agents_async
+from .api import api, api_async
+from .breaker import breaker_registry
+from .cache import response_cache
+from .decoding import reply_decoder
+from .globalcontroller import globalcontroller, globalcontroller_async
 from .messaging import messaging_sync as messaging
-from .wc_interface import ws_interface
+from .messaging import messaging as messaging_async
+from .metrics import MetricsRegistry
+from .metrics import registry as default_registry
+from .ratelimit import rate_limiter
+from .reactor import reactor
+from .wc_interface import ws_interface, ws_pool
+from .wsconfig import ws_settings
+
+if TYPE_CHECKING:
+    # Streams are imported on first use; most callers only make RPCs
+    from .dataplane import dataplane
+    from .logstreamer import logstreamer
+    from .recording import traffic_recorder
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -26,7 +39,15 @@ logger = logging.getLogger(__name__)
 class clientlib:
     """Client library for interacting with Cresco framework."""
 
-    def __init__(self, host: str, port: int, service_key: str, verify_ssl: bool = False):
+    def __init__(self, host: str, port: int, service_key: str, verify_ssl: bool = False,
+                 pool_size: int = 1, bulk_threshold: int = 256 * 1024, metrics: Optional[MetricsRegistry] = None,
+                 shared_reactor: bool = False, reactor_threads: int = 1,
+                 cache: Union[bool, response_cache] = False, rate_limit: Optional[rate_limiter] = None,
+                 circuit_breakers: Union[bool, breaker_registry] = True,
+                 record: Union[str, 'traffic_recorder', None] = None,
+                 websocket: Union[str, ws_settings] = 'throughput',
+                 on_send_error: Optional[Callable[[Dict[str, Any], Exception], None]] = None,
+                 decoder: Union[bool, reply_decoder] = True):
         """Initialize the client library.
 
         Args:
@@ -34,12 +55,52 @@ class clientlib:
             port: Port number
             service_key: Service key for authentication
             verify_ssl: Whether to verify SSL certificates
+            pool_size: Number of apisocket connections; above 1, one of them is
+                reserved for messages of at least ``bulk_threshold`` bytes
+            bulk_threshold: Message size in bytes routed to the bulk connection
+            metrics: Registry that records call counts, latencies and sizes
+                (default: the shared ``pycrescolib.metrics.registry``)
+            shared_reactor: Run every dataplane and logstreamer as tasks on a
+                shared pool of event loop threads instead of one thread each
+            reactor_threads: Number of loop threads in the shared reactor
+            cache: Cache read-only queries such as agent and region lists; True
+                for the default TTLs or a configured ``response_cache``
+            rate_limit: Optional ``rate_limiter`` pacing messages to the
+                controller and to each destination agent
+            circuit_breakers: Fail calls fast to agents that keep timing out;
+                True for the default thresholds, a configured
+                ``breaker_registry``, or False to disable
+            record: Append every apisocket frame to this file (or
+                ``traffic_recorder``) for later replay with
+                ``pycrescolib.recording``
+            websocket: Message size, buffering and compression options for
+                every websocket; a preset name from ``pycrescolib.wsconfig``
+                ('throughput', 'uncompressed', 'default') or ``ws_settings``
+            on_send_error: Called with the message_info and exception when a
+                message sent without waiting for a reply (``is_rpc=False``)
+                could not be written. Such calls return once the message is
+                queued; the callback runs on the event loop thread.
+            decoder: Decoder for large compressed replies (agent, pipeline
+                and resource lists); True for the defaults, a configured
+                ``reply_decoder``, or False to always decode inline. Calls
+                on this client already run on the caller's thread, so only
+                a decoder with ``processes`` set moves work elsewhere; the
+                default decodes inline here and pays off in ``AsyncClientlib``
         """
         self.host = host
         self.port = port
         self.service_key = service_key
         self.verify_ssl = verify_ssl
+        self._owns_recorder = isinstance(record, str)
+        if self._owns_recorder:
+            from .recording import traffic_recorder
+            record = traffic_recorder(record)
+        self.recorder = record
+        self.ws_settings = _make_ws_settings(websocket)
+        self.reactor = reactor(reactor_threads) if shared_reactor else None
+        self._owns_decoder = decoder is True
         self._lock = threading.RLock()  # Reentrant lock for thread safety
+        self.metrics = metrics if metrics is not None else default_registry
 
         # Use dictionaries to track resources with identifiers
         self._dataplanes = {}  # stream_name -> dataplane instance
@@ -50,14 +111,20 @@ class clientlib:
             self._configure_global_ssl()
 
         # Create WebSocket interface first - it will create its own event loop
-        self.ws_interface = ws_interface()
+        if pool_size > 1:
+            self.ws_interface = ws_pool(pool_size, bulk_threshold=bulk_threshold, metrics=self.metrics,
+                                        recorder=self.recorder, settings=self.ws_settings)
+        else:
+            self.ws_interface = ws_interface(metrics=self.metrics, recorder=self.recorder, settings=self.ws_settings)
 
         # Setup components with the WebSocket interface after it's initialized
-        self.messaging = messaging(self.ws_interface)
+        self.messaging = messaging(self.ws_interface, self.metrics, _make_cache(cache, self.metrics), rate_limit,
+                                   _make_breakers(circuit_breakers, self.metrics), on_send_error=on_send_error)
         self.agents = agents(self.messaging)
         self.admin = admin(self.messaging)
         self.api = api(self.messaging)
-        self.globalcontroller = globalcontroller(self.messaging)
+        self.decoder = _make_decoder(decoder, self.metrics)
+        self.globalcontroller = globalcontroller(self.messaging, self.decoder)
 
         logger.info(f"Clientlib initialized for {host}:{port}")
 
@@ -89,10 +156,8 @@ class clientlib:
             connection_result = self.ws_interface.connect(ws_url, self.service_key, self.verify_ssl)
 
             if connection_result:
-                # Sleep briefly to ensure connection is fully established
-                time.sleep(0.5)
-
-                # Verify the connection is working properly
+                # ws_interface.connect only returns once the socket is open and
+                # the reader is running, so no settling delay is needed
                 if self.ws_interface.connected():
                     logger.info("Connection verified successfully")
                     return True
@@ -119,7 +184,7 @@ class clientlib:
             return False
 
     def get_dataplane(self, stream_name: str, callback: Optional[Callable] = None,
-                      binary_callback: Optional[Callable] = None) -> dataplane:
+                      binary_callback: Optional[Callable] = None) -> 'dataplane':
         """Create or retrieve a dataplane instance for streaming data.
 
         Args:
@@ -137,8 +202,10 @@ class clientlib:
                 return self._dataplanes[stream_name]
 
             # Create new dataplane
+            from .dataplane import dataplane
             dp = dataplane(self.host, self.port, stream_name, self.service_key,
-                           callback, binary_callback)
+                           callback, binary_callback, reactor=self.reactor, settings=self.ws_settings,
+                           metrics=self.metrics)
             logger.debug(f"Created dataplane for stream: {stream_name}")
 
             # Store with stream name as key
@@ -171,7 +238,7 @@ class clientlib:
                 logger.error(f"Error closing dataplane '{stream_name}': {e}")
                 return False
 
-    def get_logstreamer(self, name: Optional[str] = None, callback: Optional[Callable] = None) -> logstreamer:
+    def get_logstreamer(self, name: Optional[str] = None, callback: Optional[Callable] = None) -> 'logstreamer':
         """Create or retrieve a logstreamer instance.
 
         Args:
@@ -192,7 +259,9 @@ class clientlib:
                 return self._logstreamers[name]
 
             # Create new logstreamer
-            ls = logstreamer(self.host, self.port, self.service_key, callback)
+            from .logstreamer import logstreamer
+            ls = logstreamer(self.host, self.port, self.service_key, callback, reactor=self.reactor,
+                             settings=self.ws_settings, metrics=self.metrics)
             logger.debug(f"Created logstreamer: {name}")
 
             # Store with name as key
@@ -248,6 +317,13 @@ class clientlib:
                     logger.error(f"Error closing logstreamer '{name}': {e}")
             self._logstreamers.clear()
 
+            # Stop the shared stream loops once every stream is closed
+            if self.reactor:
+                try:
+                    self.reactor.stop()
+                except Exception as e:
+                    logger.error(f"Error stopping reactor: {e}")
+
             # Close WebSocket interface
             if self.ws_interface:
                 try:
@@ -255,6 +331,15 @@ class clientlib:
                 except Exception as e:
                     logger.error(f"Error closing WebSocket interface: {e}")
 
+            if self.recorder is not None:
+                if self._owns_recorder:
+                    self.recorder.close()
+                else:
+                    self.recorder.flush()
+
+            if self.decoder is not None and self._owns_decoder:
+                self.decoder.close()
+
     def get_active_dataplanes(self):
         """Get a list of active dataplane stream names.
 
@@ -292,4 +377,140 @@ class clientlib:
         finally:
             # Always close the connection when exiting the context
             if connection_successful:
-                self.close()
\ No newline at end of file
+                self.close()
+
+
+class AsyncClientlib:
+    """Asyncio client for the Cresco framework.
+
+    Runs entirely on the caller's event loop, so many controller calls can be
+    fanned out with ``asyncio.gather`` without a thread hop per call::
+
+        async with AsyncClientlib(host, port, service_key) as client:
+            agents = await client.globalcontroller.get_agent_list()
+
+    Operations are the same as on ``clientlib``, with one difference: writes
+    and uploads that time out, lose the connection, meet an open circuit
+    breaker or are rate limited raise instead of returning ``{}``.
+    """
+
+    def __init__(self, host: str, port: int, service_key: str, verify_ssl: bool = False,
+                 metrics: Optional[MetricsRegistry] = None, cache: Union[bool, response_cache] = False,
+                 rate_limit: Optional[rate_limiter] = None, circuit_breakers: Union[bool, breaker_registry] = True,
+                 websocket: Union[str, ws_settings] = 'throughput', decoder: Union[bool, reply_decoder] = True):
+        """Initialize the asyncio client.
+
+        Args:
+            host: Host address
+            port: Port number
+            service_key: Service key for authentication
+            verify_ssl: Whether to verify SSL certificates
+            metrics: Registry that records call counts, latencies and sizes
+                (default: the shared ``pycrescolib.metrics.registry``)
+            cache: Cache read-only queries such as agent and region lists; True
+                for the default TTLs or a configured ``response_cache``
+            rate_limit: Optional ``rate_limiter`` pacing messages to the
+                controller and to each destination agent
+            circuit_breakers: Fail calls fast to agents that keep timing out;
+                True for the default thresholds, a configured
+                ``breaker_registry``, or False to disable
+            websocket: Message size, buffering and compression options; a
+                preset name from ``pycrescolib.wsconfig`` or ``ws_settings``
+            decoder: Decode large compressed replies on worker pools instead
+                of the event loop; True for the defaults, a configured
+                ``reply_decoder``, or False to always decode on the loop
+        """
+        self.host = host
+        self.port = port
+        self.service_key = service_key
+        self.verify_ssl = verify_ssl
+        self.metrics = metrics if metrics is not None else default_registry
+        self.ws_settings = _make_ws_settings(websocket)
+        self._owns_decoder = decoder is True
+        self.decoder = _make_decoder(decoder, self.metrics)
+
+        # The interface attaches to the running loop on connect(), no thread is started
+        self.ws_interface = ws_interface(metrics=self.metrics, settings=self.ws_settings)
+
+        self.messaging = messaging_async(self.ws_interface, self.metrics, _make_cache(cache, self.metrics),
+                                         rate_limit, _make_breakers(circuit_breakers, self.metrics))
+        self.agents = agents_async(self.messaging)
+        self.admin = admin_async(self.messaging)
+        self.api = api_async(self.messaging)
+        self.globalcontroller = globalcontroller_async(self.messaging, self.decoder)
+
+        logger.info(f"AsyncClientlib initialized for {host}:{port}")
+
+    async def connect(self) -> bool:
+        """Connect to the WebSocket server on the running event loop.
+
+        Returns:
+            True if connection successful, False otherwise
+        """
+        try:
+            ws_url = f'wss://{self.host}:{self.port}/api/apisocket'
+            if await self.ws_interface.open(ws_url, self.service_key, self.verify_ssl):
+                logger.info("Connection verified successfully")
+                return True
+            logger.warning("Connection attempt failed")
+            return False
+        except Exception as e:
+            logger.error(f"Connection error: {e}")
+            return False
+
+    def connected(self) -> bool:
+        """Check if connected to the WebSocket server.
+
+        Returns:
+            True if connected, False otherwise
+        """
+        return self.ws_interface.connected()
+
+    async def close(self):
+        """Close the WebSocket connection."""
+        logger.info("Closing AsyncClientlib connection")
+        try:
+            await self.ws_interface.aclose()
+        except Exception as e:
+            logger.error(f"Error closing WebSocket interface: {e}")
+        if self.decoder is not None and self._owns_decoder:
+            self.decoder.close()
+
+    async def __aenter__(self):
+        """Connect on entering the context."""
+        if not await self.connect():
+            raise ConnectionError("Failed to connect to Cresco server")
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Close on exiting the context."""
+        await self.close()
+
+
+def _make_cache(cache: Union[bool, response_cache, None], metrics: MetricsRegistry) -> Optional[response_cache]:
+    """Turn the ``cache`` constructor argument into a response_cache or None."""
+    if cache is True:
+        return response_cache(metrics=metrics)
+    return cache if isinstance(cache, response_cache) else None
+
+
+def _make_breakers(breakers: Union[bool, breaker_registry, None],
+                   metrics: MetricsRegistry) -> Optional[breaker_registry]:
+    """Turn the ``circuit_breakers`` constructor argument into a breaker_registry or None."""
+    if breakers is True:
+        return breaker_registry(metrics=metrics)
+    return breakers if isinstance(breakers, breaker_registry) else None
+
+
+def _make_decoder(decoder: Union[bool, reply_decoder, None], metrics: MetricsRegistry) -> Optional[reply_decoder]:
+    """Turn the ``decoder`` constructor argument into a reply_decoder or None."""
+    if decoder is True:
+        return reply_decoder(metrics=metrics)
+    return decoder if isinstance(decoder, reply_decoder) else None
+
+
+def _make_ws_settings(websocket: Union[str, ws_settings]) -> ws_settings:
+    """Turn the ``websocket`` constructor argument into ws_settings."""
+    if isinstance(websocket, ws_settings):
+        return websocket
+    return ws_settings.preset(websocket)
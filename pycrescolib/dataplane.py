@@ -7,12 +7,15 @@ import json
 import time
 import logging
 import asyncio
+import threading
 import base64
 from typing import Dict, Any, Optional, Callable, Union, BinaryIO
 import websockets
 import backoff
 from contextlib import asynccontextmanager
 
+from .wsconfig import ws_settings
+
 # Setup logging
 logger = logging.getLogger(__name__)
 
@@ -21,7 +24,21 @@ class dataplane:
     """Dataplane class for streaming data in Cresco."""
 
     def __init__(self, host: str, port: int, stream_name: str, service_key: str, callback: Optional[Callable] = None,
-                 binary_callback: Optional[Callable] = None):
+                 binary_callback: Optional[Callable] = None, reactor=None,
+                 settings: Optional[ws_settings] = None, metrics=None):
+        """Initialize the dataplane.
+
+        Args:
+            host: Host address
+            port: Port number
+            stream_name: Name of the stream to subscribe to
+            service_key: Service key for authentication
+            callback: Function for text messages
+            binary_callback: Function for binary messages
+            reactor: Shared ``reactor`` to run on instead of a dedicated loop thread
+            settings: Message size, buffering and compression options (default: ``ws_settings()``)
+            metrics: MetricsRegistry for compression metrics (default: the shared registry)
+        """
         self.host = host
         self.port = port
         self.stream_name = stream_name
@@ -35,7 +52,14 @@ class dataplane:
         self._reconnect_task = None
         self._lock = asyncio.Lock()
         self._service_key = service_key  # Use the provided service key
-        self._event_loop = asyncio.new_event_loop()
+        self.settings = settings if settings is not None else ws_settings()
+        self.metrics = metrics
+        # With a reactor the loop is assigned on connect() and shared with other streams
+        self._reactor = reactor
+        self._event_loop = asyncio.new_event_loop() if reactor is None else None
+        self._thread = None
+        # Set when the activation frame arrives, or when the first connect fails
+        self._activated = threading.Event()
 
     def is_active(self) -> bool:
         """Check if dataplane is active.
@@ -62,6 +86,7 @@ class dataplane:
                                     json_incoming = json.loads(message)
                                     if int(json_incoming.get('status_code', 0)) == 10:
                                         self.isActive = True
+                                        self._activated.set()
                                         logger.info(f"Dataplane {self.stream_name} activated")
                                 else:
                                     # Not expected to get binary for activation
@@ -149,8 +174,11 @@ class dataplane:
             self.ws = await websockets.connect(
                 ws_url,
                 ssl=ssl_context,
-                additional_headers=headers
+                additional_headers=headers,
+                **self.settings.connect_kwargs(self.metrics, 'dataplane')
             )
+            # The first frame on every new socket is the activation message
+            self.message_count = 0
 
             # Send stream name
             await self.ws.send(self.stream_name)
@@ -161,52 +189,60 @@ class dataplane:
             logger.error(f"Dataplane connection error: {e}")
             return False
 
-    def connect(self):
-        """Connect to the dataplane stream."""
+    async def _start(self) -> bool:
+        """Open the socket and start the handler and reconnect tasks on the current loop."""
+        self._running = True
 
-        def run():
-            self._running = True
+        if not await self._connect():
+            # Wake connect(); isActive stays False
+            self._activated.set()
+            return False
+
+        loop = asyncio.get_running_loop()
+        self._task = loop.create_task(self._message_handler())
+        self._reconnect_task = loop.create_task(self._reconnect_monitor())
+        return True
 
-            # Setup and start the event loop
-            asyncio.set_event_loop(self._event_loop)
+    def connect(self, timeout: float = 5.0):
+        """Connect to the dataplane stream.
 
-            # Create tasks
-            connect_task = self._event_loop.create_task(self._connect())
-            self._event_loop.run_until_complete(connect_task)
+        Returns as soon as the activation frame arrives, or after ``timeout``
+        seconds.
 
-            if connect_task.result():
-                self._task = self._event_loop.create_task(self._message_handler())
-                self._reconnect_task = self._event_loop.create_task(self._reconnect_monitor())
+        Args:
+            timeout: Seconds to wait for activation
 
-                # No need to wait for activation before returning - start async task instead
-                self._event_loop.create_task(self._wait_for_activation())
+        Returns:
+            True if the stream is active
+        """
+        self._activated.clear()
 
-            # Run event loop forever
-            self._event_loop.run_forever()
+        if self._reactor is not None:
+            # Run as tasks on the shared reactor loop
+            if self._event_loop is None:
+                self._event_loop = self._reactor.acquire()
+            asyncio.run_coroutine_threadsafe(self._start(), self._event_loop)
+        else:
+            def run():
+                # Setup and start the event loop
+                asyncio.set_event_loop(self._event_loop)
+                self._event_loop.run_until_complete(self._start())
 
-        # Start in a separate thread to avoid blocking
-        import threading
-        thread = threading.Thread(target=run, daemon=True)
-        thread.start()
+                # Run event loop forever
+                self._event_loop.run_forever()
 
-        # Wait for activation with a timeout
-        import time
-        start_time = time.time()
-        timeout = 5.0  # 5 second timeout
+            # Start in a separate thread to avoid blocking
+            self._thread = threading.Thread(target=run, daemon=True)
+            self._thread.start()
 
-        while not self.isActive and time.time() - start_time < timeout:
-            time.sleep(0.1)
+        # Wait for the activation frame (or a failed connect)
+        self._activated.wait(timeout)
 
         if not self.isActive:
             logger.warning(f"Timeout waiting for dataplane {self.stream_name} activation")
 
         return self.isActive
 
-    async def _wait_for_activation(self):
-        """Wait for the dataplane to become active."""
-        while not self.isActive and self._running:
-            await asyncio.sleep(0.1)
-
     async def send_async(self, data: Union[str, bytes]):
         """Send data asynchronously, supporting both text and binary.
 
@@ -291,6 +327,10 @@ class dataplane:
         self._running = False
         self.isActive = False
 
+        if self._event_loop is None:
+            # Reactor stream that was never connected
+            return
+
         # First, cancel regular tasks
         if self._task:
             self._event_loop.call_soon_threadsafe(self._task.cancel)
@@ -311,14 +351,19 @@ class dataplane:
         except Exception as e:
             logger.error(f"Error during task cleanup: {e}")
 
-        # Stop the event loop
-        try:
-            self._event_loop.call_soon_threadsafe(self._event_loop.stop)
-            # Wait briefly for the event loop to stop
-            import time
-            time.sleep(0.2)
-        except Exception as e:
-            logger.error(f"Error stopping event loop: {e}")
+        if self._reactor is not None:
+            # The loop is shared, so leave it running for the other streams
+            self._reactor.release(self._event_loop)
+            self._event_loop = None
+        else:
+            # Stop the event loop
+            try:
+                self._event_loop.call_soon_threadsafe(self._event_loop.stop)
+                # Wait for the event loop thread to finish
+                if self._thread and self._thread is not threading.current_thread():
+                    self._thread.join(timeout=1.0)
+            except Exception as e:
+                logger.error(f"Error stopping event loop: {e}")
 
         logger.info(f"Dataplane {self.stream_name} closed")
 
@@ -332,10 +377,15 @@ class dataplane:
                 except Exception as e:
                     logger.error(f"Error closing WebSocket: {e}")
 
-            # Cancel all tasks except this one
-            current = asyncio.current_task()
-            tasks = [task for task in asyncio.all_tasks(self._event_loop)
-                     if task is not current]
+            if self._reactor is not None:
+                # Shared loop: cancel only this stream's own tasks
+                tasks = [task for task in (self._task, self._reconnect_task)
+                         if task is not None and not task.done()]
+            else:
+                # Cancel all tasks except this one
+                current = asyncio.current_task()
+                tasks = [task for task in asyncio.all_tasks(self._event_loop)
+                         if task is not current]
 
             if tasks:
                 logger.debug(f"Cancelling {len(tasks)} pending tasks")
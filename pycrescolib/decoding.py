@@ -0,0 +1,141 @@
+"""
+Decoding of large gzip+base64 JSON reply fields off the calling thread.
+
+For large fleets, ``agentslist``, ``pipelineinfo`` and ``resourceinfo``
+replies carry megabytes of compressed JSON. ``reply_decoder`` decodes small
+fields inline and large ones on a worker pool, so an asyncio client's event
+loop keeps serving other replies while one is decoded:
+
+- threads: zlib and the copies around it release the GIL, and several large
+  replies decode in parallel
+- processes (optional): the JSON parse runs in another interpreter; the
+  result has to be pickled back, which only pays off with the standard
+  library ``json`` codec and very large fields
+
+``python -m benchmarks.bench_decode`` measures where each mode starts to pay.
+"""
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+from .metrics import registry as default_registry
+from .utils import decompress_json
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Encoded field size (characters) from which decoding leaves the calling thread
+DECODE_THRESHOLD = 256 * 1024
+# Encoded field size from which the process pool is used, when there is one
+PROCESS_THRESHOLD = 8 * 2 ** 20
+
+
+class reply_decoder:
+    """Decodes gzip+base64 JSON fields inline or on a thread or process pool by size."""
+
+    def __init__(self, threshold: int = DECODE_THRESHOLD, threads: int = 2, processes: int = 0,
+                 process_threshold: int = PROCESS_THRESHOLD, metrics=None):
+        """Initialize the decoder. Pools are started on first use.
+
+        Args:
+            threshold: Fields of at least this many characters are decoded on the thread pool
+            threads: Worker threads, or 0 to decode every field inline
+            processes: Worker processes for fields of at least ``process_threshold``
+                characters, or 0 for none
+            process_threshold: Field size from which the process pool is used
+            metrics: MetricsRegistry for decode times (default: the shared registry)
+        """
+        self.threshold = threshold
+        self.threads = threads
+        self.processes = processes
+        self.process_threshold = process_threshold
+        self.metrics = metrics if metrics is not None else default_registry
+        self._thread_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._process_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def mode(self, size: int) -> str:
+        """Where a field of ``size`` characters is decoded: 'inline', 'thread' or 'process'."""
+        if self.processes and size >= self.process_threshold:
+            return 'process'
+        if self.threads and size >= self.threshold:
+            return 'thread'
+        return 'inline'
+
+    def _pool(self, mode: str) -> concurrent.futures.Executor:
+        """The pool for ``mode``, started if needed."""
+        with self._lock:
+            if mode == 'process':
+                if self._process_pool is None:
+                    import multiprocessing
+
+                    # Forking a process that runs event loop threads can deadlock the child
+                    self._process_pool = concurrent.futures.ProcessPoolExecutor(
+                        self.processes, mp_context=multiprocessing.get_context('spawn'))
+                return self._process_pool
+            if self._thread_pool is None:
+                self._thread_pool = concurrent.futures.ThreadPoolExecutor(self.threads,
+                                                                          thread_name_prefix='cresco-decode')
+            return self._thread_pool
+
+    def decode(self, param: str) -> Any:
+        """Decode a field for a synchronous caller.
+
+        Synchronous callers are already off the event loop, and handing the
+        field to a thread would only add a switch, so it is decoded on the
+        calling thread unless it is large enough for the process pool.
+
+        Args:
+            param: Base64 encoded compressed JSON
+
+        Returns:
+            Deserialized object
+        """
+        mode = self.mode(len(param))
+        start = time.perf_counter()
+        if mode == 'process':
+            value = self._pool(mode).submit(decompress_json, param).result()
+        else:
+            mode = 'inline'
+            value = decompress_json(param)
+        self._observe(mode, start)
+        return value
+
+    async def decode_async(self, param: str) -> Any:
+        """Decode a field without blocking the running event loop on large ones.
+
+        Args:
+            param: Base64 encoded compressed JSON
+
+        Returns:
+            Deserialized object
+        """
+        mode = self.mode(len(param))
+        start = time.perf_counter()
+        if mode == 'inline':
+            value = decompress_json(param)
+        else:
+            value = await asyncio.get_running_loop().run_in_executor(self._pool(mode), decompress_json, param)
+        self._observe(mode, start)
+        return value
+
+    def _observe(self, mode: str, start: float):
+        self.metrics.observe('cresco_decode_seconds', {'mode': mode}, time.perf_counter() - start)
+
+    def close(self):
+        """Stop the worker pools. Decodes still running are finished first."""
+        with self._lock:
+            pools, self._thread_pool, self._process_pool = (self._thread_pool, self._process_pool), None, None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=True)
+
+    def __repr__(self):
+        return (f"reply_decoder(threshold={self.threshold}, threads={self.threads}, "
+                f"processes={self.processes}, process_threshold={self.process_threshold})")
+
+
+default_registry.describe('cresco_decode_seconds', 'Time to decode a compressed reply field, by where it ran')
@@ -5,8 +5,10 @@ import json
 import logging
 from typing import Dict, Any, List, Optional, Union
 
-from .base_classes import CrescoMessageBase
-from .utils import decompress_param, get_jar_info, compress_param, encode_data, json_serialize, json_deserialize, read_file_bytes
+from .base_classes import CrescoMessageBase, operation
+from .cache import cached
+from .decoding import reply_decoder
+from .utils import decompress_param, decompress_json, compress_param, encode_data, json_serialize, json_deserialize
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -14,14 +16,23 @@ logger = logging.getLogger(__name__)
 class globalcontroller(CrescoMessageBase):
     """Global controller class for Cresco operations."""
 
-    def __init__(self, messaging):
+    def __init__(self, messaging, decoder: Optional[reply_decoder] = None):
         """Initialize with messaging interface.
 
         Args:
             messaging: Messaging interface
+            decoder: Optional reply_decoder moving large compressed replies off the calling thread
         """
         super().__init__(messaging)
+        self.decoder = decoder
 
+    def _decode(self, param: str) -> Any:
+        """Decode a gzip+base64 JSON reply field."""
+        if self.decoder is None:
+            return decompress_json(param)
+        return self.decoder.decode(param)
+
+    @operation("Error submitting pipeline")
     def submit_pipeline(self, cadl: Dict[str, Any], tenant_id: str = '0') -> Dict[str, Any]:
         """Submit a pipeline.
 
@@ -32,21 +43,18 @@ class globalcontroller(CrescoMessageBase):
         Returns:
             Response containing status and pipeline ID
         """
-        try:
-            message_event_type = 'CONFIG'
-            message_payload = {
-                'action': 'gpipelinesubmit',
-                'action_gpipeline': compress_param(json_serialize(cadl)),
-                'action_tenantid': tenant_id
-            }
-
-            logger.info(f"Submitting pipeline for tenant {tenant_id}")
-            retry = self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
-            return retry
-        except Exception as e:
-            logger.error(f"Error submitting pipeline: {e}")
-            raise
-
+        message_event_type = 'CONFIG'
+        message_payload = {
+            'action': 'gpipelinesubmit',
+            'action_gpipeline': compress_param(json_serialize(cadl)),
+            'action_tenantid': tenant_id
+        }
+
+        logger.info(f"Submitting pipeline for tenant {tenant_id}")
+        retry = yield self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
+        return retry
+
+    @operation("Error removing pipeline")
     def remove_pipeline(self, pipeline_id: str) -> Dict[str, Any]:
         """Remove a pipeline.
 
@@ -56,40 +64,34 @@ class globalcontroller(CrescoMessageBase):
         Returns:
             Response containing status
         """
-        try:
-            message_event_type = 'CONFIG'
-            message_payload = {
-                'action': 'gpipelineremove',
-                'action_pipelineid': pipeline_id
-            }
-
-            logger.info(f"Removing pipeline {pipeline_id}")
-            retry = self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
-            return retry
-        except Exception as e:
-            logger.error(f"Error removing pipeline: {e}")
-            raise
+        message_event_type = 'CONFIG'
+        message_payload = {
+            'action': 'gpipelineremove',
+            'action_pipelineid': pipeline_id
+        }
+
+        logger.info(f"Removing pipeline {pipeline_id}")
+        retry = yield self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
+        return retry
 
+    @operation("Error getting pipeline list", default=[])
     def get_pipeline_list(self) -> List[Dict[str, Any]]:
         """Get a list of pipelines.
 
         Returns:
             List of pipelines
         """
-        try:
-            message_event_type = 'EXEC'
-            message_payload = {'action': 'getgpipelinestatus'}
+        message_event_type = 'EXEC'
+        message_payload = {'action': 'getgpipelinestatus'}
 
-            reply = self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
+        reply = yield self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
 
-            if 'pipelineinfo' in reply:
-                pipeline_info = json_deserialize(decompress_param(reply['pipelineinfo']))
-                return pipeline_info.get('pipelines', [])
-            return []
-        except Exception as e:
-            logger.error(f"Error getting pipeline list: {e}")
-            return []
+        if 'pipelineinfo' in reply:
+            pipeline_info = yield self._decode(reply['pipelineinfo'])
+            return pipeline_info.get('pipelines', [])
+        return []
 
+    @operation("Error getting pipeline info", default={})
     def get_pipeline_info(self, pipeline_id: str) -> Dict[str, Any]:
         """Get pipeline information.
 
@@ -99,23 +101,20 @@ class globalcontroller(CrescoMessageBase):
         Returns:
             Pipeline information
         """
-        try:
-            message_event_type = 'EXEC'
-            message_payload = {
-                'action': 'getgpipeline',
-                'action_pipelineid': pipeline_id
-            }
-
-            logger.debug(f"Getting info for pipeline {pipeline_id}")
-            reply = self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
-
-            if 'gpipeline' in reply:
-                return json_deserialize(decompress_param(reply['gpipeline']))
-            return {}
-        except Exception as e:
-            logger.error(f"Error getting pipeline info: {e}")
-            return {}
+        message_event_type = 'EXEC'
+        message_payload = {
+            'action': 'getgpipeline',
+            'action_pipelineid': pipeline_id
+        }
+
+        logger.debug(f"Getting info for pipeline {pipeline_id}")
+        reply = yield self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
+
+        if 'gpipeline' in reply:
+            return (yield self._decode(reply['gpipeline']))
+        return {}
 
+    @operation("Error getting pipeline status", default=-1)
     def get_pipeline_status(self, pipeline_id: str) -> int:
         """Get pipeline status.
 
@@ -125,13 +124,11 @@ class globalcontroller(CrescoMessageBase):
         Returns:
             Status code
         """
-        try:
-            reply = self.get_pipeline_info(pipeline_id)
-            return int(reply.get('status_code', -1))
-        except Exception as e:
-            logger.error(f"Error getting pipeline status: {e}")
-            return -1
+        reply = yield self.get_pipeline_info(pipeline_id)
+        return int(reply.get('status_code', -1))
 
+    @cached('listagents')
+    @operation("Error getting agent list", default=[])
     def get_agent_list(self, dst_region: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get a list of agents.
 
@@ -141,23 +138,21 @@ class globalcontroller(CrescoMessageBase):
         Returns:
             List of agents
         """
-        try:
-            message_event_type = 'EXEC'
-            message_payload = {'action': 'listagents'}
+        message_event_type = 'EXEC'
+        message_payload = {'action': 'listagents'}
 
-            if dst_region is not None:
-                message_payload['action_region'] = dst_region
+        if dst_region is not None:
+            message_payload['action_region'] = dst_region
 
-            reply = self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
+        reply = yield self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
 
-            if 'agentslist' in reply:
-                agent_list = json_deserialize(decompress_param(reply['agentslist']))
-                return agent_list.get('agents', [])
-            return []
-        except Exception as e:
-            logger.error(f"Error getting agent list: {e}")
-            return []
+        if 'agentslist' in reply:
+            agent_list = yield self._decode(reply['agentslist'])
+            return agent_list.get('agents', [])
+        return []
 
+    @cached('resourceinfo')
+    @operation("Error getting agent resources", default={})
     def get_agent_resources(self, dst_region: str, dst_agent: str) -> Dict[str, Any]:
         """Get agent resources.
 
@@ -168,61 +163,56 @@ class globalcontroller(CrescoMessageBase):
         Returns:
             Agent resources
         """
-        try:
-            message_event_type = 'EXEC'
-            message_payload = {
-                'action': 'resourceinfo',
-                'action_region': dst_region,
-                'action_agent': dst_agent
-            }
-
-            reply = self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
-
-            if 'resourceinfo' in reply:
-                resource_info = json_deserialize(decompress_param(reply['resourceinfo']))
-                agent_resource_info = resource_info.get('agentresourceinfo', [])
-
-                if agent_resource_info and 'perf' in agent_resource_info[0]:
-                    return json_deserialize(agent_resource_info[0]['perf'])
-            return {}
-        except Exception as e:
-            logger.error(f"Error getting agent resources: {e}")
-            return {}
+        message_event_type = 'EXEC'
+        message_payload = {
+            'action': 'resourceinfo',
+            'action_region': dst_region,
+            'action_agent': dst_agent
+        }
 
+        reply = yield self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
+
+        if 'resourceinfo' in reply:
+            resource_info = yield self._decode(reply['resourceinfo'])
+            agent_resource_info = resource_info.get('agentresourceinfo', [])
+
+            if agent_resource_info and 'perf' in agent_resource_info[0]:
+                return json_deserialize(agent_resource_info[0]['perf'])
+        return {}
+
+    @operation("Error getting plugin list", default=None)
     def get_plugin_list(self) -> None:
         """Get a list of plugins.
 
         Note: This method is incomplete in the original code.
         """
-        try:
-            message_event_type = 'EXEC'
-            message_payload = {'action': 'listplugins'}
-
-            result = self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
-
-            if 'pluginslist' in result:
-                plugins_list = json_deserialize(decompress_param(result['pluginslist']))
-                plugin_name = 'io.cresco.repo'
-                plugin_list = plugins_list.get('plugins', [])
-
-                for plugin in plugin_list:
-                    if plugin.get('pluginname') == plugin_name:
-                        message_payload = {'action': 'repolist'}
-
-                        for i in range(10):
-                            result = self.messaging.global_plugin_msgevent(
-                                True,
-                                message_event_type,
-                                message_payload,
-                                plugin['region'],
-                                plugin['agent'],
-                                plugin['name']
-                            )
-                            logger.debug(f"Plugin list result: {result}")
-                        break
-        except Exception as e:
-            logger.error(f"Error getting plugin list: {e}")
-
+        message_event_type = 'EXEC'
+        message_payload = {'action': 'listplugins'}
+
+        result = yield self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
+
+        if 'pluginslist' in result:
+            plugins_list = yield self._decode(result['pluginslist'])
+            plugin_name = 'io.cresco.repo'
+            plugin_list = plugins_list.get('plugins', [])
+
+            for plugin in plugin_list:
+                if plugin.get('pluginname') == plugin_name:
+                    message_payload = {'action': 'repolist'}
+
+                    for i in range(10):
+                        result = yield self.messaging.global_plugin_msgevent(
+                            True,
+                            message_event_type,
+                            message_payload,
+                            plugin['region'],
+                            plugin['agent'],
+                            plugin['name']
+                        )
+                        logger.debug(f"Plugin list result: {result}")
+                    break
+
+    @operation("Error uploading plugin to global")
     def upload_plugin_global(self, jar_file_path: str) -> Dict[str, Any]:
         """Upload a plugin to the global repository.
 
@@ -232,27 +222,15 @@ class globalcontroller(CrescoMessageBase):
         Returns:
             Response containing status
         """
-        try:
-            # Get data from jar
-            configparams = get_jar_info(jar_file_path)
-
-            # Read jar data
-            jar_data = read_file_bytes(jar_file_path)
-
-            message_event_type = 'CONFIG'
-            message_payload = {
-                'action': 'savetorepo',
-                'configparams': compress_param(json_serialize(configparams)),
-                'jardata': encode_data(jar_data)
-            }
-
-            logger.info(f"Uploading plugin {configparams.get('pluginname')} to global repository")
-            reply = self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
-            return reply
-        except Exception as e:
-            logger.error(f"Error uploading plugin to global: {e}")
-            raise
+        message_event_type = 'CONFIG'
+        configparams, message_payload = yield self._offload(self._jar_payload, 'savetorepo', jar_file_path, True)
+
+        logger.info(f"Uploading plugin {configparams.get('pluginname')} to global repository")
+        reply = yield self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
+        return reply
 
+    @cached('resourceinfo')
+    @operation("Error getting region resources", default={})
     def get_region_resources(self, dst_region: str) -> Dict[str, Any]:
         """Get region resources.
 
@@ -262,38 +240,49 @@ class globalcontroller(CrescoMessageBase):
         Returns:
             Region resources
         """
-        try:
-            message_event_type = 'EXEC'
-            message_payload = {
-                'action': 'resourceinfo',
-                'action_region': dst_region
-            }
-
-            reply = self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
-
-            if 'resourceinfo' in reply:
-                return json_deserialize(decompress_param(reply['resourceinfo']))
-            return {}
-        except Exception as e:
-            logger.error(f"Error getting region resources: {e}")
-            return {}
+        message_event_type = 'EXEC'
+        message_payload = {
+            'action': 'resourceinfo',
+            'action_region': dst_region
+        }
 
+        reply = yield self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
+
+        if 'resourceinfo' in reply:
+            return (yield self._decode(reply['resourceinfo']))
+        return {}
+
+    @cached('listregions')
+    @operation("Error getting region list", default=[])
     def get_region_list(self) -> List[Dict[str, Any]]:
         """Get a list of regions.
 
         Returns:
             List of regions
         """
-        try:
-            message_event_type = 'EXEC'
-            message_payload = {'action': 'listregions'}
-
-            reply = self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
-
-            if 'regionslist' in reply:
-                regions_list = json_deserialize(decompress_param(reply['regionslist']))
-                return regions_list.get('regions', [])
-            return []
-        except Exception as e:
-            logger.error(f"Error getting region list: {e}")
-            return []
+        message_event_type = 'EXEC'
+        message_payload = {'action': 'listregions'}
+
+        reply = yield self.messaging.global_controller_msgevent(True, message_event_type, message_payload)
+
+        if 'regionslist' in reply:
+            regions_list = yield self._decode(reply['regionslist'])
+            return regions_list.get('regions', [])
+        return []
+
+
+class globalcontroller_async(globalcontroller):
+    """Awaitable global controller operations for use with the asyncio client.
+
+    Mirrors ``globalcontroller`` method for method; every call returns a
+    coroutine that runs on the caller's event loop through an async
+    ``messaging`` instance.
+    """
+
+    asynchronous = True
+
+    async def _decode(self, param: str) -> Any:
+        """Decode a gzip+base64 JSON reply field, large ones off the event loop."""
+        if self.decoder is None:
+            return decompress_json(param)
+        return await self.decoder.decode_async(param)
@@ -1,55 +1,178 @@
 """
 Messaging implementation for Cresco communications with direct response handling.
 """
+import copy
 import json
 import logging
 import asyncio
 import time
 import traceback
 import threading
-from typing import Dict, Any, Optional, Union
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 import concurrent.futures
 
 from .base_classes import CrescoMessageBase
+from .breaker import circuit_open
+from .cache import READ_ONLY_ACTIONS
+from .metrics import SIZE_BUCKETS
+from .metrics import registry as default_registry
+from .ratelimit import rate_limited
+from .utils import json_dumps
+from .wc_interface import LANES
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Controller commands and health probes, written ahead of other queued messages
+CONTROL_ACTIONS = frozenset({
+    'stopcontroller', 'restartcontroller', 'restartframework', 'killjvm', 'iscontrolleractive',
+    'getcontrollerstatus',
+})
+
+# Messages at least this large are written in the bulk lane
+BULK_BYTES = 256 * 1024
+
+# Seconds a coalesced caller waits past the leader's deadline, for the rate
+# limit and connection waits the leader may spend before its timer starts
+COALESCE_GRACE = 1.0
+
+
+class coalesced_read:
+    """A read in flight that identical callers wait on instead of sending their own."""
+
+    def __init__(self, timeout: float):
+        """Start tracking a read.
+
+        Args:
+            timeout: Timeout of the leader's request
+        """
+        self.future = concurrent.futures.Future()  # Settled by the leader with its reply or error
+        self.followers = 0  # Callers that joined
+        self.deadline = time.monotonic() + timeout  # When the leader gives up
+
 
 class messaging(CrescoMessageBase):
-    """Messaging class for Cresco communication."""
+    """Messaging class for Cresco communication.
 
-    def __init__(self, ws_interface):
+    Methods are coroutines that run on the caller's event loop; see
+    ``messaging_sync`` for the blocking variant used by ``clientlib``.
+    """
+
+    def __init__(self, ws_interface, metrics=None, cache=None, limiter=None, breakers=None):
         """Initialize messaging with a WebSocket interface.
 
         Args:
             ws_interface: WebSocket interface for communication
+            metrics: MetricsRegistry to record calls in (default: the shared registry)
+            cache: Optional response_cache for read-only component queries
+            limiter: Optional rate_limiter pacing outbound messages
+            breakers: Optional breaker_registry failing fast on unreachable destinations
         """
         self.ws_interface = ws_interface
+        self.metrics = metrics if metrics is not None else default_registry
+        self.cache = cache
+        self.limiter = limiter
+        self.breakers = breakers
         self._lock = asyncio.Lock()  # For thread safety
 
-    async def _send_message(self, message_info: Dict[str, Any], message_payload: Dict[str, Any]) -> Optional[
-        Dict[str, Any]]:
+    @staticmethod
+    def _labels(message_info: Dict[str, Any], message_payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Metric labels identifying a message."""
+        return {
+            'message_type': message_info.get('message_type', ''),
+            'action': message_payload.get('action', ''),
+            'dst_region': message_info.get('dst_region', ''),
+        }
+
+    @staticmethod
+    def _lane(message_payload: Dict[str, Any], size: int) -> str:
+        """Write priority of a message: 'control', 'normal' or 'bulk'."""
+        if message_payload.get('action') in CONTROL_ACTIONS:
+            return 'control'
+        if 'jardata' in message_payload or size >= BULK_BYTES:
+            return 'bulk'
+        return 'normal'
+
+    def _invalidate_cache(self, message_info: Dict[str, Any], message_payload: Dict[str, Any]):
+        """Drop cached query results that a CONFIG message may change."""
+        if self.cache is None or message_info.get('message_event_type') != 'CONFIG':
+            return
+        if message_payload.get('action') in READ_ONLY_ACTIONS:
+            return
+
+        message_type = message_info.get('message_type')
+        if message_type in ('global_agent_msgevent', 'global_plugin_msgevent'):
+            self.cache.invalidate(message_info.get('dst_region'), message_info.get('dst_agent'))
+        elif message_type == 'regional_controller_msgevent':
+            self.cache.invalidate(message_info.get('region_id'))
+        else:
+            # Global controller changes (pipelines, repo) can touch any agent
+            self.cache.invalidate()
+
+    def _record(self, labels: Dict[str, Any], request_bytes: int, elapsed: Optional[float] = None,
+                response_bytes: Optional[int] = None, error: Optional[BaseException] = None):
+        """Record one sent message in the metrics registry.
+
+        Args:
+            labels: Labels from ``_labels``
+            request_bytes: Size of the serialized request
+            elapsed: Seconds from send to reply, if the call succeeded
+            response_bytes: Size of the reply, if there was one
+            error: Exception the call failed with, if any
+        """
+        metrics = self.metrics
+        metrics.inc('cresco_rpc_requests_total', labels)
+        metrics.observe('cresco_rpc_request_bytes', labels, request_bytes, SIZE_BUCKETS)
+        if error is not None:
+            metrics.inc('cresco_rpc_errors_total', labels)
+            if isinstance(error, (TimeoutError, asyncio.TimeoutError, concurrent.futures.TimeoutError)):
+                metrics.inc('cresco_rpc_timeouts_total', labels)
+            return
+        if elapsed is not None:
+            metrics.observe('cresco_rpc_latency_seconds', labels, elapsed)
+        if response_bytes is not None:
+            metrics.observe('cresco_rpc_response_bytes', labels, response_bytes, SIZE_BUCKETS)
+
+    async def _send_message(self, message_info: Dict[str, Any], message_payload: Dict[str, Any],
+                            timeout: float = 8.0) -> Optional[Dict[str, Any]]:
         """Send a message via WebSocket with comprehensive logging for diagnostics.
 
         Args:
             message_info: Message metadata
             message_payload: Message content
+            timeout: Timeout in seconds (default: 8.0)
 
         Returns:
             Response dict if is_rpc is True, otherwise None
         """
-        message = {
-            'message_info': message_info,
-            'message_payload': message_payload
-        }
+        message_type = message_info.get('message_type', 'unknown')
+        message_event = message_info.get('message_event_type', 'unknown')
+        is_rpc = message_info.get('is_rpc', False)
+        guarded = is_rpc and self.breakers is not None
+        outcome = None  # Breaker outcome: True for a reply, False for a timeout
 
         try:
+            if guarded:
+                try:
+                    self.breakers.allow(message_info)
+                except circuit_open:
+                    guarded = False
+                    raise
+
+            if self.limiter is not None:
+                await self.limiter.acquire_async(message_info)
+
+            if is_rpc:
+                # Tag the request so the reply can be routed back to this caller
+                request_id = self.ws_interface.next_request_id()
+                message_info['request_id'] = request_id
+
             # Prepare message
-            json_message = json.dumps(message)
-            message_type = message_info.get('message_type', 'unknown')
-            message_event = message_info.get('message_event_type', 'unknown')
-            is_rpc = message_info.get('is_rpc', False)
+            message = {
+                'message_info': message_info,
+                'message_payload': message_payload
+            }
+            json_message = json_dumps(message)
 
             # Log formatted message details for better diagnostics
             logger.info(f"Sending {message_type}/{message_event} (RPC: {is_rpc})")
@@ -63,42 +186,48 @@ class messaging(CrescoMessageBase):
                 logger.info(f"Action: {message_payload['action']}")
 
             # Send message
+            labels = self._labels(message_info, message_payload)
+            start = time.perf_counter()
             try:
                 if is_rpc:
-                    # For RPC calls, use send which also receives the response
-                    response = await self.ws_interface.send(json_message)
-
-                    logger.debug(f"Received response of length {len(response)}")
-                    try:
-                        parsed_response = json.loads(response)
-                        logger.debug(
-                            f"Response keys: {list(parsed_response.keys()) if isinstance(parsed_response, dict) else 'Not a dict'}")
-
-                        # Log response details
-                        if isinstance(parsed_response, dict):
-                            if 'status_code' in parsed_response:
-                                logger.info(f"Response status code: {parsed_response.get('status_code')}")
-                            if 'error' in parsed_response:
-                                logger.warning(f"Error in response: {parsed_response.get('error')}")
-
-                        return parsed_response
-                    except json.JSONDecodeError as e:
-                        # Log more details about the invalid JSON
-                        logger.error(f"Invalid JSON response: {response[:1000]}...")
-                        logger.error(f"JSON error: {e}")
-                        raise ValueError(f"Invalid JSON response from server: {e}")
+                    # For RPC calls, await the reply routed to this request
+                    response_text, parsed_response = await self.ws_interface.exchange_async(
+                        json_message, timeout=timeout, request_id=request_id,
+                        lane=self._lane(message_payload, len(json_message)))
+                    if parsed_response is None:
+                        logger.error(f"JSON error: {response_text[:200]}")
+                        raise ValueError(f"Invalid JSON response from server: {response_text[:200]}")
+                    self._record(labels, len(json_message), time.perf_counter() - start, len(response_text))
+                    outcome = True
+
+                    # Log response details
+                    if isinstance(parsed_response, dict):
+                        if 'status_code' in parsed_response:
+                            logger.info(f"Response status code: {parsed_response.get('status_code')}")
+                        if 'error' in parsed_response:
+                            logger.warning(f"Error in response: {parsed_response.get('error')}")
+
+                    return parsed_response
                 else:
                     # For non-RPC calls, just send
-                    await self.ws_interface.send_async(json_message)
+                    await self.ws_interface.send_async(json_message, self._lane(message_payload, len(json_message)))
+                    self._record(labels, len(json_message), time.perf_counter() - start)
                     return None
             except TimeoutError as e:
+                self._record(labels, len(json_message), error=e)
+                outcome = False
                 logger.error(f"Timeout during message exchange: {e}")
                 logger.error(f"Operation was: {message_type}/{message_event}")
                 raise
             except ConnectionError as e:
+                self._record(labels, len(json_message), error=e)
                 logger.error(f"Connection error during message exchange: {e}")
                 raise
+            except ValueError as e:
+                self._record(labels, len(json_message), error=e)
+                raise
             except Exception as e:
+                self._record(labels, len(json_message), error=e)
                 logger.error(f"Unexpected error in message exchange: {type(e).__name__}: {e}")
                 logger.error(f"Stack trace: {traceback.format_exc()}")
                 raise
@@ -106,19 +235,27 @@ class messaging(CrescoMessageBase):
         except Exception as e:
             logger.error(f"Error in _send_message: {type(e).__name__}: {e}")
             raise
-
-        return None
+        finally:
+            if guarded:
+                self.breakers.record(message_info, outcome)
+            # Once the change has been applied; reads that overlapped it see
+            # the new cache generation and do not store their replies
+            self._invalidate_cache(message_info, message_payload)
 
     async def global_controller_msgevent(self,
                                          is_rpc: bool,
                                          message_event_type: str,
-                                         message_payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+                                         message_payload: Dict[str, Any],
+                                         timeout: float = 8.0,
+                                         region_id: Optional[str] = None,
+                                         agent_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Send message to global controller.
 
         Args:
             is_rpc: Whether to expect a response
             message_event_type: Type of message event
             message_payload: Message content
+            timeout: Timeout in seconds (default: 8.0)
 
         Returns:
             Response if is_rpc is True, otherwise None
@@ -128,10 +265,117 @@ class messaging(CrescoMessageBase):
             'message_event_type': message_event_type,
             'is_rpc': is_rpc
         }
+        if (region_id is not None) and (agent_id is not None):
+            message_info['region_id'] = region_id
+            message_info['agent_id'] = agent_id
+
+        return await self._send_message(message_info, message_payload, timeout)
+
+    async def regional_controller_msgevent(self,
+                                           is_rpc: bool,
+                                           message_event_type: str,
+                                           message_payload: Dict[str, Any],
+                                           timeout: float = 8.0,
+                                           region_id: Optional[str] = None,
+                                           agent_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Send message to the regional controller.
+
+        Args:
+            is_rpc: Whether to expect a response
+            message_event_type: Type of message event
+            message_payload: Message content
+            timeout: Timeout in seconds (default: 8.0)
+
+        Returns:
+            Response if is_rpc is True, otherwise None
+        """
+        message_info = {
+            'message_type': 'regional_controller_msgevent',
+            'message_event_type': message_event_type,
+            'is_rpc': is_rpc
+        }
+        if (region_id is not None) and (agent_id is not None):
+            message_info['region_id'] = region_id
+            message_info['agent_id'] = agent_id
+
+        return await self._send_message(message_info, message_payload, timeout)
+
+    async def global_agent_msgevent(self, is_rpc: bool, message_event_type: str, message_payload: Dict[str, Any],
+                                    dst_region: str, dst_agent: str,
+                                    timeout: float = 8.0) -> Optional[Dict[str, Any]]:
+        """Send message to an agent.
+
+        Args:
+            is_rpc: Whether to expect a response
+            message_event_type: Type of message event
+            message_payload: Message content
+            dst_region: Destination region
+            dst_agent: Destination agent
+            timeout: Timeout in seconds (default: 8.0)
+
+        Returns:
+            Response if is_rpc is True, otherwise None
+        """
+        message_info = {
+            'message_type': 'global_agent_msgevent',
+            'message_event_type': message_event_type,
+            'dst_region': dst_region,
+            'dst_agent': dst_agent,
+            'is_rpc': is_rpc
+        }
+
+        return await self._send_message(message_info, message_payload, timeout)
+
+    async def plugin_msgevent(self, is_rpc: bool, message_event_type: str, message_payload: Dict[str, Any],
+                              plugin_name: str, timeout: float = 8.0) -> Optional[Dict[str, Any]]:
+        """Send message to a plugin.
+
+        Args:
+            is_rpc: Whether to expect a response
+            message_event_type: Type of message event
+            message_payload: Message content
+            plugin_name: Name of the plugin
+            timeout: Timeout in seconds (default: 8.0)
+
+        Returns:
+            Response if is_rpc is True, otherwise None
+        """
+        message_info = {
+            'message_type': 'plugin_msgevent',
+            'message_event_type': message_event_type,
+            'dst_plugin': plugin_name,
+            'is_rpc': is_rpc
+        }
+
+        return await self._send_message(message_info, message_payload, timeout)
+
+    async def global_plugin_msgevent(self, is_rpc: bool, message_event_type: str, message_payload: Dict[str, Any],
+                                     dst_region: str, dst_agent: str, dst_plugin: str,
+                                     timeout: float = 8.0) -> Optional[Dict[str, Any]]:
+        """Send message to a specific plugin on a specific agent.
+
+        Args:
+            is_rpc: Whether to expect a response
+            message_event_type: Type of message event
+            message_payload: Message content
+            dst_region: Destination region
+            dst_agent: Destination agent
+            dst_plugin: Destination plugin
+            timeout: Timeout in seconds (default: 8.0)
 
-        return await self._send_message(message_info, message_payload)
+        Returns:
+            Response if is_rpc is True, otherwise None
+        """
+        message_info = {
+            'message_type': 'global_plugin_msgevent',
+            'message_event_type': message_event_type,
+            'dst_region': dst_region,
+            'dst_agent': dst_agent,
+            'dst_plugin': dst_plugin,
+            'is_rpc': is_rpc
+        }
 
-    # Other async message methods remain the same
+        return await self._send_message(message_info, message_payload, timeout)
 
     def get_region(self) -> str:
         """Get the region from the connection."""
@@ -147,103 +391,231 @@ class messaging(CrescoMessageBase):
 
 
 class messaging_sync(messaging):
-    """Synchronous wrapper for async messaging functions."""
+    """Synchronous wrapper for async messaging functions.
 
-    def __init__(self, ws_interface):
+    Calls do not serialize behind each other: every RPC is tagged with a
+    request ID and waits only for its own reply, so many threads can have
+    requests outstanding on the same socket at once. Identical reads that
+    are in flight at the same time share a single request.
+    """
+
+    def __init__(self, ws_interface, metrics=None, cache=None, limiter=None, breakers=None,
+                 coalesce: bool = True, on_send_error: Optional[Callable[[Dict[str, Any], Exception], None]] = None):
         """Initialize with a WebSocket interface.
 
         Args:
             ws_interface: WebSocket interface for communication
+            metrics: MetricsRegistry to record calls in (default: the shared registry)
+            cache: Optional response_cache for read-only component queries
+            limiter: Optional rate_limiter pacing outbound messages
+            breakers: Optional breaker_registry failing fast on unreachable destinations
+            coalesce: Merge identical concurrent reads into one request
+            on_send_error: Called with the message_info and exception of a
+                queued non-RPC message that could not be written; runs on the
+                event loop thread, so it must not block
         """
-        super().__init__(ws_interface)
-        self._operation_lock = threading.RLock()  # Reentrant lock for operations
-        self._failed_connection = False  # Flag to track if connection has failed
+        super().__init__(ws_interface, metrics, cache, limiter, breakers)
+        self._operation_lock = threading.RLock()  # Guards connection state changes
+        self.coalesce = coalesce
+        self.on_send_error = on_send_error
+        # Coalescing key -> the read identical callers wait on
+        self._in_flight: Dict[Tuple, coalesced_read] = {}
+        self._in_flight_lock = threading.Lock()
+
+    def _coalesce_key(self, message_info: Dict[str, Any], message_payload: Dict[str, Any]) -> Optional[Tuple]:
+        """Key identifying identical reads, or None if the message must be sent as is."""
+        if not (self.coalesce and message_info['is_rpc']):
+            return None
+        # Anything else, including arbitrary plugin EXECs, may have side effects
+        if message_payload.get('action') not in READ_ONLY_ACTIONS:
+            return None
+        return (
+            message_info['message_type'],
+            message_info.get('message_event_type'),
+            message_info.get('dst_region'),
+            message_info.get('dst_agent'),
+            message_info.get('dst_plugin'),
+            message_info.get('region_id'),
+            message_info.get('agent_id'),
+            json_dumps(message_payload),
+        )
+
+    def _dispatch(self, message_info: Dict[str, Any], message_payload: Dict[str, Any], timeout: float,
+                  description: str) -> Optional[Dict[str, Any]]:
+        """Send a message, joining an identical read already in flight if there is one.
 
-    def global_controller_msgevent(self, is_rpc, message_event_type, message_payload, timeout=8.0, region_id: Optional[str] = None, agent_id: Optional[str] = None):
-        """Synchronous wrapper for global_controller_msgevent using direct send.
+        Args:
+            message_info: Message metadata
+            message_payload: Message content
+            timeout: Timeout in seconds
+            description: Short label used in log messages
+
+        Returns:
+            Response if is_rpc is True, otherwise None. Coalesced callers
+            each get their own copy of the response. They wait as long as
+            the request they joined, whatever their own ``timeout``.
+        """
+        key = self._coalesce_key(message_info, message_payload)
+        if key is None:
+            return self._send(message_info, message_payload, timeout, description)
+
+        with self._in_flight_lock:
+            entry = self._in_flight.get(key)
+            leader = entry is None
+            if leader:
+                entry = self._in_flight[key] = coalesced_read(timeout)
+            else:
+                entry.followers += 1
+        future = entry.future
+
+        if not leader:
+            self.metrics.inc('cresco_rpc_coalesced_total', self._labels(message_info, message_payload))
+            logger.debug(f"Joining in-flight {description}")
+            try:
+                # Until the leader gives up: its reply can arrive after this
+                # caller's own timeout would have run out
+                wait = max(0.0, entry.deadline - time.monotonic()) + COALESCE_GRACE
+                return copy.deepcopy(future.result(wait))
+            except concurrent.futures.TimeoutError:
+                logger.error(f"Timeout waiting for coalesced {description}")
+                return {}
+
+        try:
+            response = self._send(message_info, message_payload, timeout, description)
+        except BaseException as e:
+            with self._in_flight_lock:
+                self._in_flight.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._in_flight_lock:
+            self._in_flight.pop(key, None)
+            followers = entry.followers
+        # Followers copy from a copy of their own, since this caller may
+        # change its response while they are still copying it
+        future.set_result(copy.deepcopy(response) if followers else response)
+        return response
+
+    def _send(self, message_info: Dict[str, Any], message_payload: Dict[str, Any], timeout: float,
+              description: str) -> Optional[Dict[str, Any]]:
+        """Send a prepared message and, for RPCs, wait for the matching reply.
 
         Args:
-            is_rpc: Whether to expect a response
-            message_event_type: Type of message event
+            message_info: Message metadata
             message_payload: Message content
-            timeout: Timeout in seconds (default: 8.0)
+            timeout: Timeout in seconds
+            description: Short label used in log messages
 
         Returns:
             Response if is_rpc is True, otherwise None
         """
-        # Don't attempt if we know the connection is bad
-        if self._failed_connection:
-            logger.warning("Not attempting to send message due to known connection failure")
-            raise ConnectionError("WebSocket connection has failed")
-
-        with self._operation_lock:  # Thread safety
-            try:
-                # Prepare message info
-                message_info = {
-                    'message_type': 'global_controller_msgevent',
-                    'message_event_type': message_event_type,
-                    'is_rpc': is_rpc
-                }
-                if (region_id is not None) and (agent_id is not None):
-                    message_info['region_id'] = region_id
-                    message_info['agent_id'] = agent_id
-
-                # Create complete message
-                message = {
-                    'message_info': message_info,
-                    'message_payload': message_payload
-                }
-
-                # Convert to JSON
-                json_message = json.dumps(message)
-
-                # Log the operation
-                logger.info(f"Sending global_controller_msgevent/{message_event_type} (RPC: {is_rpc})")
-                if 'action' in message_payload:
-                    logger.info(f"Action: {message_payload['action']}")
+        is_rpc = message_info['is_rpc']
+        guarded = False
+        outcome = None  # Breaker outcome: True for a reply, False for a timeout
+        queued = False  # Handed to the outbound queue, which finishes the bookkeeping
+        try:
+            if is_rpc and self.breakers is not None:
+                try:
+                    self.breakers.allow(message_info)
+                except circuit_open as e:
+                    logger.warning(f"Not sending {description}: {e}")
+                    return {}
+                guarded = True
+
+            if self.limiter is not None:
+                try:
+                    self.limiter.acquire(message_info)
+                except rate_limited as e:
+                    logger.warning(f"Not sending {description}: {e}")
+                    return {} if is_rpc else None
+
+            if is_rpc:
+                # Tag the request so the reply can be routed back to this caller
+                request_id = self.ws_interface.next_request_id()
+                message_info['request_id'] = request_id
+
+            # Create complete message
+            message = {
+                'message_info': message_info,
+                'message_payload': message_payload
+            }
+
+            # Convert to JSON
+            json_message = json_dumps(message)
+
+            # Log the operation
+            logger.info(f"Sending {description} (RPC: {is_rpc})")
+            if 'action' in message_payload:
+                logger.info(f"Action: {message_payload['action']}")
 
-                if is_rpc:
-                    # For RPC calls, use the direct synchronous send
-                    try:
-                        response_text = self.ws_interface.send_direct(json_message, timeout=timeout)
-                    except (ConnectionError, TimeoutError, concurrent.futures.TimeoutError) as e:
-                        # Mark connection as failed for subsequent calls
-                        self._failed_connection = True
-                        logger.error(f"Connection failure during send_direct: {e}")
-                        # Return empty dict instead of raising to allow operation to continue
-                        return {}
-
-                    # Parse response
-                    try:
-                        response = json.loads(response_text)
-                        return response
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Invalid JSON response: {response_text[:200]}...")
-                        return {}
-                else:
-                    # For non-RPC calls, use the WebSocket's own async send via run_coroutine_threadsafe
-                    # on the WebSocket's own event loop
-                    if not self.ws_interface._loop or self.ws_interface._loop.is_closed():
-                        logger.error("Event loop is closed or not initialized")
-                        self._failed_connection = True
-                        return None
-
-                    try:
-                        future = asyncio.run_coroutine_threadsafe(
-                            self.ws_interface.send_async(json_message),
-                            self.ws_interface._loop
-                        )
-                        future.result(timeout=timeout)
-                    except (ConnectionError, TimeoutError, concurrent.futures.TimeoutError) as e:
-                        self._failed_connection = True
-                        logger.error(f"Connection failure during async send: {e}")
+            labels = self._labels(message_info, message_payload)
+            start = time.perf_counter()
+            if is_rpc:
+                try:
+                    response_text, parsed = self.ws_interface.exchange(
+                        json_message, timeout=timeout, request_id=request_id,
+                        lane=self._lane(message_payload, len(json_message)))
+                    if parsed is None:
+                        raise ValueError(f"Invalid JSON response: {response_text[:200]}")
+                except (ConnectionError, TimeoutError, concurrent.futures.TimeoutError) as e:
+                    self._record(labels, len(json_message), error=e)
+                    if not isinstance(e, ConnectionError):
+                        outcome = False
+                    # A dropped socket is reconnected by ws_interface, so a failure
+                    # here only affects this call
+                    logger.error(f"Connection failure during send_request: {e}")
+                    # Return empty dict instead of raising to allow operation to continue
+                    return {}
+                except ValueError as e:
+                    self._record(labels, len(json_message), error=e)
+                    logger.error(str(e))
+                    return {}
+                self._record(labels, len(json_message), time.perf_counter() - start, len(response_text))
+                outcome = True
+                return parsed
+            else:
+                # Non-RPC calls are queued; the loop thread writes them and
+                # reports the outcome to delivered()
+                def delivered(error: Optional[Exception]):
+                    self._invalidate_cache(message_info, message_payload)
+                    if error is None:
+                        self._record(labels, len(json_message), time.perf_counter() - start)
+                    else:
+                        self._record(labels, len(json_message), error=error)
+                        logger.error(f"Failed to deliver {description}: {error}")
+                        if self.on_send_error is not None:
+                            self.on_send_error(message_info, error)
+
+                try:
+                    self.ws_interface.send_nowait(json_message, lane=self._lane(message_payload, len(json_message)),
+                                                  done=delivered, timeout=timeout)
+                except (ConnectionError, TimeoutError, RuntimeError) as e:
+                    self._record(labels, len(json_message), error=e)
+                    logger.error(f"Connection failure during async send: {e}")
                     return None
-            except Exception as e:
-                logger.error(f"Error in global_controller_msgevent: {e}")
-                self._failed_connection = True
-                return {} if is_rpc else None
+                queued = True
+                return None
+        except Exception as e:
+            logger.error(f"Error in {message_info['message_type']}: {e}")
+            return {} if is_rpc else None
+        finally:
+            if guarded:
+                self.breakers.record(message_info, outcome)
+            # Once the change has been applied; overlapping reads are not cached
+            if not queued:
+                self._invalidate_cache(message_info, message_payload)
 
-    def regional_controller_msgevent(self, is_rpc, message_event_type, message_payload, timeout=8.0, region_id: Optional[str] = None, agent_id: Optional[str] = None):
+    def flush(self, timeout: float = 8.0) -> bool:
+        """Block until every queued non-RPC message has been written.
+
+        Args:
+            timeout: Timeout in seconds
+
+        Returns:
+            True if everything was written in time
+        """
+        return self.ws_interface.flush(timeout)
+
+    def global_controller_msgevent(self, is_rpc, message_event_type, message_payload, timeout=8.0, region_id: Optional[str] = None, agent_id: Optional[str] = None):
         """Synchronous wrapper for global_controller_msgevent using direct send.
 
         Args:
@@ -255,175 +627,54 @@ class messaging_sync(messaging):
         Returns:
             Response if is_rpc is True, otherwise None
         """
-        # Don't attempt if we know the connection is bad
-        if self._failed_connection:
-            logger.warning("Not attempting to send message due to known connection failure")
-            raise ConnectionError("WebSocket connection has failed")
-
-        with self._operation_lock:  # Thread safety
-            try:
-                # Prepare message info
-                message_info = {
-                    'message_type': 'regional_controller_msgevent',
-                    'message_event_type': message_event_type,
-                    'is_rpc': is_rpc
-                }
-                if (region_id is not None) and (agent_id is not None):
-                    message_info['region_id'] = region_id
-                    message_info['agent_id'] = agent_id
-
-                # Create complete message
-                message = {
-                    'message_info': message_info,
-                    'message_payload': message_payload
-                }
-
-                # Convert to JSON
-                json_message = json.dumps(message)
-
-                # Log the operation
-                logger.info(f"Sending regional_controller_msgevent/{message_event_type} (RPC: {is_rpc})")
-                if 'action' in message_payload:
-                    logger.info(f"Action: {message_payload['action']}")
-
-                if is_rpc:
-                    # For RPC calls, use the direct synchronous send
-                    try:
-                        response_text = self.ws_interface.send_direct(json_message, timeout=timeout)
-                    except (ConnectionError, TimeoutError, concurrent.futures.TimeoutError) as e:
-                        # Mark connection as failed for subsequent calls
-                        self._failed_connection = True
-                        logger.error(f"Connection failure during send_direct: {e}")
-                        # Return empty dict instead of raising to allow operation to continue
-                        return {}
-
-                    # Parse response
-                    try:
-                        response = json.loads(response_text)
-                        return response
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Invalid JSON response: {response_text[:200]}...")
-                        return {}
-                else:
-                    # For non-RPC calls, use the WebSocket's own async send via run_coroutine_threadsafe
-                    # on the WebSocket's own event loop
-                    if not self.ws_interface._loop or self.ws_interface._loop.is_closed():
-                        logger.error("Event loop is closed or not initialized")
-                        self._failed_connection = True
-                        return None
-
-                    try:
-                        future = asyncio.run_coroutine_threadsafe(
-                            self.ws_interface.send_async(json_message),
-                            self.ws_interface._loop
-                        )
-                        future.result(timeout=timeout)
-                    except (ConnectionError, TimeoutError, concurrent.futures.TimeoutError) as e:
-                        self._failed_connection = True
-                        logger.error(f"Connection failure during async send: {e}")
-                    return None
-            except Exception as e:
-                logger.error(f"Error in global_controller_msgevent: {e}")
-                self._failed_connection = True
-                return {} if is_rpc else None
-
-    # Other synchronous message methods follow the same pattern
-    # Implement with improved error handling for each type of message
-
-    def global_agent_msgevent(self, is_rpc, message_event_type, message_payload, dst_region, dst_agent, timeout=8.0):
-        """Synchronous wrapper for global_agent_msgevent using direct send."""
-        if self._failed_connection:
-            logger.warning("Not attempting to send message due to known connection failure")
-            return {} if is_rpc else None
-
-        with self._operation_lock:  # Thread safety
-            try:
-                # Prepare message info
-                message_info = {
-                    'message_type': 'global_agent_msgevent',
-                    'message_event_type': message_event_type,
-                    'dst_region': dst_region,
-                    'dst_agent': dst_agent,
-                    'is_rpc': is_rpc
-                }
-
-                # Create complete message
-                message = {
-                    'message_info': message_info,
-                    'message_payload': message_payload
-                }
-
-                # Convert to JSON
-                json_message = json.dumps(message)
-
-                # Log the operation
-                logger.info(
-                    f"Sending global_agent_msgevent/{message_event_type} to {dst_region}/{dst_agent} (RPC: {is_rpc})")
-                if 'action' in message_payload:
-                    logger.info(f"Action: {message_payload['action']}")
+        message_info = {
+            'message_type': 'global_controller_msgevent',
+            'message_event_type': message_event_type,
+            'is_rpc': is_rpc
+        }
+        if (region_id is not None) and (agent_id is not None):
+            message_info['region_id'] = region_id
+            message_info['agent_id'] = agent_id
 
-                if is_rpc:
-                    # For RPC calls, use the direct synchronous send
-                    try:
-                        response_text = self.ws_interface.send_direct(json_message, timeout=timeout)
-                    except (ConnectionError, TimeoutError, concurrent.futures.TimeoutError) as e:
-                        # Mark connection as failed for subsequent calls
-                        self._failed_connection = True
-                        logger.error(f"Connection failure during send_direct: {e}")
-                        # Return empty dict instead of raising
-                        return {}
-
-                    # Parse response
-                    try:
-                        response = json.loads(response_text)
-                        return response
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Invalid JSON response: {response_text[:200]}...")
-                        return {}
-                else:
-                    # For non-RPC calls, use the WebSocket's own async send
-                    if not self.ws_interface._loop or self.ws_interface._loop.is_closed():
-                        logger.error("Event loop is closed or not initialized")
-                        self._failed_connection = True
-                        return None
-
-                    try:
-                        future = asyncio.run_coroutine_threadsafe(
-                            self.ws_interface.send_async(json_message),
-                            self.ws_interface._loop
-                        )
-                        future.result(timeout=timeout)
-                    except (ConnectionError, TimeoutError, concurrent.futures.TimeoutError) as e:
-                        self._failed_connection = True
-                        logger.error(f"Connection failure during async send: {e}")
-                    return None
-            except Exception as e:
-                logger.error(f"Error in global_agent_msgevent: {e}")
-                self._failed_connection = True
-                return {} if is_rpc else None
+        return self._dispatch(message_info, message_payload, timeout,
+                              f"global_controller_msgevent/{message_event_type}")
 
-    async def plugin_msgevent(self, is_rpc: bool, message_event_type: str, message_payload: Dict[str, Any],
-                              plugin_name: str) -> Optional[Dict[str, Any]]:
-        """Send message to a plugin.
+    def regional_controller_msgevent(self, is_rpc, message_event_type, message_payload, timeout=8.0, region_id: Optional[str] = None, agent_id: Optional[str] = None):
+        """Synchronous wrapper for regional_controller_msgevent using direct send.
 
         Args:
             is_rpc: Whether to expect a response
             message_event_type: Type of message event
             message_payload: Message content
-            plugin_name: Name of the plugin
+            timeout: Timeout in seconds (default: 8.0)
 
         Returns:
             Response if is_rpc is True, otherwise None
         """
         message_info = {
-            'message_type': 'plugin_msgevent',
+            'message_type': 'regional_controller_msgevent',
             'message_event_type': message_event_type,
-            'plugin_name': plugin_name,
             'is_rpc': is_rpc
         }
+        if (region_id is not None) and (agent_id is not None):
+            message_info['region_id'] = region_id
+            message_info['agent_id'] = agent_id
+
+        return self._dispatch(message_info, message_payload, timeout,
+                              f"regional_controller_msgevent/{message_event_type}")
 
+    def global_agent_msgevent(self, is_rpc, message_event_type, message_payload, dst_region, dst_agent, timeout=8.0):
+        """Synchronous wrapper for global_agent_msgevent using direct send."""
+        message_info = {
+            'message_type': 'global_agent_msgevent',
+            'message_event_type': message_event_type,
+            'dst_region': dst_region,
+            'dst_agent': dst_agent,
+            'is_rpc': is_rpc
+        }
 
-        return await self._send_message(message_info, message_payload)
+        return self._dispatch(message_info, message_payload, timeout,
+                              f"global_agent_msgevent/{message_event_type} to {dst_region}/{dst_agent}")
 
     def plugin_msgevent(self, is_rpc, message_event_type, message_payload, plugin_name, timeout=8.0):
         """Synchronous wrapper for plugin_msgevent using direct send.
@@ -438,142 +689,200 @@ class messaging_sync(messaging):
         Returns:
             Response if is_rpc is True, otherwise None
         """
-        if self._failed_connection:
-            logger.warning("Not attempting to send message due to known connection failure")
-            return {} if is_rpc else None
-
-        with self._operation_lock:  # Thread safety
-            try:
-                # Prepare message info
-                message_info = {
-                    'message_type': 'plugin_msgevent',
-                    'message_event_type': message_event_type,
-                    'dst_plugin': plugin_name,
-                    'is_rpc': is_rpc
-                }
-
-                # Create complete message
-                message = {
-                    'message_info': message_info,
-                    'message_payload': message_payload
-                }
-
-                # Convert to JSON
-                json_message = json.dumps(message)
-
-                # Log the operation
-                logger.info(f"Sending plugin_msgevent/{message_event_type} to plugin {plugin_name} (RPC: {is_rpc})")
-                if 'action' in message_payload:
-                    logger.info(f"Action: {message_payload['action']}")
+        message_info = {
+            'message_type': 'plugin_msgevent',
+            'message_event_type': message_event_type,
+            'dst_plugin': plugin_name,
+            'is_rpc': is_rpc
+        }
 
-                if is_rpc:
-                    # For RPC calls, use the direct synchronous send
-                    try:
-                        response_text = self.ws_interface.send_direct(json_message, timeout=timeout)
-                    except (ConnectionError, TimeoutError, concurrent.futures.TimeoutError) as e:
-                        # Mark connection as failed for subsequent calls
-                        self._failed_connection = True
-                        logger.error(f"Connection failure during send_direct: {e}")
-                        return {}
-
-                    # Parse response
-                    try:
-                        response = json.loads(response_text)
-                        return response
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Invalid JSON response: {response_text[:200]}...")
-                        return {}
-                else:
-                    # For non-RPC calls, use WebSocket's async send
-                    if not self.ws_interface._loop or self.ws_interface._loop.is_closed():
-                        logger.error("Event loop is closed or not initialized")
-                        self._failed_connection = True
-                        return None
-
-                    try:
-                        future = asyncio.run_coroutine_threadsafe(
-                            self.ws_interface.send_async(json_message),
-                            self.ws_interface._loop
-                        )
-                        future.result(timeout=timeout)
-                    except (ConnectionError, TimeoutError, concurrent.futures.TimeoutError) as e:
-                        self._failed_connection = True
-                        logger.error(f"Connection failure during async send: {e}")
-                    return None
-            except Exception as e:
-                logger.error(f"Error in plugin_msgevent: {e}")
-                self._failed_connection = True
-                return {} if is_rpc else None
+        return self._dispatch(message_info, message_payload, timeout,
+                              f"plugin_msgevent/{message_event_type} to plugin {plugin_name}")
 
     def global_plugin_msgevent(self, is_rpc, message_event_type, message_payload, dst_region, dst_agent, dst_plugin,
                                timeout=8.0):
         """Synchronous wrapper for sending a message to a specific plugin on a specific agent."""
-        if self._failed_connection:
-            logger.warning("Not attempting to send message due to known connection failure")
-            return {} if is_rpc else None
+        message_info = {
+            'message_type': 'global_plugin_msgevent',
+            'message_event_type': message_event_type,
+            'dst_region': dst_region,
+            'dst_agent': dst_agent,
+            'dst_plugin': dst_plugin,
+            'is_rpc': is_rpc
+        }
 
-        with self._operation_lock:
-            try:
-                message_info = {
-                    'message_type': 'global_plugin_msgevent',
-                    'message_event_type': message_event_type,
-                    'dst_region': dst_region,
-                    'dst_agent': dst_agent,
-                    'dst_plugin': dst_plugin,
-                    'is_rpc': is_rpc
-                }
-                message = {
-                    'message_info': message_info,
-                    'message_payload': message_payload
-                }
-                json_message = json.dumps(message)
-                logger.info(
-                    f"Sending global_plugin_msgevent/{message_event_type} to {dst_region}/{dst_agent}/{dst_plugin} (RPC: {is_rpc})")
-                if 'action' in message_payload:
-                    logger.info(f"Action: {message_payload['action']}")
+        return self._dispatch(message_info, message_payload, timeout,
+                              f"global_plugin_msgevent/{message_event_type} to {dst_region}/{dst_agent}/{dst_plugin}")
 
-                if is_rpc:
-                    try:
-                        response_text = self.ws_interface.send_direct(json_message, timeout=timeout)
-                    except (ConnectionError, TimeoutError, concurrent.futures.TimeoutError) as e:
-                        self._failed_connection = True
-                        logger.error(f"Connection failure during send_direct: {e}")
-                        return {}
-
-                    try:
-                        response = json.loads(response_text)
-                        return response
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Invalid JSON response: {response_text[:200]}...")
-                        return {}
-                else:
-                    if not self.ws_interface._loop or self.ws_interface._loop.is_closed():
-                        logger.error("Event loop is closed or not initialized")
-                        self._failed_connection = True
-                        return None
-
-                    try:
-                        future = asyncio.run_coroutine_threadsafe(
-                            self.ws_interface.send_async(json_message),
-                            self.ws_interface._loop
-                        )
-                        future.result(timeout=timeout)
-                    except (ConnectionError, TimeoutError, concurrent.futures.TimeoutError) as e:
-                        self._failed_connection = True
-                        logger.error(f"Connection failure during async send: {e}")
-                    return None
-            except Exception as e:
-                logger.error(f"Error in global_plugin_msgevent: {e}")
-                self._failed_connection = True
-                return {} if is_rpc else None
+    def batch(self, timeout: float = 30.0) -> 'messaging_batch':
+        """Start a batch of requests that are sent back-to-back.
+
+        Use it as a context manager; the batch is sent when the block exits::
+
+            with client.messaging.batch() as batch:
+                for agent in agent_names:
+                    batch.global_agent_msgevent(True, 'CONFIG', {'action': 'pluginlist'}, region, agent)
+            replies = batch.results
+
+        Args:
+            timeout: Timeout in seconds for the whole batch
+
+        Returns:
+            Batch accepting the same msgevent calls as this class
+        """
+        return messaging_batch(self.ws_interface, timeout, self.metrics, self.cache, self.limiter, self.breakers)
 
     def reset_connection_state(self):
-        """Reset the connection state flag."""
+        """Reset the connection state.
+
+        Kept for callers written against the old sticky failure flag; a lost
+        connection is now recovered automatically by ws_interface.
+        """
         with self._operation_lock:
-            self._failed_connection = False
             logger.info("Connection state reset")
 
     def close(self):
         """Clean up resources."""
         # No more thread management here - let ws_interface handle its resources
-        pass
\ No newline at end of file
+        pass
+
+
+class messaging_batch(messaging_sync):
+    """Queue of messages sent back-to-back in one round-trip.
+
+    Accepts the same msgevent calls as ``messaging_sync``. Each call returns
+    the item's position in the batch instead of a reply; ``execute`` (or
+    leaving the ``with`` block) sends everything and fills ``results`` with
+    the parsed replies in call order. A failed item holds the exception that
+    caused it, and items that expect no reply hold None.
+    """
+
+    def __init__(self, ws_interface, timeout: float = 30.0, metrics=None, cache=None, limiter=None,
+                 breakers=None):
+        """Initialize an empty batch.
+
+        Args:
+            ws_interface: WebSocket interface for communication
+            timeout: Timeout in seconds for the whole batch
+            metrics: MetricsRegistry to record items in (default: the shared registry)
+            cache: response_cache to invalidate for CONFIG items
+            limiter: rate_limiter each item must pass before the batch is sent
+            breakers: breaker_registry that can fail items for unreachable destinations
+        """
+        super().__init__(ws_interface, metrics, cache, limiter, breakers)
+        self.timeout = timeout
+        self.results: Optional[List[Any]] = None
+        self._queued: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+
+    def _dispatch(self, message_info: Dict[str, Any], message_payload: Dict[str, Any], timeout: float,
+                  description: str) -> int:
+        """Queue a message instead of sending it.
+
+        Returns:
+            Position of the message in the batch
+        """
+        self._queued.append((message_info, message_payload))
+        return len(self._queued) - 1
+
+    def __len__(self):
+        return len(self._queued)
+
+    def execute(self) -> List[Any]:
+        """Send every queued message and wait for all replies.
+
+        Returns:
+            Replies in the order the calls were made
+        """
+        items = []
+        labels = []
+        lanes = []
+        queued = []
+        rejected = {}
+        for position, (message_info, message_payload) in enumerate(self._queued):
+            try:
+                if message_info['is_rpc'] and self.breakers is not None:
+                    self.breakers.allow(message_info)
+                if self.limiter is not None:
+                    self.limiter.acquire(message_info)
+            except (circuit_open, rate_limited) as e:
+                logger.warning(f"Batch item {position} not sent: {e}")
+                if message_info['is_rpc'] and self.breakers is not None and isinstance(e, rate_limited):
+                    self.breakers.record(message_info, None)
+                rejected[position] = e
+                continue
+            queued.append((message_info, message_payload))
+            request_id = None
+            if message_info['is_rpc']:
+                request_id = self.ws_interface.next_request_id()
+                message_info['request_id'] = request_id
+            json_message = json_dumps({'message_info': message_info, 'message_payload': message_payload})
+            items.append((json_message, request_id))
+            labels.append(self._labels(message_info, message_payload))
+            lanes.append(self._lane(message_payload, len(json_message)))
+        self._queued = []
+
+        logger.info(f"Sending batch of {len(items)} messages")
+        if not items:
+            self.results = self._merge_rejected([], rejected)
+            return self.results
+
+        raw_results = None
+        try:
+            # The whole batch goes in the lane of its least urgent item
+            raw_results = self.ws_interface.send_batch(items, timeout=self.timeout,
+                                                       lane=max(lanes, key=LANES.index))
+        except Exception as e:
+            logger.error(f"Error sending batch: {e}")
+            for (json_message, _), item_labels in zip(items, labels):
+                self._record(item_labels, len(json_message), error=e)
+            self.results = self._merge_rejected([e] * len(items), rejected)
+            return self.results
+        finally:
+            for message_info, message_payload in queued:
+                self._invalidate_cache(message_info, message_payload)
+            if self.breakers is not None:
+                # Outcomes of items that got a reply or timed out are recorded below
+                completed = raw_results or [None] * len(queued)
+                for (message_info, _), raw in zip(queued, completed):
+                    if message_info['is_rpc'] and not isinstance(raw, (tuple, TimeoutError)):
+                        self.breakers.record(message_info, None)
+
+        # Items share one round-trip, so per-item latency is not recorded
+        self.results = []
+        for raw, (json_message, _), item_labels, (message_info, _) in zip(raw_results, items, labels, queued):
+            if self.breakers is not None and message_info['is_rpc'] and isinstance(raw, (tuple, TimeoutError)):
+                self.breakers.record(message_info, isinstance(raw, tuple))
+            response_bytes = None
+            if isinstance(raw, tuple):
+                response_text, parsed = raw
+                response_bytes = len(response_text)
+                if parsed is None:
+                    raw = ValueError(f"Invalid JSON response: {response_text[:200]}")
+                else:
+                    raw = parsed
+            if isinstance(raw, BaseException):
+                logger.error(f"Batch item failed: {raw}")
+                self._record(item_labels, len(json_message), error=raw)
+            else:
+                self._record(item_labels, len(json_message), response_bytes=response_bytes)
+            self.results.append(raw)
+        self.results = self._merge_rejected(self.results, rejected)
+        return self.results
+
+    @staticmethod
+    def _merge_rejected(results: List[Any], rejected: Dict[int, BaseException]) -> List[Any]:
+        """Put the errors of items the rate limiter turned away back at their positions."""
+        if not rejected:
+            return results
+        merged = []
+        sent = iter(results)
+        for position in range(len(results) + len(rejected)):
+            merged.append(rejected[position] if position in rejected else next(sent))
+        return merged
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.execute()
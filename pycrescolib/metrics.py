@@ -0,0 +1,329 @@
+"""
+Metrics registry for Cresco client traffic.
+
+Counters, gauges and histograms keyed by name and labels, fed by
+``messaging_sync`` and ``ws_interface``. ``snapshot()`` returns everything as
+plain data, and the registry can be exported in the Prometheus text format
+to a file or over HTTP.
+"""
+import bisect
+import logging
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import http.server
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Bucket upper bounds: seconds for latencies, bytes for sizes, compressed / original size for ratios
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+RATIO_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 1.1, 1.5, 2.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, Any]]) -> LabelKey:
+    """Turn a labels dict into a hashable, order independent key."""
+    if not labels:
+        return ()
+    return tuple(sorted((name, '' if value is None else str(value)) for name, value in labels.items()))
+
+
+class Histogram:
+    """Fixed-bucket histogram of observed values."""
+
+    def __init__(self, buckets: Sequence[float]):
+        """Initialize an empty histogram.
+
+        Args:
+            buckets: Sorted bucket upper bounds; an implicit +Inf bucket is added
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """Record one value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation within buckets.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value, or None if nothing was observed
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                if index == len(self.buckets):
+                    # Values past the last bound are reported at that bound
+                    return lower
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+    def cumulative(self) -> List[int]:
+        """Counts per bucket including every smaller bucket, ending with +Inf."""
+        total = 0
+        result = []
+        for bucket_count in self.counts:
+            total += bucket_count
+            result.append(total)
+        return result
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters, gauges and histograms."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._help: Dict[str, str] = {}
+        self.enabled = True
+
+    def describe(self, name: str, text: str):
+        """Set the help text shown for a metric in the Prometheus output."""
+        self._help[name] = text
+
+    def inc(self, name: str, labels: Optional[Dict[str, Any]] = None, value: float = 1):
+        """Increase a counter.
+
+        Args:
+            name: Metric name
+            labels: Label names and values
+            value: Amount to add
+        """
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, labels: Optional[Dict[str, Any]] = None, value: float = 0):
+        """Set a gauge to a value.
+
+        Args:
+            name: Metric name
+            labels: Label names and values
+            value: New value
+        """
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, labels: Optional[Dict[str, Any]], value: float,
+                buckets: Sequence[float] = LATENCY_BUCKETS):
+        """Record a value in a histogram.
+
+        Args:
+            name: Metric name
+            labels: Label names and values
+            value: Observed value
+            buckets: Bucket bounds, used when the series is first created
+        """
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def reset(self):
+        """Drop every recorded series."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return every series as plain data.
+
+        Returns:
+            Dict with ``counters``, ``gauges`` and ``histograms``; each maps a
+            metric name to a list of series. Histogram series include count,
+            sum, cumulative buckets and estimated p50/p90/p99.
+        """
+        with self._lock:
+            counters = {name: [{'labels': dict(key), 'value': value} for key, value in series.items()]
+                        for name, series in self._counters.items()}
+            gauges = {name: [{'labels': dict(key), 'value': value} for key, value in series.items()]
+                      for name, series in self._gauges.items()}
+            histograms = {}
+            for name, series in self._histograms.items():
+                histograms[name] = [{
+                    'labels': dict(key),
+                    'count': histogram.count,
+                    'sum': histogram.sum,
+                    'buckets': dict(zip([str(bound) for bound in histogram.buckets] + ['+Inf'],
+                                        histogram.cumulative())),
+                    'p50': histogram.quantile(0.5),
+                    'p90': histogram.quantile(0.9),
+                    'p99': histogram.quantile(0.99),
+                } for key, histogram in series.items()]
+
+        return {'timestamp': time.time(), 'counters': counters, 'gauges': gauges, 'histograms': histograms}
+
+    def to_prometheus(self) -> str:
+        """Render every series in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for kind, metrics in (('counter', self._counters), ('gauge', self._gauges)):
+                for name, series in sorted(metrics.items()):
+                    self._header(lines, name, kind)
+                    for key, value in series.items():
+                        lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+
+            for name, series in sorted(self._histograms.items()):
+                self._header(lines, name, 'histogram')
+                for key, histogram in series.items():
+                    bounds = [_format_value(bound) for bound in histogram.buckets] + ['+Inf']
+                    for bound, count in zip(bounds, histogram.cumulative()):
+                        lines.append(f"{name}_bucket{_format_labels(key, ('le', bound))} {count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+
+        return '\n'.join(lines) + '\n'
+
+    def _header(self, lines: List[str], name: str, kind: str):
+        if name in self._help:
+            lines.append(f"# HELP {name} {self._help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    def write_prometheus(self, path: str):
+        """Atomically write the Prometheus text output to a file.
+
+        Suitable for the node_exporter textfile collector.
+
+        Args:
+            path: Destination file
+        """
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+    def start_file_exporter(self, path: str, interval: float = 15.0) -> threading.Event:
+        """Rewrite the Prometheus file every ``interval`` seconds in a daemon thread.
+
+        Args:
+            path: Destination file
+            interval: Seconds between writes
+
+        Returns:
+            Event that stops the exporter when set
+        """
+        stop = threading.Event()
+
+        def run():
+            while not stop.is_set():
+                try:
+                    self.write_prometheus(path)
+                except Exception as e:
+                    logger.error(f"Error writing metrics file {path}: {e}")
+                stop.wait(interval)
+
+        threading.Thread(target=run, name='cresco-metrics-file', daemon=True).start()
+        logger.info(f"Exporting metrics to {path} every {interval}s")
+        return stop
+
+    def start_http_exporter(self, port: int, addr: str = '127.0.0.1') -> 'http.server.ThreadingHTTPServer':
+        """Serve the Prometheus text output at ``/metrics`` in a daemon thread.
+
+        Args:
+            port: Port to listen on (0 picks a free port)
+            addr: Address to bind
+
+        Returns:
+            The running server; call ``shutdown()`` to stop it
+        """
+        import http.server
+
+        registry = self
+
+        class MetricsHandler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"Metrics exporter: {format % args}")
+
+        server = http.server.ThreadingHTTPServer((addr, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='cresco-metrics-http', daemon=True).start()
+        logger.info(f"Serving metrics on http://{addr}:{server.server_address[1]}/metrics")
+        return server
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items: Iterable[Tuple[str, str]] = key + (extra,) if extra else key
+    if not items:
+        return ''
+    rendered = ','.join(f'{name}="{_escape(value)}"' for name, value in items)
+    return '{' + rendered + '}'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+# Registry used by the client unless another one is passed in
+registry = MetricsRegistry()
+
+registry.describe('cresco_rpc_requests_total', 'Messages sent, by message type, action and destination region')
+registry.describe('cresco_rpc_errors_total', 'Messages that failed, including timeouts')
+registry.describe('cresco_rpc_coalesced_total', 'Reads that joined an identical request already in flight')
+registry.describe('cresco_rpc_timeouts_total', 'RPCs that got no reply within their timeout')
+registry.describe('cresco_rpc_latency_seconds', 'Time from send to parsed reply (or write for non-RPC messages)')
+registry.describe('cresco_rpc_request_bytes', 'Size of the serialized request envelope')
+registry.describe('cresco_rpc_response_bytes', 'Size of the reply frame')
+registry.describe('cresco_payload_compressed_bytes', 'Size of gzip+base64 payload fields')
+registry.describe('cresco_payload_decompressed_bytes', 'Size of payload fields after decompression')
+registry.describe('cresco_payload_compression_ratio', 'Compressed size / original size of payload fields, including base64')
+registry.describe('cresco_payload_compress_seconds', 'Time to compress an outgoing payload field, by zlib level')
+registry.describe('cresco_ws_connect_seconds', 'Time to open an apisocket connection')
+registry.describe('cresco_ws_reconnects_total', 'Successful background reconnects')
+registry.describe('cresco_ws_desyncs_total', 'Connections dropped after a timeout left replies without request_id unmatchable')
+registry.describe('cresco_ws_sent_bytes', 'Size of frames written to the apisocket')
+registry.describe('cresco_ws_received_bytes', 'Size of frames read from the apisocket')
+registry.describe('cresco_ws_lane_wait_seconds', 'Time a frame waited for its turn to be written, by lane')
+registry.describe('cresco_ws_outbound_queued', 'Messages queued for writing without waiting for a reply')
+registry.describe('cresco_ws_outbound_errors_total', 'Queued messages that could not be written')
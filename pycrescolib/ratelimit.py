@@ -0,0 +1,208 @@
+"""
+Client-side pacing of outbound messages.
+
+A ``rate_limiter`` attached to the messaging layer holds one token bucket for
+the whole controller connection and one per destination agent. Every message
+takes a token from both before it is written; when either bucket is empty
+the caller waits its turn or is turned away, depending on the policy.
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .metrics import registry as default_registry
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Destination buckets kept before idle (full) ones are dropped
+MAX_DESTINATIONS = 1024
+
+
+class rate_limited(Exception):
+    """Raised when a message is turned away by a ``rate_limiter``."""
+
+
+class token_bucket:
+    """Token bucket refilled continuously at ``rate`` tokens per second.
+
+    Not thread-safe on its own; ``rate_limiter`` guards its buckets with a lock.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity (default: one second of ``rate``, at least 1)
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst) if burst is not None else max(1.0, self.rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until a token would be available, without taking it."""
+        self._refill(now)
+        return max(0.0, (1.0 - self.tokens) / self.rate)
+
+    def take(self):
+        """Take one token; the balance goes negative for a reserved future slot."""
+        self.tokens -= 1.0
+
+    def idle(self, now: float) -> bool:
+        """True if the bucket is full, i.e. indistinguishable from a new one."""
+        self._refill(now)
+        return self.tokens >= self.burst
+
+
+class rate_limiter:
+    """Token-bucket limits per controller connection and per destination.
+
+    Agent and plugin messages count against both the controller bucket and
+    the bucket of their ``(dst_region, dst_agent)``; controller messages
+    count against the controller bucket only. A caller that has to wait is
+    given a reserved slot, so waiters are served in arrival order.
+    """
+
+    POLICIES = ('block', 'reject')
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[float] = None,
+                 destination_rate: Optional[float] = None, destination_burst: Optional[float] = None,
+                 policy: str = 'block', max_queue: int = 64, max_wait: float = 30.0, metrics=None):
+        """Initialize the limiter.
+
+        Args:
+            rate: Messages per second to the controller, or None for no limit
+            burst: Messages the controller bucket allows at once (default: one second of ``rate``)
+            destination_rate: Messages per second to each agent, or None for no limit
+            destination_burst: Messages each agent bucket allows at once
+            policy: 'block' to wait for a slot, 'reject' to fail as soon as none is free
+            max_queue: Callers allowed to wait at once before further ones are rejected
+            max_wait: Longest wait in seconds a caller accepts before it is rejected
+            metrics: MetricsRegistry for wait and rejection metrics (default: the shared registry)
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown rate limit policy: {policy}")
+
+        self.policy = policy
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.destination_rate = destination_rate
+        self.destination_burst = destination_burst
+        self.metrics = metrics if metrics is not None else default_registry
+        self._lock = threading.Lock()
+        self._controller = token_bucket(rate, burst) if rate else None
+        self._destinations: Dict[Tuple[str, str], token_bucket] = {}
+        self._waiting = 0
+
+    @staticmethod
+    def _destination(message_info: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """Destination bucket key of a message, or None for controller messages."""
+        if 'dst_agent' not in message_info:
+            return None
+        return message_info.get('dst_region'), message_info.get('dst_agent')
+
+    def _destination_bucket(self, key: Tuple[str, str], now: float) -> token_bucket:
+        bucket = self._destinations.get(key)
+        if bucket is None:
+            if len(self._destinations) >= MAX_DESTINATIONS:
+                for idle_key in [k for k, b in self._destinations.items() if b.idle(now)]:
+                    del self._destinations[idle_key]
+            bucket = self._destinations[key] = token_bucket(self.destination_rate, self.destination_burst)
+        return bucket
+
+    def _reserve(self, message_info: Dict[str, Any]) -> float:
+        """Reserve a slot for a message.
+
+        Returns:
+            Seconds the caller must wait before sending
+
+        Raises:
+            rate_limited: If the policy or the queue bound turns the caller away
+        """
+        now = time.monotonic()
+        with self._lock:
+            buckets = []
+            if self._controller is not None:
+                buckets.append(('controller', self._controller))
+            key = self._destination(message_info)
+            if key is not None and self.destination_rate:
+                buckets.append(('destination', self._destination_bucket(key, now)))
+            if not buckets:
+                return 0.0
+
+            scope, delay = max(((name, bucket.delay(now)) for name, bucket in buckets), key=lambda item: item[1])
+            if delay > 0:
+                reason = None
+                if self.policy == 'reject':
+                    reason = 'no free slot'
+                elif self._waiting >= self.max_queue:
+                    reason = f'{self._waiting} callers already waiting'
+                elif delay > self.max_wait:
+                    reason = f'wait of {delay:.1f}s exceeds {self.max_wait}s'
+                if reason is not None:
+                    self.metrics.inc('cresco_ratelimit_rejected_total', {'scope': scope})
+                    target = f"destination {key[0]}/{key[1]}" if scope == 'destination' else 'controller'
+                    raise rate_limited(f"Rate limit for {target}: {reason}")
+                self._waiting += 1
+
+            for _, bucket in buckets:
+                bucket.take()
+
+        if delay > 0:
+            self.metrics.observe('cresco_ratelimit_wait_seconds', {'scope': scope}, delay)
+        return delay
+
+    def _done_waiting(self):
+        with self._lock:
+            self._waiting -= 1
+
+    def acquire(self, message_info: Dict[str, Any]):
+        """Block until a message may be sent.
+
+        Args:
+            message_info: Message metadata, used to pick the destination bucket
+
+        Raises:
+            rate_limited: If the caller is turned away
+        """
+        delay = self._reserve(message_info)
+        if delay > 0:
+            try:
+                time.sleep(delay)
+            finally:
+                self._done_waiting()
+
+    async def acquire_async(self, message_info: Dict[str, Any]):
+        """Wait on the event loop until a message may be sent.
+
+        Args:
+            message_info: Message metadata, used to pick the destination bucket
+
+        Raises:
+            rate_limited: If the caller is turned away
+        """
+        delay = self._reserve(message_info)
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._done_waiting()
+
+    def waiting(self) -> int:
+        """Number of callers currently waiting for a slot."""
+        with self._lock:
+            return self._waiting
+
+
+default_registry.describe('cresco_ratelimit_wait_seconds', 'Time messages waited for a rate limit slot')
+default_registry.describe('cresco_ratelimit_rejected_total', 'Messages turned away by the rate limiter')
@@ -0,0 +1,126 @@
+"""
+Shared event loop threads for dataplane and logstreamer connections.
+"""
+import asyncio
+import logging
+import threading
+from typing import Dict, List
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+class reactor:
+    """Small fixed pool of event loop threads that streams run on as tasks.
+
+    Without a reactor every ``dataplane`` and ``logstreamer`` starts its own
+    loop and thread. With one, streams are spread over ``threads`` loops, so
+    the thread count stays flat no matter how many streams are open.
+    """
+
+    def __init__(self, threads: int = 1):
+        """Initialize the reactor; loops start on first use.
+
+        Args:
+            threads: Number of event loop threads
+        """
+        if threads < 1:
+            raise ValueError("Reactor needs at least one thread")
+
+        self.threads = threads
+        self._lock = threading.Lock()
+        self._loops: List[asyncio.AbstractEventLoop] = []
+        self._threads: List[threading.Thread] = []
+        self._streams: Dict[asyncio.AbstractEventLoop, int] = {}
+
+    def _start(self):
+        """Start the loop threads and wait until every loop is running."""
+        for index in range(self.threads):
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def run(loop=loop, started=started):
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                try:
+                    loop.run_forever()
+                finally:
+                    loop.close()
+
+            thread = threading.Thread(target=run, name=f'cresco-reactor-{index}', daemon=True)
+            thread.start()
+            started.wait()
+
+            self._loops.append(loop)
+            self._threads.append(thread)
+            self._streams[loop] = 0
+
+        logger.info(f"Started reactor with {self.threads} event loop thread(s)")
+
+    def acquire(self) -> asyncio.AbstractEventLoop:
+        """Assign a stream to the loop carrying the fewest streams.
+
+        Returns:
+            Running event loop the stream should schedule its tasks on
+        """
+        with self._lock:
+            if not self._loops:
+                self._start()
+            loop = min(self._loops, key=lambda candidate: self._streams[candidate])
+            self._streams[loop] += 1
+            return loop
+
+    def release(self, loop: asyncio.AbstractEventLoop):
+        """Return a stream's slot on a loop acquired with ``acquire``."""
+        with self._lock:
+            if loop in self._streams and self._streams[loop] > 0:
+                self._streams[loop] -= 1
+
+    def streams(self) -> int:
+        """Number of streams currently assigned to the reactor."""
+        with self._lock:
+            return sum(self._streams.values())
+
+    def running(self) -> bool:
+        """Check if the loop threads are running."""
+        with self._lock:
+            return any(thread.is_alive() for thread in self._threads)
+
+    def stop(self, timeout: float = 2.0):
+        """Stop every loop and wait for the threads to exit.
+
+        Streams should be closed first; tasks still scheduled are cancelled.
+
+        Args:
+            timeout: Seconds to wait for each thread
+        """
+        with self._lock:
+            loops, threads = self._loops, self._threads
+            self._loops, self._threads, self._streams = [], [], {}
+
+        for loop in loops:
+            try:
+                future = asyncio.run_coroutine_threadsafe(_cancel_all_tasks(), loop)
+                future.result(timeout)
+            except Exception as e:
+                logger.error(f"Error cancelling reactor tasks: {e}")
+            loop.call_soon_threadsafe(loop.stop)
+
+        for thread in threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+                if thread.is_alive():
+                    logger.warning(f"Reactor thread {thread.name} did not terminate cleanly")
+
+        if loops:
+            logger.info("Reactor stopped")
+
+
+async def _cancel_all_tasks():
+    """Cancel every other task on the current loop and wait for them to finish."""
+    current = asyncio.current_task()
+    tasks = [task for task in asyncio.all_tasks() if task is not current]
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.wait(tasks, timeout=0.5)
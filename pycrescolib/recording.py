@@ -0,0 +1,355 @@
+"""
+Recording and replay of apisocket traffic.
+
+A ``traffic_recorder`` attached to ``ws_interface`` appends every frame the
+client writes and every frame it reads to a file, with a timestamp. A
+``replay_server`` serves such a recording back: each request gets the reply
+the controller gave to the same request when it was recorded. A session
+captured against a real fleet can then be replayed offline, to measure
+client-side changes on production-shaped data.
+
+File layout: the magic ``CRESCOREC1\\n``, then one record per frame, each a
+fixed header (direction ``>`` sent or ``<`` received, channel, UNIX time,
+length) followed by the frame. Files named ``*.gz`` are gzip compressed;
+every writer appends a new gzip member, which readers see as one stream.
+
+Usage:
+    python -m pycrescolib.recording show session.rec.gz
+    python -m pycrescolib.recording replay session.rec.gz [--port 8282] [--speed 1.0]
+"""
+import argparse
+import gzip
+import itertools
+import json
+import logging
+import struct
+import threading
+import time
+from collections import deque
+from typing import Any, BinaryIO, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .standin import standin_server
+from .wc_interface import _reply_request_id
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+MAGIC = b'CRESCOREC1\n'
+SENT = b'>'
+RECEIVED = b'<'
+
+# direction, channel, UNIX time, frame length; frames over 4 GiB are not supported
+_HEADER = struct.Struct('<cHdI')
+_BINARY = 0x8000  # Channel bit set for binary frames
+
+
+class recorded_frame(NamedTuple):
+    """One frame read back from a recording."""
+    direction: bytes  # SENT or RECEIVED
+    channel: int  # Connection the frame was seen on
+    timestamp: float  # UNIX time
+    frame: Any  # str, or bytes for binary frames
+
+
+class traffic_recorder:
+    """Append-only, thread-safe writer of apisocket frames.
+
+    One recorder can be shared by several connections, e.g. the members of a
+    ``ws_pool``; each takes its own channel number so replies can still be
+    paired with requests in order.
+    """
+
+    def __init__(self, path: str, compress: Optional[bool] = None):
+        """Open the recording file for appending.
+
+        Args:
+            path: File to append to; created if missing
+            compress: Write gzip (default: when ``path`` ends in ``.gz``)
+        """
+        self.path = path
+        self.compress = path.endswith('.gz') if compress is None else compress
+        self.frames = 0
+        self._lock = threading.Lock()
+        self._channels = itertools.count()
+        raw: BinaryIO = open(path, 'ab')
+        new_file = raw.tell() == 0
+        self._file: Optional[BinaryIO] = gzip.GzipFile(fileobj=raw, mode='ab', compresslevel=6) if self.compress else raw
+        self._raw = raw
+        if new_file:
+            self._file.write(MAGIC)
+        logger.info(f"Recording apisocket traffic to {path}")
+
+    def channel(self) -> int:
+        """Allocate a channel number for a new connection."""
+        return next(self._channels) & 0x7FFF
+
+    def record(self, direction: bytes, channel: int, frame: Any):
+        """Append one frame.
+
+        Args:
+            direction: SENT or RECEIVED
+            channel: Channel of the connection the frame was seen on
+            frame: Frame as str or bytes
+        """
+        if isinstance(frame, str):
+            data = frame.encode('utf-8')
+        else:
+            data = bytes(frame)
+            channel |= _BINARY
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(_HEADER.pack(direction, channel, time.time(), len(data)))
+            self._file.write(data)
+            self.frames += 1
+
+    def sent(self, channel: int, frame: Any):
+        """Append a frame the client wrote."""
+        self.record(SENT, channel, frame)
+
+    def received(self, channel: int, frame: Any):
+        """Append a frame the client read."""
+        self.record(RECEIVED, channel, frame)
+
+    def flush(self):
+        """Push buffered records to the file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        """Finish the recording; further frames are ignored."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            if self._file is not self._raw:
+                self._raw.close()
+            self._file = None
+        logger.info(f"Recorded {self.frames} frames to {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def read_recording(path: str) -> Iterator[recorded_frame]:
+    """Iterate over the frames of a recording in the order they were written.
+
+    Args:
+        path: Recording file, plain or gzip
+
+    Returns:
+        Iterator of recorded_frame; a truncated final record is skipped
+    """
+    with open(path, 'rb') as raw:
+        compressed = raw.read(2) == b'\x1f\x8b'
+    with (gzip.open(path, 'rb') if compressed else open(path, 'rb')) as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not an apisocket recording")
+        while True:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            direction, channel, timestamp, length = _HEADER.unpack(header)
+            data = f.read(length)
+            if len(data) < length:
+                logger.warning(f"Recording {path} ends in a truncated frame")
+                return
+            if channel & _BINARY:
+                yield recorded_frame(direction, channel & ~_BINARY, timestamp, data)
+            else:
+                yield recorded_frame(direction, channel, timestamp, data.decode('utf-8'))
+
+
+def _request_keys(message_info: Dict[str, Any], message_payload: Dict[str, Any]) -> Tuple[str, str]:
+    """Exact and loose lookup keys of a request.
+
+    The exact key is the whole message without its ``request_id``; the loose
+    key is the message type, action and destination, for requests whose
+    payload differs from the recorded one (new pipeline IDs, timestamps).
+    """
+    info = {name: value for name, value in message_info.items() if name != 'request_id'}
+    exact = json.dumps([info, message_payload], sort_keys=True)
+    loose = json.dumps([message_info.get('message_type'), message_payload.get('action'),
+                        message_info.get('dst_region'), message_info.get('dst_agent'),
+                        message_info.get('dst_plugin')])
+    return exact, loose
+
+
+def load_exchanges(path: str) -> List[Tuple[Dict[str, Any], Dict[str, Any], str, float]]:
+    """Pair every recorded RPC with its reply.
+
+    Replies carrying a ``request_id``, at the top level or in their
+    ``message_info``, are paired by ID, others with the oldest unanswered
+    request on their channel, the same rules the client uses.
+
+    Args:
+        path: Recording file
+
+    Returns:
+        List of (message_info, message_payload, reply frame, seconds to reply)
+        in request order
+    """
+    requests: Dict[int, Tuple[Dict[str, Any], Dict[str, Any], float]] = {}
+    by_id: Dict[Tuple[int, str], int] = {}
+    request_ids: Dict[int, str] = {}
+    unanswered: Dict[int, Deque[int]] = {}
+    exchanges: Dict[int, Tuple[Dict[str, Any], Dict[str, Any], str, float]] = {}
+
+    for index, record in enumerate(read_recording(path)):
+        if not isinstance(record.frame, str):
+            continue
+        try:
+            message = json.loads(record.frame)
+        except ValueError:
+            continue
+        if not isinstance(message, dict):
+            continue
+
+        if record.direction == SENT:
+            message_info = message.get('message_info', {})
+            if not message_info.get('is_rpc'):
+                continue
+            requests[index] = (message_info, message.get('message_payload', {}), record.timestamp)
+            unanswered.setdefault(record.channel, deque()).append(index)
+            if 'request_id' in message_info:
+                request_ids[index] = str(message_info['request_id'])
+                by_id[(record.channel, request_ids[index])] = index
+            continue
+
+        request_index = None
+        reply_id = _reply_request_id(message)
+        if reply_id is not None:
+            request_index = by_id.pop((record.channel, reply_id), None)
+            if request_index is not None:
+                unanswered[record.channel].remove(request_index)
+        elif unanswered.get(record.channel):
+            request_index = unanswered[record.channel].popleft()
+            if request_index in request_ids:
+                by_id.pop((record.channel, request_ids[request_index]), None)
+        if request_index is None:
+            continue
+        request_ids.pop(request_index, None)
+        message_info, message_payload, sent_at = requests.pop(request_index)
+        exchanges[request_index] = (message_info, message_payload, record.frame, record.timestamp - sent_at)
+
+    return [exchanges[index] for index in sorted(exchanges)]
+
+
+class replay_server(standin_server):
+    """Stand-in controller that answers from a recording.
+
+    A request is matched against the recorded requests first exactly (the
+    whole message except its ``request_id``), then by message type, action
+    and destination. Repeated requests get the recorded replies in turn; once
+    they run out, the last one is repeated. Requests that never occur in the
+    recording are answered by the ordinary stand-in.
+    """
+
+    def __init__(self, path: str, speed: float = 0.0, **kwargs):
+        """Load a recording.
+
+        Args:
+            path: Recording file
+            speed: Replay recorded reply delays this many times faster; 0
+                replies at once
+            **kwargs: Passed to ``standin_server`` (host, port, service_key, ...)
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        self.speed = speed
+        self.replayed = 0  # Requests answered from the recording
+        self.missed = 0  # Requests answered by the stand-in
+        self._exact: Dict[str, Deque[Tuple[str, float]]] = {}
+        self._loose: Dict[str, Deque[Tuple[str, float]]] = {}
+
+        exchanges = load_exchanges(path)
+        for message_info, message_payload, reply, delay in exchanges:
+            exact, loose = _request_keys(message_info, message_payload)
+            self._exact.setdefault(exact, deque()).append((reply, delay))
+            self._loose.setdefault(loose, deque()).append((reply, delay))
+        logger.info(f"Loaded {len(exchanges)} recorded exchanges from {path}")
+
+    @staticmethod
+    def _take(replies: Deque[Tuple[str, float]]) -> Tuple[str, float]:
+        """Next recorded reply, keeping the last one for repeats."""
+        return replies.popleft() if len(replies) > 1 else replies[0]
+
+    def respond(self, message_info: Dict[str, Any], message_payload: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+        """Recorded reply and delay for a message, or the stand-in's if it was never recorded."""
+        exact, loose = _request_keys(message_info, message_payload)
+        replies = self._exact.get(exact) or self._loose.get(loose)
+        if not replies:
+            self.missed += 1
+            logger.debug(f"No recorded reply for {message_payload.get('action')}, using the stand-in")
+            return super().respond(message_info, message_payload)
+
+        self.replayed += 1
+        frame, delay = self._take(replies)
+        reply = json.loads(frame)
+        # Recorded IDs belong to the recorded requests; the stand-in sets the live one
+        reply.pop('request_id', None)
+        if isinstance(reply.get('message_info'), dict):
+            reply['message_info'].pop('request_id', None)
+        return reply, (delay / self.speed if self.speed > 0 else 0.0)
+
+
+def show(path: str):
+    """Print a summary of a recording."""
+    frames = {SENT: 0, RECEIVED: 0}
+    sizes = {SENT: 0, RECEIVED: 0}
+    channels = set()
+    first = last = None
+    for record in read_recording(path):
+        frames[record.direction] = frames.get(record.direction, 0) + 1
+        sizes[record.direction] = sizes.get(record.direction, 0) + len(record.frame)
+        channels.add(record.channel)
+        first = record.timestamp if first is None else first
+        last = record.timestamp
+
+    exchanges = load_exchanges(path)
+    actions: Dict[str, int] = {}
+    for _, message_payload, _, _ in exchanges:
+        action = str(message_payload.get('action'))
+        actions[action] = actions.get(action, 0) + 1
+
+    print(f"{path}: {len(channels)} connection(s), {(last - first) if first is not None else 0:.1f}s")
+    print(f"  sent {frames[SENT]} frames, {sizes[SENT]} bytes")
+    print(f"  received {frames[RECEIVED]} frames, {sizes[RECEIVED]} bytes")
+    print(f"  {len(exchanges)} RPCs with replies:")
+    for action, count in sorted(actions.items(), key=lambda item: -item[1]):
+        print(f"    {action}: {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    show_parser = commands.add_parser('show', help='Summarize a recording')
+    show_parser.add_argument('path', help='Recording file')
+
+    replay_parser = commands.add_parser('replay', help='Serve a recording as a controller')
+    replay_parser.add_argument('path', help='Recording file')
+    replay_parser.add_argument('--host', default='localhost', help='Interface to listen on')
+    replay_parser.add_argument('--port', type=int, default=8282, help='Port to listen on')
+    replay_parser.add_argument('--service-key', help='Required service key (default: accept any)')
+    replay_parser.add_argument('--speed', type=float, default=0.0,
+                               help='Replay recorded reply delays this many times faster (default: reply at once)')
+    replay_parser.add_argument('--cert', help='PEM certificate (default: generate a self-signed one)')
+    replay_parser.add_argument('--key', help='Private key for --cert')
+    args = parser.parse_args()
+
+    if args.command == 'show':
+        show(args.path)
+        return
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    replay_server(args.path, speed=args.speed, host=args.host, port=args.port, service_key=args.service_key,
+                  certfile=args.cert, keyfile=args.key).run()
+
+
+if __name__ == '__main__':
+    main()
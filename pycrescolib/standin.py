@@ -0,0 +1,589 @@
+"""
+Local stand-in for a Cresco global controller.
+
+Speaks enough of the ``/api/apisocket``, ``/api/dataplane`` and
+``/api/logstreamer`` protocols for the client, the example scripts and the
+benchmarks to run without a real deployment:
+
+- apisocket requests get replies shaped like the controller's, with list
+  fields gzip+base64 encoded and the ``request_id`` echoed back
+- dataplane and logstreamer sockets get the ``status_code: 10`` activation
+  frame, dataplane frames are delivered to every socket on the same stream,
+  and logstreamers receive generated log lines for the agents they select
+- the TLS certificate is self-signed with a ``region_agent_plugin`` common name
+
+Fleet size, per-request latency and extra reply payload are configurable.
+
+Usage:
+    python -m pycrescolib.standin [--port 8282] [--agents 100] [--latency 0.005]
+"""
+import argparse
+import asyncio
+import base64
+import gzip
+import itertools
+import json
+import logging
+import os
+import random
+import ssl
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import websockets
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+def make_agent_list(count: int, seed: int = 0, regions: int = 50) -> Dict[str, Any]:
+    """Build a decoded ``agentslist`` payload shaped like a real fleet.
+
+    Args:
+        count: Number of agents
+        seed: Random seed so runs are comparable
+        regions: Number of regions the agents are spread over
+
+    Returns:
+        Dict with an ``agents`` list
+    """
+    rng = random.Random(seed)
+    agents = []
+    for i in range(count):
+        region = f'region-{i % regions}'
+        agents.append({
+            'region': region,
+            'name': f'agent-{i:06d}',
+            'plugins': str(rng.randint(1, 12)),
+            'location': rng.choice(['unknown', 'rack-a', 'rack-b', 'edge-site']),
+            'platform': rng.choice(['unknown', 'linux-x86_64', 'linux-aarch64']),
+            'environment': rng.choice(['unknown', 'prod', 'staging']),
+            'is_active': rng.random() > 0.05,
+            'last_seen': 1700000000000 + rng.randint(0, 10 ** 7),
+        })
+    return {'agents': agents}
+
+
+def make_certificate(common_name: str, directory: str) -> Tuple[str, str]:
+    """Write a self-signed certificate and key for ``common_name``.
+
+    Args:
+        common_name: Certificate subject, e.g. ``global-region_global-controller_wsapi``
+        directory: Directory to write ``standin.pem`` and ``standin.key`` to
+
+    Returns:
+        Tuple of (certificate path, key path)
+    """
+    import datetime
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(minutes=5))
+            .not_valid_after(now + datetime.timedelta(days=365))
+            .sign(key, hashes.SHA256()))
+
+    cert_path = os.path.join(directory, 'standin.pem')
+    key_path = os.path.join(directory, 'standin.key')
+    with open(cert_path, 'wb') as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, 'wb') as f:
+        f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                  serialization.NoEncryption()))
+    return cert_path, key_path
+
+
+def _pack(obj: Any) -> str:
+    """Encode an object the way the controller encodes list fields: JSON, gzip, base64."""
+    return base64.b64encode(gzip.compress(json.dumps(obj).encode())).decode('utf-8')
+
+
+class standin_server:
+    """In-process stand-in for a Cresco global controller.
+
+    Run it with ``run()`` from the command line, ``start()``/``stop()`` from
+    a test or benchmark (it then serves from its own thread), or ``serve()``
+    on an existing event loop.
+    """
+
+    def __init__(self, host: str = 'localhost', port: int = 8282, service_key: Optional[str] = None,
+                 agents: int = 10, regions: int = 2, latency: float = 0.0, jitter: float = 0.0,
+                 padding: int = 0, echo_request_id: bool = True, ordered: Optional[bool] = None,
+                 agent_delays: Optional[Dict[str, float]] = None, region: str = 'global-region',
+                 agent: str = 'global-controller', plugin: str = 'wsapi', certfile: Optional[str] = None,
+                 keyfile: Optional[str] = None, log_interval: float = 1.0, seed: int = 0):
+        """Initialize the server; nothing listens until it is started.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on, 0 for any free port
+            service_key: Required ``cresco_service_key`` header, or None to accept any
+            agents: Number of agents in the simulated fleet
+            regions: Number of regions the agents are spread over
+            latency: Seconds added before every RPC reply
+            jitter: Up to this many extra seconds added at random to ``latency``
+            padding: Bytes of filler added to every RPC reply
+            echo_request_id: Echo ``request_id`` in replies like current controllers;
+                False behaves like older ones that reply in order without it
+            ordered: Send replies in the order the requests arrived; by default
+                only when ``echo_request_id`` is False. Unordered replies
+                overtake each other as their delays allow.
+            agent_delays: Extra seconds added before replies to messages for
+                these agents (``dst_agent`` -> seconds)
+            region: Region of the controller, used in the certificate and ``globalinfo``
+            agent: Agent name of the controller
+            plugin: Plugin name of the controller's websocket API
+            certfile: PEM certificate to serve; generated when not given
+            keyfile: Key for ``certfile``
+            log_interval: Seconds between generated log lines on a logstreamer
+            seed: Random seed for the fleet and the latency jitter
+        """
+        self.host = host
+        self.port = port
+        self.service_key = service_key
+        self.latency = latency
+        self.jitter = jitter
+        self.padding = padding
+        self.echo_request_id = echo_request_id
+        self.ordered = not echo_request_id if ordered is None else ordered
+        self.agent_delays = dict(agent_delays or {})
+        self.region = region
+        self.agent = agent
+        self.plugin = plugin
+        self.certfile = certfile
+        self.keyfile = keyfile
+        self.log_interval = log_interval
+
+        self.agents: List[Dict[str, Any]] = make_agent_list(agents, seed, max(regions, 1))['agents']
+        self.plugins: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
+        self.pipelines: Dict[str, Dict[str, Any]] = {}
+        self.requests = 0  # apisocket messages received
+
+        self._rng = random.Random(seed)
+        self._ids = itertools.count(1)
+        self._packed: Dict[Any, str] = {}  # Encoded fleet replies; the fleet does not change
+        self._streams: Dict[str, Dict[Any, Optional[str]]] = {}  # Dataplane stream key -> {socket: input ID}
+        self._server = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._tempdir: Optional[tempfile.TemporaryDirectory] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL clients connect to."""
+        return f'wss://{self.host}:{self.port}'
+
+    def _ssl_context(self) -> ssl.SSLContext:
+        """Server TLS context, generating a certificate if none was given."""
+        if self.certfile is None:
+            self._tempdir = tempfile.TemporaryDirectory(prefix='cresco-standin-')
+            common_name = f'{self.region}_{self.agent}_{self.plugin}'
+            self.certfile, self.keyfile = make_certificate(common_name, self._tempdir.name)
+
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(self.certfile, self.keyfile)
+        return context
+
+    def _check_key(self, connection, request):
+        """Reject handshakes without the configured service key."""
+        if self.service_key is not None and request.headers.get('cresco_service_key') != self.service_key:
+            return connection.respond(403, "Invalid service key\n")
+        return None
+
+    async def serve(self):
+        """Listen until ``stop()`` is called."""
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        async with websockets.serve(self._handler, self.host, self.port, ssl=self._ssl_context(),
+                                    process_request=self._check_key, max_size=None) as server:
+            self._server = server
+            self.port = server.sockets[0].getsockname()[1]
+            logger.info(f"Stand-in controller listening on {self.url} with {len(self.agents)} agents")
+            await self._stopped.wait()
+
+    def start(self, timeout: float = 10.0) -> 'standin_server':
+        """Serve from a background thread and return once listening.
+
+        Args:
+            timeout: Seconds to wait for the server to start
+
+        Returns:
+            This server, so ``server = standin_server(...).start()`` works
+        """
+        started = threading.Event()
+
+        def run():
+            async def main():
+                task = asyncio.ensure_future(self.serve())
+                while self._server is None and not task.done():
+                    await asyncio.sleep(0.01)
+                started.set()
+                await task
+            try:
+                asyncio.run(main())
+            finally:
+                started.set()
+
+        self._thread = threading.Thread(target=run, name='cresco-standin', daemon=True)
+        self._thread.start()
+        started.wait(timeout)
+        if self._server is None:
+            raise RuntimeError("Stand-in server failed to start")
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        """Stop a server started with ``start()`` or ``serve()``."""
+        if self._loop is not None and self._stopped is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._tempdir is not None:
+            self._tempdir.cleanup()
+            self._tempdir = None
+        self._server = None
+
+    def run(self):
+        """Serve in the foreground until interrupted."""
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    async def _handler(self, ws):
+        """Route a new connection by path."""
+        path = ws.request.path
+        if path == '/api/apisocket':
+            await self._apisocket(ws)
+        elif path == '/api/dataplane':
+            await self._dataplane(ws)
+        elif path == '/api/logstreamer':
+            await self._logstreamer(ws)
+        else:
+            await ws.close(1008, f"Unknown path {path}")
+
+    # apisocket
+
+    async def _apisocket(self, ws):
+        """Answer every message on an apisocket connection."""
+        tasks = set()
+        async for frame in ws:
+            self.requests += 1
+            if self.ordered:
+                await self._answer(ws, frame)
+            else:
+                # Replies may overtake each other, as they do on a real controller
+                task = asyncio.ensure_future(self._answer(ws, frame))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+    async def _answer(self, ws, frame):
+        """Reply to one apisocket message if it is an RPC."""
+        try:
+            message = json.loads(frame)
+            message_info = message['message_info']
+            message_payload = message.get('message_payload', {})
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Stand-in received a malformed message")
+            return
+
+        try:
+            reply, delay = self.respond(message_info, message_payload)
+        except Exception as e:
+            logger.error(f"Stand-in failed to answer {message_payload.get('action')}: {e}")
+            reply, delay = {'status_code': '90', 'status_desc': str(e)}, 0.0
+
+        if not message_info.get('is_rpc'):
+            return
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.padding:
+            reply['padding'] = 'x' * self.padding
+        if self.echo_request_id and 'request_id' in message_info:
+            reply['request_id'] = message_info['request_id']
+
+        try:
+            await ws.send(json.dumps(reply))
+        except websockets.ConnectionClosed:
+            pass
+
+    def respond(self, message_info: Dict[str, Any], message_payload: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+        """Build the reply to a message and pick how long to hold it back.
+
+        Returns:
+            Tuple of (reply dict, seconds to wait before sending it)
+        """
+        delay = self.latency + self._rng.uniform(0, self.jitter) if self.latency or self.jitter else 0.0
+        delay += self.agent_delays.get(message_info.get('dst_agent'), 0.0)
+        return self.reply(message_info, message_payload), delay
+
+    def reply(self, message_info: Dict[str, Any], message_payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the controller's reply to a message.
+
+        Args:
+            message_info: Message metadata
+            message_payload: Message content
+
+        Returns:
+            Reply dict, before latency and padding are applied
+        """
+        action = message_payload.get('action')
+        dst_region = message_info.get('dst_region')
+        dst_agent = message_info.get('dst_agent')
+        handler = getattr(self, f'_action_{action}', None)
+        if handler is None:
+            return {'status_code': '10', 'status_desc': f'{action} accepted'}
+        return handler(message_payload, dst_region, dst_agent)
+
+    def _fleet(self, region: Optional[str] = None) -> List[Dict[str, Any]]:
+        if region is None:
+            return self.agents
+        return [agent for agent in self.agents if agent['region'] == region]
+
+    def _cached_pack(self, key: Any, build) -> str:
+        """Encode a fleet-derived reply field once, so serving it stays cheap."""
+        packed = self._packed.get(key)
+        if packed is None:
+            packed = self._packed[key] = _pack(build())
+        return packed
+
+    def _action_listagents(self, payload, dst_region, dst_agent):
+        region = payload.get('action_region')
+        return {'agentslist': self._cached_pack(('listagents', region), lambda: {'agents': self._fleet(region)})}
+
+    def _action_listregions(self, payload, dst_region, dst_agent):
+        def build():
+            counts: Dict[str, int] = {}
+            for agent in self.agents:
+                counts[agent['region']] = counts.get(agent['region'], 0) + 1
+            return {'regions': [{'name': name, 'agents': str(count)} for name, count in counts.items()]}
+        return {'regionslist': self._cached_pack('listregions', build)}
+
+    def _action_resourceinfo(self, payload, dst_region, dst_agent):
+        region, agent = payload.get('action_region'), payload.get('action_agent')
+        perf = json.dumps({'cpu': {'cpu-idle-load': '92.5', 'cpu-logical-count': '8'},
+                           'mem': {'mem-available': '8589934592', 'mem-total': '17179869184'}})
+        if agent is not None:
+            info = {'agentresourceinfo': [{'region': region, 'agent': agent, 'perf': perf}]}
+        else:
+            info = {'regionresourceinfo': [{'region': region, 'agents': str(len(self._fleet(region)))}]}
+        return {'resourceinfo': _pack(info)}
+
+    def _action_globalinfo(self, payload, dst_region, dst_agent):
+        return {'global_region': self.region, 'global_agent': self.agent}
+
+    def _action_iscontrolleractive(self, payload, dst_region, dst_agent):
+        return {'is_controller_active': True}
+
+    def _action_getcontrollerstatus(self, payload, dst_region, dst_agent):
+        return {'controller_status': {'status_code': '10', 'status_desc': 'Controller Active'}}
+
+    def _action_getagentinfo(self, payload, dst_region, dst_agent):
+        for agent in self._fleet(dst_region):
+            if agent['name'] == dst_agent:
+                return {'agent-data': dict(agent)}
+        return {'agent-data': {'region': dst_region, 'name': dst_agent}}
+
+    def _action_pluginadd(self, payload, dst_region, dst_agent):
+        plugin_id = f'plugin/{next(self._ids)}'
+        configparams = payload.get('configparams')
+        self.plugins.setdefault((dst_region, dst_agent), {})[plugin_id] = {
+            'pluginid': plugin_id,
+            'status_code': '10',
+            'configparams': configparams,
+        }
+        return {'status_code': '10', 'status_desc': 'Plugin Added', 'pluginid': plugin_id}
+
+    def _action_pluginremove(self, payload, dst_region, dst_agent):
+        removed = self.plugins.get((dst_region, dst_agent), {}).pop(payload.get('pluginid'), None)
+        return {'status_code': '7' if removed else '9', 'status_desc': 'Plugin Removed' if removed else 'Not Found'}
+
+    def _action_pluginstatus(self, payload, dst_region, dst_agent):
+        plugin = self.plugins.get((dst_region, dst_agent), {}).get(payload.get('pluginid'))
+        if plugin is None:
+            return {'status_code': '8', 'status_desc': 'Plugin Not Found'}
+        return {'status_code': plugin['status_code'], 'status_desc': 'Plugin Active'}
+
+    def _action_pluginlist(self, payload, dst_region, dst_agent):
+        plugins = [{'pluginid': plugin_id, 'status_code': plugin['status_code']}
+                   for plugin_id, plugin in self.plugins.get((dst_region, dst_agent), {}).items()]
+        return {'plugin_list': _pack(plugins)}
+
+    def _action_pluginupload(self, payload, dst_region, dst_agent):
+        return {'status_code': '10', 'status_desc': 'Plugin Uploaded', 'is_updated': True,
+                'bytes': len(payload.get('jardata', ''))}
+
+    def _action_savetorepo(self, payload, dst_region, dst_agent):
+        return self._action_pluginupload(payload, dst_region, dst_agent)
+
+    def _action_listplugins(self, payload, dst_region, dst_agent):
+        return {'pluginslist': _pack({'plugins': [{
+            'pluginname': 'io.cresco.repo', 'region': self.region, 'agent': self.agent, 'name': 'plugin/0',
+        }]})}
+
+    def _action_repolist(self, payload, dst_region, dst_agent):
+        return {'repolist': _pack({'server': [], 'plugins': []})}
+
+    def _action_getlog(self, payload, dst_region, dst_agent):
+        return {'log': _pack(f'{dst_region}/{dst_agent} stand-in log\n')}
+
+    def _action_getbroadcastdiscovery(self, payload, dst_region, dst_agent):
+        return {'broadcast_discovery': _pack([])}
+
+    def _action_gpipelinesubmit(self, payload, dst_region, dst_agent):
+        pipeline_id = f'resource-{next(self._ids)}'
+        cadl = json.loads(gzip.decompress(base64.b64decode(payload['action_gpipeline'])))
+        self.pipelines[pipeline_id] = {
+            'pipeline_id': pipeline_id,
+            'pipeline_name': cadl.get('pipeline_name', pipeline_id),
+            'tenant_id': payload.get('action_tenantid', '0'),
+            'status_code': '10',
+            'status_desc': 'Pipeline Active',
+            'nodes': cadl.get('nodes', []),
+            'edges': cadl.get('edges', []),
+        }
+        return {'gpipeline_id': pipeline_id, 'status_code': '3', 'status_desc': 'Pipeline Scheduled'}
+
+    def _action_gpipelineremove(self, payload, dst_region, dst_agent):
+        removed = self.pipelines.pop(payload.get('action_pipelineid'), None)
+        return {'status_code': '10' if removed else '9', 'status_desc': 'Pipeline Removed' if removed else 'Not Found'}
+
+    def _action_getgpipelinestatus(self, payload, dst_region, dst_agent):
+        pipelines = [{key: pipeline[key] for key in ('pipeline_id', 'pipeline_name', 'status_code', 'status_desc')}
+                     for pipeline in self.pipelines.values()]
+        return {'pipelineinfo': _pack({'pipelines': pipelines})}
+
+    def _action_getgpipeline(self, payload, dst_region, dst_agent):
+        pipeline = self.pipelines.get(payload.get('action_pipelineid'))
+        if pipeline is None:
+            pipeline = {'pipeline_id': payload.get('action_pipelineid'), 'status_code': '0',
+                        'status_desc': 'Pipeline Removed'}
+        return {'gpipeline': _pack(pipeline)}
+
+    # dataplane
+
+    @staticmethod
+    def _stream_key(config: str) -> Tuple[str, Optional[str], Optional[str]]:
+        """Stream key, output and input IDs from a dataplane's first frame."""
+        try:
+            parsed = json.loads(config)
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, dict) and 'ident_key' in parsed:
+            return f"{parsed['ident_key']}={parsed.get('ident_id')}", parsed.get('output_id'), parsed.get('input_id')
+        return config, None, None
+
+    async def _dataplane(self, ws):
+        """Activate a dataplane and deliver its frames to every socket on its stream."""
+        try:
+            config = await ws.recv()
+        except websockets.ConnectionClosed:
+            return
+
+        key, output_id, input_id = self._stream_key(config if isinstance(config, str) else config.decode())
+        members = self._streams.setdefault(key, {})
+        members[ws] = input_id
+        try:
+            await ws.send(json.dumps({'status_code': '10', 'status_desc': 'Dataplane Active'}))
+            async for frame in ws:
+                # Deliver to every subscriber whose input matches the sender's output
+                for member, member_input in list(members.items()):
+                    if output_id is None or member_input == output_id:
+                        try:
+                            await member.send(frame)
+                        except websockets.ConnectionClosed:
+                            members.pop(member, None)
+        finally:
+            members.pop(ws, None)
+            if not members:
+                self._streams.pop(key, None)
+
+    # logstreamer
+
+    async def _logstreamer(self, ws):
+        """Activate a logstreamer and send generated log lines for the agents it selects."""
+        selected: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+        async def emit():
+            for sequence in itertools.count(1):
+                await asyncio.sleep(self.log_interval)
+                for (region, agent), (level, baseclass) in list(selected.items()):
+                    await ws.send(json.dumps({
+                        'ts': str(int(time.time() * 1000)),
+                        'region_id': region,
+                        'agent_id': agent,
+                        'loglevel': level,
+                        'logclass': baseclass,
+                        'message': f'stand-in log line {sequence}',
+                    }))
+
+        emitter = None
+        try:
+            await ws.send(json.dumps({'status_code': '10', 'status_desc': 'Log Streamer Active'}))
+            emitter = asyncio.ensure_future(emit())
+            async for frame in ws:
+                parts = frame.split(',') if isinstance(frame, str) else []
+                if len(parts) == 4:
+                    region, agent, level, baseclass = parts
+                    selected[(region, agent)] = (level, baseclass)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            if emitter is not None:
+                emitter.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('--host', default='localhost', help='Interface to listen on')
+    parser.add_argument('--port', type=int, default=8282, help='Port to listen on')
+    parser.add_argument('--service-key', help='Required service key (default: accept any)')
+    parser.add_argument('--agents', type=int, default=10, help='Agents in the simulated fleet')
+    parser.add_argument('--regions', type=int, default=2, help='Regions the agents are spread over')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added before every reply')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random extra seconds added to the latency')
+    parser.add_argument('--padding', type=int, default=0, help='Filler bytes added to every reply')
+    parser.add_argument('--no-echo-ids', action='store_true',
+                        help='Reply in order without request_id, like older controllers')
+    parser.add_argument('--unordered', action='store_true',
+                        help='Let replies overtake each other even with --no-echo-ids')
+    parser.add_argument('--agent-delay', action='append', default=[], metavar='AGENT=SECONDS',
+                        help='Extra delay before replies for one agent; may be repeated')
+    parser.add_argument('--cert', help='PEM certificate (default: generate a self-signed one)')
+    parser.add_argument('--key', help='Private key for --cert')
+    parser.add_argument('--log-interval', type=float, default=1.0, help='Seconds between generated log lines')
+    args = parser.parse_args()
+
+    agent_delays = {}
+    for item in args.agent_delay:
+        name, _, seconds = item.partition('=')
+        agent_delays[name] = float(seconds)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    standin_server(host=args.host, port=args.port, service_key=args.service_key, agents=args.agents,
+                   regions=args.regions, latency=args.latency, jitter=args.jitter, padding=args.padding,
+                   echo_request_id=not args.no_echo_ids, ordered=False if args.unordered else None,
+                   agent_delays=agent_delays, certfile=args.cert, keyfile=args.key,
+                   log_interval=args.log_interval).run()
+
+
+if __name__ == '__main__':
+    main()
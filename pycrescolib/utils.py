@@ -1,56 +1,455 @@
 """
 Utility functions for the Cresco library.
 """
-import gzip
+import os
+import binascii
+import concurrent.futures
 import io
-import base64
 import json
 import logging
-from zipfile import ZipFile
 import hashlib
-from typing import Dict, Any, Union, Optional, BinaryIO
+import mmap
+import threading
+import time
+import zlib
+from zipfile import ZipFile
+from typing import Dict, Any, Union, Optional, BinaryIO, Callable, Iterable, Iterator, List, Tuple
+
+from .metrics import RATIO_BUCKETS, SIZE_BUCKETS
+from .metrics import registry as metrics
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
-def compress_param(params: str) -> str:
+# JSON codecs in order of preference. Each entry maps a name to a loader that
+# returns (dumps, loads); dumps must return str and loads must accept str or bytes.
+JSON_CODECS = ('orjson', 'msgspec', 'json')
+
+
+def _load_orjson() -> Tuple[Callable[[Any], str], Callable[[Union[str, bytes]], Any]]:
+    import orjson
+
+    option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=option).decode('utf-8')
+
+    return dumps, orjson.loads
+
+
+def _load_msgspec() -> Tuple[Callable[[Any], str], Callable[[Union[str, bytes]], Any]]:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+
+    def dumps(obj: Any) -> str:
+        return encoder.encode(obj).decode('utf-8')
+
+    return dumps, decoder.decode
+
+
+def _load_json() -> Tuple[Callable[[Any], str], Callable[[Union[str, bytes]], Any]]:
+    return json.dumps, json.loads
+
+
+_CODEC_LOADERS = {
+    'orjson': _load_orjson,
+    'msgspec': _load_msgspec,
+    'json': _load_json,
+}
+
+
+def set_json_codec(name: Optional[str] = None) -> str:
+    """Select the JSON backend used for message envelopes and payloads.
+
+    Called once at import with the ``PYCRESCOLIB_JSON_CODEC`` environment
+    variable. With no name, the fastest installed backend is used.
+
+    Args:
+        name: One of ``JSON_CODECS``, or None to pick automatically
+
+    Returns:
+        Name of the codec now in use
+    """
+    global _json_codec, _json_dumps, _json_loads
+
+    if name:
+        if name not in _CODEC_LOADERS:
+            raise ValueError(f"Unknown JSON codec '{name}', expected one of {JSON_CODECS}")
+        candidates = (name,)
+    else:
+        candidates = JSON_CODECS
+
+    for candidate in candidates:
+        try:
+            _json_dumps, _json_loads = _CODEC_LOADERS[candidate]()
+        except ImportError:
+            if name:
+                raise
+            continue
+        _json_codec = candidate
+        logger.debug(f"Using {candidate} JSON codec")
+        return candidate
+
+    raise RuntimeError("No JSON codec available")
+
+
+def get_json_codec() -> str:
+    """Get the name of the JSON codec in use."""
+    return _json_codec
+
+
+def json_dumps(obj: Any) -> str:
+    """Serialize an object to a JSON string with the selected codec."""
+    return _json_dumps(obj)
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON text or UTF-8 bytes with the selected codec."""
+    return _json_loads(data)
+
+
+set_json_codec(os.environ.get('PYCRESCOLIB_JSON_CODEC'))
+
+# Compression policies by name. Payloads below min_size are stored (level 0):
+# deflate cannot shrink them enough to cover the gzip header and base64, so
+# it would only cost CPU. Payloads of large_size or more use large_level.
+COMPRESSION_POLICIES: Dict[str, Dict[str, Any]] = {
+    # zlib's default level, and a fast one for multi-MB CADLs and lists
+    'default': {'level': 6, 'min_size': 256, 'large_size': 2 ** 20, 'large_level': 1},
+    # Least CPU for anything worth compressing
+    'fast': {'level': 1, 'min_size': 256, 'large_size': None, 'large_level': 1},
+    # Smallest payloads at any size, e.g. for pipelines that are archived
+    'best': {'level': 9, 'min_size': 256, 'large_size': None, 'large_level': 9},
+    # gzip module behaviour: level 9 for everything
+    'legacy': {'level': 9, 'min_size': 0, 'large_size': None, 'large_level': 9},
+}
+
+
+class compression_policy:
+    """Chooses the zlib level of an outgoing gzip+base64 payload from its size.
+
+    Every level produces a standard gzip member, so the controller reads
+    the payload the same way whichever level is picked.
+    """
+
+    def __init__(self, level: int = 6, min_size: int = 256, large_size: Optional[int] = 2 ** 20,
+                 large_level: int = 1):
+        """Initialize the policy; the defaults are the 'default' policy.
+
+        Args:
+            level: zlib level, 0-9, for payloads between min_size and large_size
+            min_size: Payloads shorter than this are stored uncompressed (level 0)
+            large_size: Payloads at least this long use large_level, or None for no limit
+            large_level: zlib level for large payloads
+        """
+        for value in (level, large_level):
+            if not 0 <= value <= 9:
+                raise ValueError(f"Compression level must be between 0 and 9, got {value}")
+        self.level = level
+        self.min_size = min_size
+        self.large_size = large_size
+        self.large_level = large_level
+
+    @classmethod
+    def preset(cls, name: str, **overrides) -> 'compression_policy':
+        """Policy from a named preset.
+
+        Args:
+            name: One of ``COMPRESSION_POLICIES``
+            **overrides: Values replacing the preset's
+
+        Returns:
+            New compression_policy
+        """
+        if name not in COMPRESSION_POLICIES:
+            raise ValueError(f"Unknown compression policy '{name}', expected one of {tuple(COMPRESSION_POLICIES)}")
+        return cls(**{**COMPRESSION_POLICIES[name], **overrides})
+
+    def level_for(self, size: int) -> int:
+        """zlib level for a payload of ``size`` bytes or characters."""
+        if size < self.min_size:
+            return 0
+        if self.large_size is not None and size >= self.large_size:
+            return self.large_level
+        return self.level
+
+    def __repr__(self):
+        return (f"compression_policy(level={self.level}, min_size={self.min_size}, "
+                f"large_size={self.large_size}, large_level={self.large_level})")
+
+
+def set_compression_policy(policy: Union[str, compression_policy, None] = None) -> compression_policy:
+    """Set the policy used by ``compress_param`` and ``compress_data``.
+
+    Called once at import with the ``PYCRESCOLIB_COMPRESSION`` environment
+    variable.
+
+    Args:
+        policy: Name from ``COMPRESSION_POLICIES``, a compression_policy, or None for 'default'
+
+    Returns:
+        The policy now in use
+    """
+    global _compression_policy
+
+    if not isinstance(policy, compression_policy):
+        policy = compression_policy.preset(policy or 'default')
+    _compression_policy = policy
+    logger.debug(f"Using {policy!r}")
+    return policy
+
+
+def get_compression_policy() -> compression_policy:
+    """Get the compression policy in use."""
+    return _compression_policy
+
+
+set_compression_policy(os.environ.get('PYCRESCOLIB_COMPRESSION'))
+
+def _record_payload(direction: str, compressed_size: int, decompressed_size: int) -> None:
+    """Record the two sizes of a gzip+base64 field in the metrics registry."""
+    labels = {'direction': direction}
+    metrics.observe('cresco_payload_compressed_bytes', labels, compressed_size, SIZE_BUCKETS)
+    metrics.observe('cresco_payload_decompressed_bytes', labels, decompressed_size, SIZE_BUCKETS)
+    if decompressed_size:
+        metrics.observe('cresco_payload_compression_ratio', labels, compressed_size / decompressed_size,
+                        RATIO_BUCKETS)
+
+def _compress(payload: Union[str, bytes], level: Optional[int]) -> str:
+    """Compress a payload at ``level`` or the policy's level and record the metrics."""
+    if level is None:
+        level = _compression_policy.level_for(len(payload))
+    start = time.perf_counter()
+    encoded = ''.join(iter_compress(payload, level))
+    metrics.observe('cresco_payload_compress_seconds', {'level': level}, time.perf_counter() - start)
+    _record_payload('compress', len(encoded), len(payload))
+    return encoded
+
+# Input consumed per step by the streaming codecs. Base64 works on groups of
+# 3 bytes / 4 characters, so both chunk sizes are multiples of 12.
+CODEC_CHUNK = 192 * 1024
+
+# zlib window bits: 16 + 15 writes a gzip member, 32 + 15 reads gzip or zlib
+_GZIP_WBITS = 31
+_AUTO_WBITS = 47
+
+# Bytes outside the base64 alphabet, which base64.b64decode skips (line breaks)
+_B64_JUNK = bytes(sorted(set(range(256)) - set(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=')))
+
+
+def _b64_strip(text: Union[str, bytes]) -> bytes:
+    """``text`` as bytes without the characters outside the base64 alphabet."""
+    if isinstance(text, str):
+        text = text.encode('ascii')
+    return text.translate(None, _B64_JUNK)
+
+
+class gzip_b64_encoder:
+    """Incremental gzip+base64 encoder.
+
+    Produces the same wire format as ``base64.b64encode(gzip.compress(data))``
+    without holding the whole compressed payload, or a bytes copy of its
+    base64 text, in memory. Each call returns the base64 text completed so
+    far, which can be written straight to an output buffer.
+    """
+
+    def __init__(self, level: int = 9):
+        """Initialize the encoder.
+
+        Args:
+            level: zlib compression level, 0-9 (9 is what ``gzip`` uses)
+        """
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+        self._pending = b''  # Compressed bytes not yet a multiple of 3
+        self.bytes_in = 0
+        self.chars_out = 0
+
+    def _encode(self, data: bytes, final: bool = False) -> str:
+        if self._pending:
+            data = self._pending + data
+        cut = len(data) if final else len(data) - len(data) % 3
+        self._pending = data[cut:]
+        if not cut:
+            return ''
+        text = binascii.b2a_base64(memoryview(data)[:cut], newline=False).decode('ascii')
+        self.chars_out += len(text)
+        return text
+
+    def update(self, data: Union[bytes, bytearray, memoryview]) -> str:
+        """Compress more input.
+
+        Args:
+            data: Next piece of the payload
+
+        Returns:
+            Base64 text that is now complete (possibly empty)
+        """
+        self.bytes_in += len(data)
+        return self._encode(self._compressor.compress(data))
+
+    def finish(self) -> str:
+        """Flush the compressor and return the rest of the base64 text."""
+        return self._encode(self._compressor.flush(), final=True)
+
+
+class gzip_b64_decoder:
+    """Incremental base64+gzip decoder, the reverse of ``gzip_b64_encoder``.
+
+    Accepts the base64 text in pieces of any size and returns decompressed
+    bytes as they become available. Like ``base64.b64decode``, characters
+    outside the base64 alphabet such as line breaks are skipped.
+    Concatenated gzip members are read the way ``gzip.decompress`` reads them.
+    """
+
+    def __init__(self):
+        self._decompressor = zlib.decompressobj(_AUTO_WBITS)
+        self._pending = b''  # Base64 characters not yet a multiple of 4
+        self.chars_in = 0
+        self.bytes_in = 0  # Compressed bytes decoded from the base64
+        self.bytes_out = 0
+
+    def update(self, text: Union[str, bytes]) -> bytes:
+        """Decode more base64 text.
+
+        Args:
+            text: Next piece of the base64 payload (ASCII str or bytes)
+
+        Returns:
+            Decompressed bytes now available (possibly empty)
+        """
+        self.chars_in += len(text)
+        if self._pending:
+            text = self._pending + (text.encode('ascii') if isinstance(text, str) else text)
+        cut = len(text) - len(text) % 4
+        piece = text[:cut] if cut < len(text) else text
+        try:
+            data = binascii.a2b_base64(piece)
+        except binascii.Error:
+            data = None
+        # Skipped characters show up as missing output; only then is the text
+        # cleaned and cut again, so clean payloads are not copied
+        tail = piece[-2:]
+        if data is None or len(data) != cut // 4 * 3 - tail.count('=' if isinstance(tail, str) else b'='):
+            text = _b64_strip(text)
+            cut = len(text) - len(text) % 4
+            data = binascii.a2b_base64(text[:cut])
+        self._pending = _b64_strip(text[cut:]) if cut < len(text) else b''
+        if not data:
+            return b''
+        return self._decompress(data)
+
+    def _decompress(self, data: bytes) -> bytes:
+        self.bytes_in += len(data)
+        out = self._decompressor.decompress(data)
+        # A finished member followed by more data starts a new member
+        while self._decompressor.eof and self._decompressor.unused_data:
+            rest = self._decompressor.unused_data
+            self._decompressor = zlib.decompressobj(_AUTO_WBITS)
+            out += self._decompressor.decompress(rest)
+        self.bytes_out += len(out)
+        return out
+
+    def finish(self) -> bytes:
+        """Check the payload is complete and return any remaining bytes.
+
+        Raises:
+            ValueError: If the base64 text or gzip stream is truncated
+        """
+        if self._pending:
+            raise ValueError("Truncated base64 payload")
+        if not self.bytes_in:
+            return b''
+        out = self._decompressor.flush()
+        if not self._decompressor.eof:
+            raise ValueError("Truncated gzip payload")
+        self.bytes_out += len(out)
+        return out
+
+
+def iter_compress(data: Union[str, bytes], level: int = 9, chunk_size: int = CODEC_CHUNK) -> Iterator[str]:
+    """Compress a payload to gzip+base64 text, yielding it in pieces.
+
+    A str is encoded to UTF-8 one chunk at a time, so no full bytes copy of
+    it is made.
+
+    Args:
+        data: Text or binary payload
+        level: zlib compression level
+        chunk_size: Input consumed per step
+
+    Yields:
+        Consecutive pieces of the base64 text
+    """
+    encoder = gzip_b64_encoder(level)
+    view = data if isinstance(data, str) else memoryview(data)
+    for offset in range(0, len(view), chunk_size):
+        piece = view[offset:offset + chunk_size]
+        text = encoder.update(piece.encode() if isinstance(data, str) else piece)
+        if text:
+            yield text
+    yield encoder.finish()
+
+
+def iter_decompress(param: Union[str, bytes], chunk_size: int = CODEC_CHUNK) -> Iterator[bytes]:
+    """Decode gzip+base64 text, yielding the decompressed bytes in pieces.
+
+    Args:
+        param: Base64 encoded compressed payload
+        chunk_size: Base64 characters consumed per step (rounded down to a multiple of 4)
+
+    Yields:
+        Consecutive pieces of the decompressed payload
+    """
+    chunk_size -= chunk_size % 4
+    decoder = gzip_b64_decoder()
+    for offset in range(0, len(param), chunk_size):
+        out = decoder.update(param[offset:offset + chunk_size])
+        if out:
+            yield out
+    yield decoder.finish()
+
+
+def _decompress_into(param: Union[str, bytes]) -> Union[bytes, bytearray]:
+    """Decode gzip+base64 text into one growing buffer."""
+    if len(param) <= CODEC_CHUNK:
+        decoder = gzip_b64_decoder()
+        return decoder.update(param) + decoder.finish()
+    buffer = bytearray()
+    for out in iter_decompress(param):
+        buffer += out
+    return buffer
+
+
+def compress_param(params: str, level: Optional[int] = None) -> str:
     """Compress a string parameter.
     
     Args:
         params: String parameter to compress
+        level: zlib level, 0-9, overriding the compression policy for this call
         
     Returns:
         Base64 encoded compressed string
     """
     try:
-        out = io.BytesIO()
-        
-        with gzip.GzipFile(fileobj=out, mode='w') as fo:
-            fo.write(params.encode())
-            
-        bytes_obj = out.getvalue()
-        return base64.b64encode(bytes_obj).decode('utf-8')
+        return _compress(params, level)
     except Exception as e:
         logger.error(f"Error compressing parameter: {e}")
         raise
 
-def compress_data(byte_data: bytes) -> str:
+def compress_data(byte_data: bytes, level: Optional[int] = None) -> str:
     """Compress binary data.
     
     Args:
         byte_data: Binary data to compress
+        level: zlib level, 0-9, overriding the compression policy for this call
         
     Returns:
         Base64 encoded compressed data
     """
     try:
-        out = io.BytesIO()
-        
-        with gzip.GzipFile(fileobj=out, mode='w') as fo:
-            fo.write(byte_data)
-            
-        bytes_obj = out.getvalue()
-        return base64.b64encode(bytes_obj).decode('utf-8')
+        return _compress(byte_data, level)
     except Exception as e:
         logger.error(f"Error compressing data: {e}")
         raise
@@ -65,7 +464,7 @@ def encode_data(byte_data: bytes) -> str:
         Base64 encoded data
     """
     try:
-        return base64.b64encode(byte_data).decode('utf-8')
+        return binascii.b2a_base64(byte_data, newline=False).decode('ascii')
     except Exception as e:
         logger.error(f"Error encoding data: {e}")
         raise
@@ -80,55 +479,354 @@ def decompress_param(param: str) -> str:
         Decompressed string
     """
     try:
-        compressed_bytes = base64.b64decode(param)
-        uncompressed_bytes = gzip.decompress(compressed_bytes).decode()
-        return uncompressed_bytes
+        uncompressed_bytes = _decompress_into(param)
+        _record_payload('decompress', len(param), len(uncompressed_bytes))
+        return uncompressed_bytes.decode()
     except Exception as e:
         logger.error(f"Error decompressing parameter: {e}")
         raise
 
-def get_jar_info(jar_file_path: str) -> Dict[str, str]:
+def decompress_json(param: str) -> Any:
+    """Decompress a base64 encoded compressed JSON parameter and parse it.
+
+    Equivalent to ``json_deserialize(decompress_param(param))`` but parses
+    the decompressed bytes directly, skipping the intermediate string.
+
+    Args:
+        param: Base64 encoded compressed JSON
+
+    Returns:
+        Deserialized object
+    """
+    try:
+        uncompressed_bytes = _decompress_into(param)
+        _record_payload('decompress', len(param), len(uncompressed_bytes))
+        return _json_loads(uncompressed_bytes)
+    except Exception as e:
+        logger.error(f"Error decompressing JSON parameter: {e}")
+        raise
+
+# Bytes read per step when a JAR cannot be memory-mapped for hashing
+HASH_CHUNK = 2 ** 20
+
+# Files modified this recently are not cached: a rewrite within the
+# filesystem's timestamp granularity would leave the cache key unchanged
+_JAR_CACHE_SETTLE_NS = 2 * 10 ** 9
+
+
+def _default_jar_cache_path() -> str:
+    """``$XDG_CACHE_HOME/pycrescolib/jarinfo.json``, under ``~/.cache`` by default."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'pycrescolib', 'jarinfo.json')
+
+
+class jar_info_cache:
+    """Persistent cache of ``get_jar_info`` results.
+
+    Entries are keyed by a JAR's real path and checked against its size,
+    mtime_ns and inode, so a hit costs one ``stat`` and the JAR is not
+    opened. The cache is a JSON file, loaded on first use and written back
+    by ``save``.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 4096):
+        """Initialize the cache without touching the file.
+
+        Args:
+            path: Cache file (default: ``$XDG_CACHE_HOME/pycrescolib/jarinfo.json``)
+            max_entries: Entries kept; the least recently stored are dropped first
+        """
+        self.path = path or _default_jar_cache_path()
+        self.max_entries = max_entries
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(stat: os.stat_result) -> List[int]:
+        """The part of a stat result an entry must match."""
+        return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        """Entries in the cache file, or none if it is missing or unreadable."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            entries = data.get('entries') if data.get('version') == 1 else None
+            return entries if isinstance(entries, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable JAR cache {self.path}: {e}")
+            return {}
+
+    def _loaded(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            self._entries = self._read()
+        return self._entries
+
+    def get(self, real_path: str, stat: os.stat_result) -> Optional[Dict[str, str]]:
+        """Cached info of a JAR, or None if missing or the file changed.
+
+        Args:
+            real_path: ``os.path.realpath`` of the JAR
+            stat: Its current ``os.stat`` result
+
+        Returns:
+            Copy of the cached pluginname, version and md5
+        """
+        with self._lock:
+            entry = self._loaded().get(real_path)
+            if entry is None or entry.get('key') != self.key(stat):
+                return None
+            return dict(entry['info'])
+
+    def put(self, real_path: str, stat: os.stat_result, info: Dict[str, str]):
+        """Store the info of a JAR read while it had ``stat``.
+
+        Args:
+            real_path: ``os.path.realpath`` of the JAR
+            stat: ``os.stat`` result taken before the JAR was read
+            info: pluginname, version and md5
+        """
+        if time.time_ns() - stat.st_mtime_ns < _JAR_CACHE_SETTLE_NS:
+            return
+        with self._lock:
+            entries = self._loaded()
+            entries.pop(real_path, None)
+            entries[real_path] = {'key': self.key(stat), 'info': dict(info)}
+            while len(entries) > self.max_entries:
+                del entries[next(iter(entries))]
+            self._dirty = True
+
+    def save(self):
+        """Write the cache file if entries were added.
+
+        Entries other processes saved since the file was loaded are kept.
+        Failures are logged; the cache stays usable in memory.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = self._read()
+            for real_path, entry in self._entries.items():
+                entries.pop(real_path, None)
+                entries[real_path] = entry
+            while len(entries) > self.max_entries:
+                del entries[next(iter(entries))]
+
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'version': 1, 'entries': entries}, f)
+                os.replace(temp_path, self.path)
+                self._entries = entries
+                self._dirty = False
+            except OSError as e:
+                logger.warning(f"Could not write JAR cache {self.path}: {e}")
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+
+    def clear(self):
+        """Drop every entry; the file is emptied on the next ``save``."""
+        with self._lock:
+            self._entries = {}
+            self._dirty = True
+
+
+def set_jar_cache(cache: Union[str, jar_info_cache, bool, None] = True) -> Optional[jar_info_cache]:
+    """Set the cache used by ``get_jar_info``, ``read_jar`` and ``fingerprint_jars``.
+
+    Caching is off unless enabled here or with the ``PYCRESCOLIB_JAR_CACHE``
+    environment variable, which is read once at import. The file is only
+    read when a JAR is first looked up.
+
+    Args:
+        cache: True or 'on' for the default file, a cache file path, a
+            jar_info_cache, or False, None, '' or 'off' to disable caching
+
+    Returns:
+        The cache now in use, or None
+    """
+    global _jar_cache
+
+    if cache is True:
+        cache = jar_info_cache()
+    elif isinstance(cache, str):
+        if cache.lower() in ('', 'off'):
+            cache = None
+        else:
+            cache = jar_info_cache(None if cache.lower() == 'on' else cache)
+    elif not isinstance(cache, jar_info_cache):
+        cache = None
+    _jar_cache = cache
+    return cache
+
+
+def get_jar_cache() -> Optional[jar_info_cache]:
+    """Get the JAR info cache in use, or None if caching is disabled."""
+    return _jar_cache
+
+
+set_jar_cache(os.environ.get('PYCRESCOLIB_JAR_CACHE'))
+
+def _md5_file(path: str) -> str:
+    """MD5 of a file, hashed from a memory map, or in chunks where one cannot be made."""
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+            return digest.hexdigest()
+        except (ValueError, OSError):
+            pass  # Empty files and some filesystems cannot be mapped
+
+        buffer = bytearray(HASH_CHUNK)
+        view = memoryview(buffer)
+        while True:
+            count = f.readinto(buffer)
+            if not count:
+                break
+            digest.update(view[:count])
+    return digest.hexdigest()
+
+def _read_manifest(jar: Union[str, BinaryIO]) -> Dict[str, str]:
+    """Plugin name and version from a JAR's MANIFEST.MF.
+
+    Raises:
+        ValueError: If the manifest or one of the fields is missing
+    """
+    params = {}
+    with ZipFile(jar, 'r') as myzip:
+        try:
+            myfile = myzip.read(name='META-INF/MANIFEST.MF')
+        except KeyError:
+            logger.error("META-INF/MANIFEST.MF not found in JAR file")
+            raise ValueError("Invalid JAR file: Missing MANIFEST.MF")
+    for line in myfile.decode().split('\n'):
+        line = line.strip().split(': ')
+        if len(line) == 2:
+            if line[0] == 'Bundle-SymbolicName':
+                params['pluginname'] = line[1]
+            if line[0] == 'Bundle-Version':
+                params['version'] = line[1]
+
+    # Validate required fields
+    if 'pluginname' not in params:
+        raise ValueError("Plugin name not found in MANIFEST.MF")
+    if 'version' not in params:
+        raise ValueError("Version not found in MANIFEST.MF")
+    return params
+
+def _jar_info(jar_file_path: str, use_cache: bool, keep_data: bool = False) -> Tuple[Dict[str, str], Optional[bytes]]:
+    """Info of a JAR from the cache or the file, and the file's bytes if ``keep_data``.
+
+    With ``keep_data`` the JAR is read once, and the hash and manifest come
+    from those bytes.
+    """
+    cache = _jar_cache if use_cache else None
+    real_path = os.path.realpath(jar_file_path)
+    stat = os.stat(real_path)
+    info = cache.get(real_path, stat) if cache is not None else None
+
+    data = None
+    if keep_data:
+        data = read_file_bytes(real_path)
+        current = os.stat(real_path)
+        if jar_info_cache.key(current) != jar_info_cache.key(stat):
+            # Changed since the lookup; describe the bytes actually read
+            stat, info = current, None
+
+    if info is None:
+        if data is not None:
+            info = _read_manifest(io.BytesIO(data))
+            info['md5'] = hashlib.md5(data).hexdigest()
+        else:
+            info = _read_manifest(real_path)
+            info['md5'] = _md5_file(real_path)
+        if cache is not None and jar_info_cache.key(os.stat(real_path)) == jar_info_cache.key(stat):
+            cache.put(real_path, stat, info)
+    return info, data
+
+def get_jar_info(jar_file_path: str, use_cache: bool = True) -> Dict[str, str]:
     """Get information from a JAR file.
     
+    A JAR that is unchanged since it was last read is answered from the
+    JAR info cache without opening it.
+
     Args:
         jar_file_path: Path to JAR file
+        use_cache: Look the JAR up in, and add it to, the JAR info cache, if one is set
         
     Returns:
         Dictionary with plugin name, version, and MD5 hash
     """
-    params = {}
-    
     try:
-        # Read manifest
-        with ZipFile(jar_file_path, 'r') as myzip:
-            try:
-                myfile = myzip.read(name='META-INF/MANIFEST.MF')
-                for line in myfile.decode().split('\n'):
-                    line = line.strip().split(': ')
-                    if len(line) == 2:
-                        if line[0] == 'Bundle-SymbolicName':
-                            params['pluginname'] = line[1]
-                        if line[0] == 'Bundle-Version':
-                            params['version'] = line[1]
-            except KeyError:
-                logger.error("META-INF/MANIFEST.MF not found in JAR file")
-                raise ValueError("Invalid JAR file: Missing MANIFEST.MF")
-        
-        # Calculate MD5 hash
-        with open(jar_file_path, 'rb') as f:
-            params['md5'] = hashlib.md5(f.read()).hexdigest()
-        
-        # Validate required fields
-        if 'pluginname' not in params:
-            raise ValueError("Plugin name not found in MANIFEST.MF")
-        if 'version' not in params:
-            raise ValueError("Version not found in MANIFEST.MF")
-            
-        return params
+        info, _ = _jar_info(jar_file_path, use_cache)
+        if use_cache and _jar_cache is not None:
+            _jar_cache.save()
+        return info
     except Exception as e:
         logger.error(f"Error getting JAR info: {e}")
         raise
 
+def read_jar(jar_file_path: str, use_cache: bool = True) -> Tuple[Dict[str, str], bytes]:
+    """Get the information and the content of a JAR file, reading it once.
+
+    Args:
+        jar_file_path: Path to JAR file
+        use_cache: Look the JAR up in, and add it to, the JAR info cache
+
+    Returns:
+        Tuple of the ``get_jar_info`` dictionary and the file content
+    """
+    try:
+        info, data = _jar_info(jar_file_path, use_cache, keep_data=True)
+        if use_cache and _jar_cache is not None:
+            _jar_cache.save()
+        return info, data
+    except Exception as e:
+        logger.error(f"Error reading JAR {jar_file_path}: {e}")
+        raise
+
+def fingerprint_jars(paths: Union[str, Iterable[str]], workers: int = 4,
+                     use_cache: bool = True) -> Dict[str, Dict[str, str]]:
+    """Get the information of many JAR files on a thread pool.
+
+    Hashing releases the GIL, so JARs missing from the cache are hashed in
+    parallel. JARs that cannot be read are logged and left out.
+
+    Args:
+        paths: Directory whose ``*.jar`` files to read, or JAR paths
+        workers: Number of threads
+        use_cache: Look the JARs up in, and add them to, the JAR info cache
+
+    Returns:
+        Dictionary of path to ``get_jar_info`` dictionary
+    """
+    if isinstance(paths, str):
+        paths = sorted(entry.path for entry in os.scandir(paths)
+                       if entry.name.endswith('.jar') and entry.is_file())
+    else:
+        paths = list(paths)
+
+    def fingerprint(path):
+        try:
+            return path, _jar_info(path, use_cache)[0]
+        except Exception as e:
+            logger.error(f"Error getting JAR info for {path}: {e}")
+            return path, None
+
+    with concurrent.futures.ThreadPoolExecutor(max(1, min(workers, len(paths) or 1)),
+                                               thread_name_prefix='cresco-jarinfo') as pool:
+        results = dict(pool.map(fingerprint, paths))
+    if use_cache and _jar_cache is not None:
+        _jar_cache.save()
+    return {path: info for path, info in results.items() if info is not None}
+
 def json_serialize(obj: Any) -> str:
     """Serialize object to JSON with error handling.
     
@@ -139,7 +837,7 @@ def json_serialize(obj: Any) -> str:
         JSON string
     """
     try:
-        return json.dumps(obj)
+        return _json_dumps(obj)
     except (TypeError, ValueError) as e:
         logger.error(f"Error serializing to JSON: {e}")
         raise
@@ -154,8 +852,8 @@ def json_deserialize(json_str: str) -> Any:
         Deserialized object
     """
     try:
-        return json.loads(json_str)
-    except json.JSONDecodeError as e:
+        return _json_loads(json_str)
+    except ValueError as e:
         logger.error(f"Error deserializing JSON: {e}")
         raise
 
@@ -5,27 +5,157 @@ Uses direct WebSocket communication with proper thread and event loop handling.
 import ssl
 import warnings
 
-from cryptography import x509
-
 import logging
 import json
 import asyncio
+import itertools
+import random
 import time
 import threading
 import concurrent.futures
-from typing import Optional, Dict, Any
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Callable, Optional, Dict, Any, List, Tuple
 
 import websockets
 
+from .metrics import SIZE_BUCKETS
+from .metrics import registry as default_registry
+from .utils import json_loads
+from .wsconfig import ws_settings
+
+if TYPE_CHECKING:
+    from .recording import traffic_recorder
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Write priority classes, most urgent first
+LANES = ('control', 'normal', 'bulk')
+
+# Queued fire-and-forget messages written per turn at the socket
+FLUSH_MESSAGES = 64
+FLUSH_BYTES = 256 * 1024
+
+
+class write_scheduler:
+    """Orders writes to one socket by lane instead of arrival.
+
+    One message is handed to the socket at a time. When it has been written,
+    the next one comes from the most urgent lane with a waiter. To keep bulk
+    transfers from starving, a bulk waiter goes next once ``bulk_every``
+    other messages have overtaken it or it has waited ``max_bulk_wait``
+    seconds. Only used from the interface's event loop thread.
+
+    A large frame is encrypted and written without yielding to the loop, so
+    writers that are already scheduled never get to queue behind it. Bulk
+    messages therefore always wait one loop iteration before taking an idle
+    socket, which lets any control message scheduled by then go first.
+    """
+
+    def __init__(self, bulk_every: int = 8, max_bulk_wait: float = 2.0):
+        """Initialize an idle scheduler.
+
+        Args:
+            bulk_every: Messages that may overtake a waiting bulk message
+            max_bulk_wait: Seconds after which a waiting bulk message goes next
+        """
+        self.bulk_every = bulk_every
+        self.max_bulk_wait = max_bulk_wait
+        self._busy = False
+        self._waiters: Dict[str, deque] = {lane: deque() for lane in LANES}
+        self._overtaken = 0  # Messages written since the oldest bulk waiter arrived
+
+    async def acquire(self, lane: str = 'normal') -> float:
+        """Wait for this message's turn to write.
+
+        Args:
+            lane: One of ``LANES``
+
+        Returns:
+            Seconds spent waiting
+        """
+        if lane not in self._waiters:
+            raise ValueError(f"Unknown lane: {lane}")
+        if not self._busy and lane != 'bulk':
+            self._busy = True
+            return 0.0
+
+        loop = asyncio.get_running_loop()
+        queued = loop.time()
+        future = loop.create_future()
+        self._waiters[lane].append((queued, future))
+        if not self._busy:
+            # Hold the socket until callbacks already scheduled have run, then
+            # hand it to the most urgent waiter
+            self._busy = True
+            loop.call_soon(self.release)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The turn was handed over just as the caller gave up
+                self.release()
+            elif (queued, future) in self._waiters[lane]:
+                self._waiters[lane].remove((queued, future))
+            raise
+        return loop.time() - queued
+
+    def release(self):
+        """Finish the current write and hand the socket to the next waiter."""
+        future = self._next()
+        if future is None:
+            self._busy = False
+        else:
+            future.set_result(None)
+
+    def _next(self) -> Optional[asyncio.Future]:
+        """Pop the waiter that writes next, or None if nobody is waiting."""
+        for waiters in self._waiters.values():
+            # Drop waiters that were cancelled and have not cleaned up yet
+            while waiters and waiters[0][1].done():
+                waiters.popleft()
+
+        bulk = self._waiters['bulk']
+        starved = bool(bulk) and (self._overtaken >= self.bulk_every
+                                  or asyncio.get_running_loop().time() - bulk[0][0] >= self.max_bulk_wait)
+        for lane in LANES:
+            waiters = self._waiters[lane]
+            if not waiters or (starved and lane != 'bulk'):
+                continue
+            _, future = waiters.popleft()
+            if lane == 'bulk':
+                self._overtaken = 0
+            elif bulk:
+                self._overtaken += 1
+            return future
+        return None
+
+    def waiting(self) -> Dict[str, int]:
+        """Number of messages waiting in each lane."""
+        return {lane: len(waiters) for lane, waiters in self._waiters.items()}
+
 
 class ws_interface:
     """WebSocket interface for Cresco communication with proper threading."""
 
-    def __init__(self):
-        """Initialize the WebSocket interface."""
+    def __init__(self, reconnect: bool = True, reconnect_wait: float = 5.0, max_reconnect_delay: float = 30.0,
+                 metrics=None, recorder: Optional['traffic_recorder'] = None,
+                 settings: Optional[ws_settings] = None, max_outbound: int = 4096):
+        """Initialize the WebSocket interface.
+
+        Args:
+            reconnect: Whether to reconnect in the background when the socket drops
+            reconnect_wait: How long a new request waits for a reconnect in progress
+            max_reconnect_delay: Upper bound in seconds on the backoff between attempts
+            metrics: MetricsRegistry for connection and frame metrics (default: the shared registry)
+            recorder: Optional ``traffic_recorder`` that every frame sent and received is appended to
+            settings: Message size, buffering and compression options (default: ``ws_settings()``)
+            max_outbound: Messages ``send_nowait`` may queue before callers wait for room
+        """
+        self.metrics = metrics if metrics is not None else default_registry
+        self.settings = settings if settings is not None else ws_settings()
+        self.recorder = recorder
+        self._channel = recorder.channel() if recorder is not None else 0
         self.url = None
         self.ws = None
         self.region = None
@@ -40,6 +170,40 @@ class ws_interface:
         self._lock = threading.RLock()  # Reentrant lock for thread safety
         self._shutdown_flag = False  # Flag to indicate shutdown in progress
 
+        # RPC dispatcher state: request_id -> future, in send order. Only touched
+        # from the event loop thread, so no additional locking is needed.
+        self._pending: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+        self._request_ids = itertools.count(1)
+        self._reader_task = None
+        self._unsolicited = None  # asyncio.Queue for replies no request claimed
+        self._echoes_ids = False  # Set once the server is seen echoing request_id
+        self._serial = None  # asyncio.Lock holding RPCs to one at a time until then
+
+        # Requests submitted from caller threads and not yet finished, used by
+        # ws_pool to pick the least busy connection
+        self._in_flight = 0
+        self._in_flight_bytes = 0
+
+        # Decides which waiting message is written next
+        self.lanes = write_scheduler()
+
+        # Fire-and-forget messages queued by send_nowait: (message, lane, done
+        # callback). Filled from caller threads, drained by one task on the loop.
+        self.max_outbound = max_outbound
+        self._outbound: deque = deque()
+        self._outbound_room = threading.Condition()
+        self._flush_task = None
+        self._flush_scheduled = False
+
+        # Reconnect state. _online is waited on by caller threads, _online_async
+        # by coroutines on the interface's own loop.
+        self.reconnect = reconnect
+        self.reconnect_wait = reconnect_wait
+        self.max_reconnect_delay = max_reconnect_delay
+        self._reconnect_task = None
+        self._online = threading.Event()
+        self._online_async = None
+
     def connect(self, url, service_key, verify_ssl=True):
         """Store connection parameters and initialize the event loop.
 
@@ -77,6 +241,30 @@ class ws_interface:
             self._connected = False
             return False
 
+    async def open(self, url, service_key, verify_ssl=True):
+        """Connect on the caller's running event loop instead of a dedicated thread.
+
+        Used by the asyncio client; requests are then made with ``request``.
+
+        Args:
+            url: WebSocket URL
+            service_key: Service key for authentication
+            verify_ssl: Whether to verify SSL certificates
+
+        Returns:
+            True if connection was successful
+        """
+        self.url = url
+        self._service_key = service_key
+        self._verify_ssl = verify_ssl
+        self._shutdown_flag = False
+        self._loop = asyncio.get_running_loop()
+
+        logger.info(f"Preparing connection to {url} on the running event loop")
+
+        self._connected = await self.connect_async()
+        return self._connected
+
     def _initialize_event_loop(self):
         """Initialize event loop in a dedicated thread."""
         with self._lock:
@@ -84,10 +272,13 @@ class ws_interface:
                 # Create a new event loop
                 self._loop = asyncio.new_event_loop()
                 self._running = True
+                started = threading.Event()
 
                 # Start it in a dedicated thread
                 def run_event_loop():
                     asyncio.set_event_loop(self._loop)
+                    # Signalled from inside the loop, so it is already running
+                    self._loop.call_soon(started.set)
                     try:
                         self._loop.run_forever()
                     except Exception as e:
@@ -102,8 +293,9 @@ class ws_interface:
                 self._thread = threading.Thread(target=run_event_loop, daemon=True)
                 self._thread.start()
 
-                # Wait for thread to start
-                time.sleep(0.2)
+                # Wait for the loop to start running
+                if not started.wait(timeout=5.0):
+                    logger.warning("Event loop thread did not start within 5 seconds")
 
     def _cleanup_pending_tasks(self):
         """Clean up any pending tasks in the event loop."""
@@ -137,6 +329,7 @@ class ws_interface:
 
         logger.info(f"Connecting to {self.url}")
 
+        start = time.perf_counter()
         try:
             # Configure SSL
             ssl_context = None
@@ -152,28 +345,15 @@ class ws_interface:
                 websockets.connect(
                     self.url,
                     ssl=ssl_context if self.url.startswith('wss://') else None,
-                    additional_headers={'cresco_service_key': self._service_key}
+                    additional_headers={'cresco_service_key': self._service_key},
+                    **self.settings.connect_kwargs(self.metrics, 'apisocket')
                 ),
                 timeout=8.0
             )
 
-            # Extract certificate information
+            # Extract identity from the certificate of the session just opened
             try:
-                # Get host and port from URL
-                surl = self.url.split('/')[2].split(':')
-                server_address = (surl[0], int(surl[1]))
-
-                # Get server certificate
-                pem_data = ssl.get_server_certificate(server_address)
-                cert = x509.load_pem_x509_certificate(str.encode(pem_data))
-                # Suppress all warnings from the 'cryptography' module
-                ident_string = cert.subject.rfc4514_string().replace('CN=', '').split('_')
-
-                # Set identity values
-                self.region = ident_string[0]
-                self.agent = ident_string[1]
-                self.plugin = ident_string[2]
-
+                self.region, self.agent, self.plugin = await self._peer_identity()
                 logger.info(
                     f"Extracted identity from certificate: region={self.region}, agent={self.agent}, plugin={self.plugin}")
             except Exception as e:
@@ -183,6 +363,20 @@ class ws_interface:
                 self.agent = None
                 self.plugin = None
 
+            # Start the single reader that routes replies to waiting requests.
+            # A new session may be with a controller that does not echo IDs.
+            self._echoes_ids = False
+            if self._unsolicited is None:
+                self._unsolicited = asyncio.Queue(maxsize=1000)
+            self._reader_task = asyncio.get_running_loop().create_task(self._reader())
+
+            self._connected = True
+            self._online.set()
+            if self._online_async is None:
+                self._online_async = asyncio.Event()
+            self._online_async.set()
+
+            self.metrics.observe('cresco_ws_connect_seconds', None, time.perf_counter() - start)
             logger.info("WebSocket connection established successfully")
             return True
         except asyncio.TimeoutError:
@@ -192,12 +386,48 @@ class ws_interface:
             logger.error(f"Connection error: {e}")
             return False
 
+    async def _peer_identity(self) -> Tuple[str, str, str]:
+        """Return (region, agent, plugin) from the server certificate of the open socket.
+
+        The certificate comes from the TLS session websockets already holds,
+        so no second handshake is made. Parsing runs in the default executor
+        and the result is cached per host until the server presents a
+        different certificate.
+        """
+        ssl_object = self.ws.transport.get_extra_info('ssl_object')
+        if ssl_object is None:
+            raise ValueError("Connection is not using TLS")
+        der = ssl_object.getpeercert(binary_form=True)
+        if not der:
+            raise ValueError("Server presented no certificate")
+
+        host = self.url.split('/')[2]
+        cached = _identity_cache.get(host)
+        if cached is not None and cached[0] == der:
+            return cached[1]
+
+        identity = await asyncio.get_running_loop().run_in_executor(None, _parse_identity, der)
+        _identity_cache[host] = (der, identity)
+        return identity
+
     def connected(self):
         """Check if connected to the WebSocket server."""
         return self._connected and self.ws is not None and not self._shutdown_flag
 
     async def close_async(self):
         """Close the WebSocket connection asynchronously."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        elif self._outbound:
+            self._fail_outbound([], ConnectionError("WebSocket is shutting down"))
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._reader_task:
+            self._reader_task.cancel()
+            self._reader_task = None
+        self._fail_pending(ConnectionError("WebSocket is shutting down"))
+
         if self.ws:
             try:
                 # Use a timeout to avoid hanging
@@ -210,9 +440,25 @@ class ws_interface:
             finally:
                 self.ws = None
                 self._connected = False
+                self._online.clear()
+
+    async def aclose(self):
+        """Close a connection opened with ``open`` on the running event loop."""
+        # Give queued fire-and-forget messages a short chance to go out
+        if self._flush_scheduled and self.connected():
+            try:
+                await asyncio.wait_for(self._drain_outbound(), timeout=2.0)
+            except asyncio.TimeoutError:
+                logger.warning(f"Closing with {len(self._outbound)} queued messages unsent")
+        self._shutdown_flag = True
+        await self.close_async()
 
     def close(self):
         """Close the WebSocket connection and clean up resources."""
+        # Give queued fire-and-forget messages a short chance to go out
+        if self._flush_scheduled and self.connected() and not self.flush(timeout=2.0):
+            logger.warning(f"Closing with {len(self._outbound)} queued messages unsent")
+
         # Set the shutdown flag to prevent new operations
         self._shutdown_flag = True
         self._connected = False
@@ -278,94 +524,646 @@ class ws_interface:
         except Exception as e:
             logger.error(f"Error in task cleanup: {e}")
 
-    def send_direct(self, json_message, timeout=8.0):
+    def next_request_id(self) -> str:
+        """Allocate a correlation ID for an outgoing request.
+
+        Returns:
+            Request ID unique for the lifetime of this interface
+        """
+        return str(next(self._request_ids))
+
+    def send_direct(self, json_message, timeout=8.0, request_id: Optional[str] = None):
         """Send a message and receive response synchronously.
 
+        Many callers may have requests outstanding at once; each waits only on
+        its own reply.
+
         Args:
             json_message: JSON message as string
             timeout: Timeout in seconds
+            request_id: Correlation ID carried in the message, if any
 
         Returns:
             Response text
         """
+        response_text, _ = self.exchange(json_message, timeout, request_id)
+        return response_text
+
+    def send_request(self, json_message, timeout=8.0, request_id: Optional[str] = None):
+        """Send a message and return the already parsed JSON reply.
+
+        The reader task parses each reply once to route it, so callers that
+        want the decoded object can skip a second parse.
+
+        Args:
+            json_message: JSON message as string
+            timeout: Timeout in seconds
+            request_id: Correlation ID carried in the message, if any
+
+        Returns:
+            Parsed response
+
+        Raises:
+            ValueError: If the reply is not valid JSON
+        """
+        response_text, parsed = self.exchange(json_message, timeout, request_id)
+        if parsed is None:
+            raise ValueError(f"Invalid JSON response: {response_text[:200]}")
+        return parsed
+
+    def send_oneway(self, json_message, timeout=8.0, lane: str = 'normal'):
+        """Send a message that expects no reply, blocking until it is written.
+
+        Args:
+            json_message: JSON message as string
+            timeout: Timeout in seconds
+            lane: Write priority, one of ``LANES``
+        """
+        loop = self._check_ready()
+        future = asyncio.run_coroutine_threadsafe(self.send_async(json_message, lane), loop)
+
+        self._track(1, len(json_message))
+        try:
+            future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Send timed out after {timeout} seconds")
+        finally:
+            self._track(-1, -len(json_message))
+
+    def send_nowait(self, json_message, lane: str = 'normal', done: Optional[Callable] = None, timeout=8.0):
+        """Queue a message that expects no reply and return without waiting for the write.
+
+        Queued messages are written in order by the event loop, several per
+        turn at the socket. Only a full queue makes the caller wait.
+
+        Args:
+            json_message: JSON message as string
+            lane: Write priority, one of ``LANES``
+            done: Called on the event loop thread once the message is written,
+                with None, or with the exception the write failed with
+            timeout: Longest wait in seconds for room in a full queue
+
+        Raises:
+            ConnectionError: If the interface is shut down or not connected
+            TimeoutError: If the queue stayed full for ``timeout`` seconds
+        """
+        if self._shutdown_flag:
+            raise ConnectionError("WebSocket is shutting down")
+        # A message queued during a reconnect is written once it completes
+        if not (self.connected() or self.reconnecting()):
+            raise ConnectionError("WebSocket not connected")
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            raise RuntimeError("Event loop is closed or not initialized")
+
+        with self._outbound_room:
+            if not self._outbound_room.wait_for(lambda: len(self._outbound) < self.max_outbound, timeout):
+                raise TimeoutError(f"Outbound queue stayed full for {timeout} seconds")
+            self._outbound.append((json_message, lane, done))
+            start = not self._flush_scheduled
+            self._flush_scheduled = True
+        self._track(1, len(json_message))
+
+        if start:
+            loop.call_soon_threadsafe(self._start_flush)
+
+    def flush(self, timeout: float = 8.0) -> bool:
+        """Block until every message queued by ``send_nowait`` has been written.
+
+        Args:
+            timeout: Timeout in seconds
+
+        Returns:
+            True if the queue was drained in time
+        """
+        if not self._loop or self._loop.is_closed():
+            return not self._outbound
+        future = asyncio.run_coroutine_threadsafe(self._drain_outbound(), self._loop)
+        try:
+            future.result(timeout)
+            return True
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            return False
+
+    def outbound(self) -> int:
+        """Number of messages queued by ``send_nowait`` and not yet written."""
+        return len(self._outbound)
+
+    def _start_flush(self):
+        self._flush_task = asyncio.get_running_loop().create_task(self._flush_outbound())
+
+    async def _drain_outbound(self):
+        """Wait until the outbound queue is empty and nothing is being flushed."""
+        while self._flush_scheduled:
+            task = self._flush_task
+            if task is not None and not task.done():
+                await asyncio.shield(task)
+            else:
+                await asyncio.sleep(0)  # The flush task has not been started yet
+
+    async def _flush_outbound(self):
+        """Write queued fire-and-forget messages until the queue is empty."""
+        batch: List[Tuple[str, str, Optional[Callable]]] = []
+        try:
+            while True:
+                with self._outbound_room:
+                    if not self._outbound:
+                        self._flush_scheduled = False
+                        return
+                    size = 0
+                    while self._outbound and len(batch) < FLUSH_MESSAGES:
+                        message_size = len(self._outbound[0][0])
+                        if batch and size + message_size > FLUSH_BYTES:
+                            break
+                        batch.append(self._outbound.popleft())
+                        size += message_size
+                    queued = len(self._outbound)
+                    self._outbound_room.notify_all()
+                self.metrics.set('cresco_ws_outbound_queued', None, queued)
+
+                results = await self._write_batch(batch)
+                for (json_message, _, done), error in zip(batch, results):
+                    self._track(-1, -len(json_message))
+                    if error is not None:
+                        self.metrics.inc('cresco_ws_outbound_errors_total')
+                        logger.error(f"Queued message not delivered: {error}")
+                    if done is not None:
+                        try:
+                            done(error)
+                        except Exception as e:
+                            logger.error(f"Error in delivery callback: {e}")
+                batch = []
+        except BaseException as e:
+            # Cancelled on shutdown: nothing left in the queue will be written
+            error = ConnectionError("WebSocket is shutting down") if isinstance(e, asyncio.CancelledError) else e
+            self._fail_outbound(batch, error)
+            raise
+
+    async def _write_batch(self, batch: List[Tuple[str, str, Optional[Callable]]]) -> List[Optional[Exception]]:
+        """Write queued messages in one turn at the socket.
+
+        Returns:
+            Exception per message, or None for each one written
+        """
+        if not self.connected() and self.reconnecting() and self._online_async is not None:
+            try:
+                await asyncio.wait_for(self._online_async.wait(), timeout=self.reconnect_wait)
+            except asyncio.TimeoutError:
+                pass
+        if not self.connected():
+            return [ConnectionError("WebSocket not connected")] * len(batch)
+
+        # The batch goes at the priority of its most urgent message
+        lane = min((item[1] for item in batch), key=LANES.index)
+        waited = await self.lanes.acquire(lane)
+        results: List[Optional[Exception]] = []
+        try:
+            for json_message, _, _ in batch:
+                try:
+                    if self.recorder is not None:
+                        self.recorder.sent(self._channel, json_message)
+                    await self.ws.send(json_message)
+                    self.metrics.observe('cresco_ws_sent_bytes', None, len(json_message), SIZE_BUCKETS)
+                    results.append(None)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    results.append(e)
+        finally:
+            self.lanes.release()
+        self.metrics.observe('cresco_ws_lane_wait_seconds', {'lane': lane}, waited)
+        return results
+
+    def _fail_outbound(self, batch: List[Tuple[str, str, Optional[Callable]]], error: BaseException):
+        """Report a taken batch and everything still queued as not delivered."""
+        with self._outbound_room:
+            batch = batch + list(self._outbound)
+            self._outbound.clear()
+            self._flush_scheduled = False
+            self._outbound_room.notify_all()
+        for json_message, _, done in batch:
+            self._track(-1, -len(json_message))
+            self.metrics.inc('cresco_ws_outbound_errors_total')
+            if done is not None:
+                try:
+                    done(error)
+                except Exception as e:
+                    logger.error(f"Error in delivery callback: {e}")
+
+    def in_flight(self) -> int:
+        """Number of requests submitted from caller threads and not yet finished."""
+        return self._in_flight
+
+    def in_flight_bytes(self) -> int:
+        """Total size of the messages counted by ``in_flight``."""
+        return self._in_flight_bytes
+
+    def _track(self, requests: int, size: int):
+        """Adjust the in-flight counters."""
+        with self._lock:
+            self._in_flight += requests
+            self._in_flight_bytes += size
+
+    def _check_ready(self):
+        """Return the event loop if the interface can accept a new request."""
         if self._shutdown_flag:
             logger.error("Cannot send message during shutdown")
             raise ConnectionError("WebSocket is shutting down")
 
         if not self.connected():
-            logger.error("WebSocket not connected")
-            raise ConnectionError("WebSocket not connected")
+            # Give a reconnect in progress a bounded chance to finish
+            if not (self.reconnecting() and self._online.wait(self.reconnect_wait) and self.connected()):
+                logger.error("WebSocket not connected")
+                raise ConnectionError("WebSocket not connected")
 
-        # Safe access to the event loop
+        # Only hold the lock while checking the loop, never while waiting
         with self._lock:
             if not self._loop or self._loop.is_closed():
                 logger.error("Event loop is closed or not initialized")
                 raise RuntimeError("Event loop is closed or not initialized")
+            return self._loop
 
-            # Create a future in the SAME thread as the event loop
-            future = asyncio.run_coroutine_threadsafe(
-                self._send_receive(json_message, timeout),
-                self._loop
-            )
+    def exchange(self, json_message, timeout=8.0, request_id: Optional[str] = None,
+                 lane: str = 'normal') -> Tuple[str, Any]:
+        """Send a message and block until its reply arrives.
 
-            try:
-                logger.info(f"Sending message directly")
-                return future.result(timeout + 1.0)  # Add 1 sec buffer for future overhead
-            except asyncio.TimeoutError:
-                logger.error(f"Timeout waiting for response after {timeout} seconds")
-                future.cancel()  # Cancel the operation to avoid hanging coroutines
-                raise TimeoutError(f"Operation timed out after {timeout} seconds")
-            except Exception as e:
-                logger.error(f"Error sending message: {e}")
-                raise
+        Args:
+            json_message: JSON message as string
+            timeout: Timeout in seconds
+            request_id: Correlation ID carried in the message, if any
+            lane: Write priority, one of ``LANES``
 
-    async def _send_receive(self, json_message, timeout):
-        """Send a message and receive a response as a coroutine with timeout.
+        Returns:
+            Tuple of (response text, parsed response or None if it is not JSON)
+        """
+        loop = self._check_ready()
+        future = asyncio.run_coroutine_threadsafe(
+            self._send_receive(json_message, timeout, request_id, lane),
+            loop
+        )
+
+        self._track(1, len(json_message))
+        try:
+            logger.debug(f"Sending request {request_id}")
+            return future.result(timeout + 1.0)  # Add 1 sec buffer for future overhead
+        except concurrent.futures.TimeoutError:
+            logger.error(f"Timeout waiting for response after {timeout} seconds")
+            future.cancel()  # Cancel the operation to avoid hanging coroutines
+            raise TimeoutError(f"Operation timed out after {timeout} seconds")
+        except Exception as e:
+            logger.error(f"Error sending message: {e}")
+            raise
+        finally:
+            self._track(-1, -len(json_message))
+
+    def send_batch(self, items: List[Tuple[str, Optional[str]]], timeout=30.0, lane: str = 'normal') -> List[Any]:
+        """Write many messages back-to-back and collect all of their replies.
+
+        Args:
+            items: List of (json_message, request_id) tuples; request_id is None
+                for messages that expect no reply
+            timeout: Timeout in seconds for the whole batch
+            lane: Write priority of every item, one of ``LANES``
+
+        Returns:
+            List aligned with ``items``. Each entry is a (response text, parsed
+            response) tuple, None for a message that expects no reply, or the
+            exception raised for that item
+        """
+        loop = self._check_ready()
+        future = asyncio.run_coroutine_threadsafe(self._send_batch(items, timeout, lane), loop)
+
+        size = sum(len(json_message) for json_message, _ in items)
+        self._track(len(items), size)
+        try:
+            return future.result(timeout + 1.0)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Batch timed out after {timeout} seconds")
+        finally:
+            self._track(-len(items), -size)
+
+    async def _send_batch(self, items: List[Tuple[str, Optional[str]]], timeout: float,
+                          lane: str = 'normal') -> List[Any]:
+        """Coroutine behind ``send_batch``; runs on the interface's event loop."""
+        if not self.ws:
+            raise ConnectionError("WebSocket not connected")
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        results: List[Any] = [None] * len(items)
+
+        if not self._echoes_ids:
+            # Replies can only be matched by order, so the items go one at a time
+            for index, (json_message, request_id) in enumerate(items):
+                remaining = max(deadline - loop.time(), 0)
+                try:
+                    if request_id is None:
+                        await asyncio.wait_for(self._write(json_message, lane), timeout=remaining)
+                    else:
+                        results[index] = await self._send_receive(json_message, remaining, request_id, lane)
+                except Exception as e:
+                    results[index] = e
+            return results
+
+        # Register every reply future before the first write so no reply is missed
+        futures = []
+        for _, request_id in items:
+            if request_id is None:
+                futures.append(None)
+            else:
+                future = loop.create_future()
+                self._pending[request_id] = future
+                futures.append(future)
+
+        try:
+            for index, (json_message, _) in enumerate(items):
+                try:
+                    await asyncio.wait_for(self._write(json_message, lane), timeout=max(deadline - loop.time(), 0))
+                except Exception as e:
+                    results[index] = e
+                    if futures[index] is not None:
+                        futures[index].cancel()
+
+            waiting = [future for future in futures if future is not None and not future.done()]
+            if waiting:
+                await asyncio.wait(waiting, timeout=max(deadline - loop.time(), 0))
+
+            for index, future in enumerate(futures):
+                if future is None or results[index] is not None:
+                    continue
+                if not future.done():
+                    results[index] = TimeoutError(f"No reply within {timeout} seconds")
+                elif future.exception() is not None:
+                    results[index] = future.exception()
+                else:
+                    results[index] = future.result()
+            return results
+        finally:
+            for (_, request_id), future in zip(items, futures):
+                if request_id is not None:
+                    self._pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.cancel()
+
+    async def request(self, json_message, timeout=8.0, request_id: Optional[str] = None):
+        """Send a message and await its parsed reply on the current event loop.
 
         Args:
             json_message: JSON message as string
             timeout: Timeout in seconds
+            request_id: Correlation ID carried in the message, if any
 
         Returns:
-            Response text
+            Parsed response
+
+        Raises:
+            ValueError: If the reply is not valid JSON
+        """
+        response_text, parsed = await self.exchange_async(json_message, timeout, request_id)
+        if parsed is None:
+            raise ValueError(f"Invalid JSON response: {response_text[:200]}")
+        return parsed
+
+    async def exchange_async(self, json_message, timeout=8.0, request_id: Optional[str] = None,
+                             lane: str = 'normal') -> Tuple[str, Any]:
+        """Send a message and await its reply on the current event loop.
+
+        Args:
+            json_message: JSON message as string
+            timeout: Timeout in seconds
+            request_id: Correlation ID carried in the message, if any
+            lane: Write priority, one of ``LANES``
+
+        Returns:
+            Tuple of (response text, parsed response or None if it is not JSON)
+        """
+        if self._shutdown_flag:
+            raise ConnectionError("WebSocket is shutting down")
+        if not self.connected():
+            # Give a reconnect in progress a bounded chance to finish
+            if self.reconnecting():
+                try:
+                    await asyncio.wait_for(self._online_async.wait(), timeout=self.reconnect_wait)
+                except asyncio.TimeoutError:
+                    pass
+            if not self.connected():
+                raise ConnectionError("WebSocket not connected")
+
+        return await self._send_receive(json_message, timeout, request_id, lane)
+
+    async def _send_receive(self, json_message, timeout, request_id: Optional[str] = None, lane: str = 'normal'):
+        """Send a message and wait for the reply routed to it by the reader.
+
+        Args:
+            json_message: JSON message as string
+            timeout: Timeout in seconds
+            request_id: Correlation ID carried in the message, if any
+            lane: Write priority, one of ``LANES``
+
+        Returns:
+            Tuple of (response text, parsed response or None)
         """
         if not self.ws:
             raise ConnectionError("WebSocket not connected")
 
+        if request_id is None:
+            request_id = self.next_request_id()
+
+        loop = asyncio.get_running_loop()
+        serial = None
+        if not self._echoes_ids:
+            # Replies without an ID can only be matched by order, which breaks
+            # as soon as two are in flight and one of them is answered late
+            if self._serial is None:
+                self._serial = asyncio.Lock()
+            serial = self._serial
+            start = loop.time()
+            try:
+                await asyncio.wait_for(serial.acquire(), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.error(f"Operation timed out after {timeout} seconds waiting for an earlier request")
+                raise TimeoutError(f"Operation timed out after {timeout} seconds")
+            timeout = max(timeout - (loop.time() - start), 0)
+
+        future = loop.create_future()
+        self._pending[request_id] = future
         try:
             # Send with timeout
-            await asyncio.wait_for(self.ws.send(json_message), timeout=timeout / 2)
-            # Receive with timeout
-            return await asyncio.wait_for(self.ws.recv(), timeout=timeout)
+            await asyncio.wait_for(self._write(json_message, lane), timeout=timeout / 2)
+            # Wait for the reader to hand us our reply
+            return await asyncio.wait_for(future, timeout=timeout)
         except asyncio.TimeoutError:
             logger.error(f"Operation timed out after {timeout} seconds")
+            if not self._echoes_ids:
+                # The late reply would be taken for the answer to the next request
+                self._resync(f"no reply within {timeout} seconds and replies carry no request_id")
             raise TimeoutError(f"Operation timed out after {timeout} seconds")
         except Exception as e:
             logger.error(f"Error in WebSocket send/receive: {e}")
             raise
+        finally:
+            self._pending.pop(request_id, None)
+            if not future.done():
+                future.cancel()
+            elif not future.cancelled():
+                future.exception()  # The reader may have failed it after we stopped waiting
+            if serial is not None:
+                serial.release()
+
+    async def _reader(self):
+        """Read every inbound frame and resolve the request it answers.
+
+        Replies carrying a known ``request_id`` go to that request. Until the
+        server has been seen echoing IDs, replies without one are matched to
+        the oldest outstanding request, which is the ordering the controller
+        has always used on a single socket; ``_send_receive`` keeps a single
+        RPC in flight until then so there is only ever one candidate.
+        """
+        ws = self.ws
+        try:
+            async for message in ws:
+                self.metrics.observe('cresco_ws_received_bytes', None, len(message), SIZE_BUCKETS)
+                if self.recorder is not None:
+                    self.recorder.received(self._channel, message)
+                try:
+                    parsed = json_loads(message)
+                except (TypeError, ValueError):
+                    parsed = None
+
+                future = None
+                request_id = _reply_request_id(parsed)
+                if request_id is not None:
+                    self._echoes_ids = True
+                    future = self._pending.pop(request_id, None)
+                elif not self._echoes_ids and self._pending:
+                    _, future = self._pending.popitem(last=False)
+
+                if future is None:
+                    logger.debug("Received reply with no waiting request")
+                    if self._unsolicited.full():
+                        self._unsolicited.get_nowait()
+                    self._unsolicited.put_nowait(message)
+                elif not future.done():
+                    future.set_result((message, parsed))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if not self._shutdown_flag:
+                logger.error(f"WebSocket reader stopped: {e}")
+        finally:
+            lost = self.ws is ws and not self._shutdown_flag
+            if lost:
+                self._connected = False
+                self._online.clear()
+                if self._online_async is not None:
+                    self._online_async.clear()
+            # Requests already on the wire may or may not have been processed,
+            # so they are failed rather than replayed. Once a newer session has
+            # replaced this one, the pending requests are its own.
+            if self.ws is ws or self.ws is None:
+                self._fail_pending(ConnectionError("WebSocket connection closed"))
+            if lost and self.reconnect:
+                self._start_reconnect()
+
+    def _resync(self, reason: str):
+        """Drop a session whose replies can no longer be matched to requests.
+
+        The session is handled like one the server closed: outstanding
+        requests fail and, if enabled, a background reconnect starts.
+
+        Args:
+            reason: Why the session is dropped, for the log
+        """
+        ws = self.ws
+        if ws is None or self._shutdown_flag:
+            return
+        logger.warning(f"Dropping connection to {self.url}: {reason}")
+        self.metrics.inc('cresco_ws_desyncs_total')
+        self._connected = False
+        self._online.clear()
+        if self._online_async is not None:
+            self._online_async.clear()
+        self._fail_pending(ConnectionError("WebSocket connection dropped"))
+        if self.reconnect:
+            self._start_reconnect()
+        # No close handshake: it would wait behind the reply we gave up on
+        ws.transport.abort()
+
+    def reconnecting(self) -> bool:
+        """Check if a background reconnect is in progress."""
+        task = self._reconnect_task
+        return task is not None and not task.done()
+
+    def _start_reconnect(self):
+        """Start the background reconnect task unless one is already running."""
+        if not self.reconnecting():
+            self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect_loop())
+
+    async def _reconnect_loop(self):
+        """Reconnect with jittered exponential backoff until connected or shut down."""
+        attempt = 0
+        while not self._shutdown_flag:
+            # Full jitter keeps a fleet of clients from reconnecting in lockstep
+            delay = random.uniform(0, min(self.max_reconnect_delay, 0.5 * 2 ** attempt))
+            attempt += 1
+            logger.warning(f"WebSocket connection lost, reconnecting in {delay:.2f}s (attempt {attempt})")
+            await asyncio.sleep(delay)
+
+            if self._shutdown_flag:
+                break
+            if await self.connect_async():
+                self.metrics.inc('cresco_ws_reconnects_total')
+                logger.info(f"Reconnected to {self.url} after {attempt} attempt(s)")
+                return
+
+    def _fail_pending(self, exc: Exception):
+        """Fail every outstanding request with the given exception."""
+        while self._pending:
+            _, future = self._pending.popitem(last=False)
+            if not future.done():
+                future.set_exception(exc)
+
+    async def _write(self, message, lane: str = 'normal'):
+        """Write one frame once the write scheduler gives this lane its turn."""
+        waited = await self.lanes.acquire(lane)
+        try:
+            if self.recorder is not None:
+                # Recorded before the write so a fast reply cannot be logged ahead of it
+                self.recorder.sent(self._channel, message)
+            await self.ws.send(message)
+        finally:
+            self.lanes.release()
+        self.metrics.observe('cresco_ws_lane_wait_seconds', {'lane': lane}, waited)
+        self.metrics.observe('cresco_ws_sent_bytes', None, len(message), SIZE_BUCKETS)
 
     # Legacy methods for backward compatibility
-    async def send_async(self, message):
+    async def send_async(self, message, lane: str = 'normal'):
         """Legacy async send method."""
         if not self.ws:
             logger.error("WebSocket not connected")
             raise ConnectionError("WebSocket not connected")
 
-        await self.ws.send(message)
+        await self._write(message, lane)
         return True
 
     async def recv_async(self):
-        """Legacy async receive method."""
+        """Legacy async receive method.
+
+        Returns the next reply that was not claimed by an outstanding request.
+        """
         if not self.ws:
             logger.error("WebSocket not connected")
             raise ConnectionError("WebSocket not connected")
 
-        return await self.ws.recv()
+        return await self._unsolicited.get()
 
-    async def send(self, message):
+    async def send(self, message, timeout=8.0):
         """Legacy send method that returns response."""
-        await self.send_async(message)
-        return await self.recv_async()
+        response_text, _ = await self._send_receive(message, timeout)
+        return response_text
 
     async def recv(self):
         """Legacy receive method."""
@@ -381,4 +1179,213 @@ class ws_interface:
 
     def get_plugin(self):
         """Get the plugin from connection information."""
-        return self.plugin
\ No newline at end of file
+        return self.plugin
+
+
+class ws_pool:
+    """Pool of apisocket connections that spreads requests across them.
+
+    Exposes the same calls ``messaging_sync`` uses on a single
+    ``ws_interface``. Each request goes to the connection with the fewest
+    requests in flight. Bulk-lane messages and messages of ``bulk_threshold``
+    bytes or more (such as plugin uploads carrying ``jardata``) are kept on a
+    dedicated set of bulk connections so they never sit in front of small
+    status queries; control-lane messages never use those connections.
+    """
+
+    def __init__(self, size: int = 2, bulk_connections: int = 1, bulk_threshold: int = 256 * 1024,
+                 metrics=None, recorder: Optional['traffic_recorder'] = None,
+                 settings: Optional[ws_settings] = None):
+        """Initialize the pool.
+
+        Args:
+            size: Number of apisocket connections
+            bulk_connections: How many of those are reserved for large messages
+                (ignored when the pool has a single connection)
+            bulk_threshold: Message size in bytes at which a message is bulk
+            metrics: MetricsRegistry shared by every member (default: the shared registry)
+            recorder: Optional ``traffic_recorder`` shared by every member
+            settings: Message size, buffering and compression options for every member
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self.members = [ws_interface(metrics=metrics, recorder=recorder, settings=settings) for _ in range(size)]
+        self.bulk_threshold = bulk_threshold
+        bulk_connections = min(max(bulk_connections, 0), size - 1)
+        self._small = self.members[:size - bulk_connections]
+        self._bulk = self.members[size - bulk_connections:] or self._small
+        self._request_ids = itertools.count(1)
+        # Member -> [requests, bytes] dispatched to it and not yet finished. Counted
+        # here rather than by the member, so concurrent callers see each other's picks.
+        self._load: Dict[ws_interface, List[int]] = {member: [0, 0] for member in self.members}
+        self._lock = threading.Lock()
+
+    def connect(self, url, service_key, verify_ssl=True):
+        """Open every connection in the pool in parallel.
+
+        Args:
+            url: WebSocket URL
+            service_key: Service key for authentication
+            verify_ssl: Whether to verify SSL certificates
+
+        Returns:
+            True if at least one connection was established
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(self.members)) as executor:
+            results = list(executor.map(lambda member: member.connect(url, service_key, verify_ssl), self.members))
+
+        logger.info(f"Connected {sum(results)} of {len(self.members)} pooled connections")
+        return any(results)
+
+    def connected(self):
+        """Check if any connection in the pool is usable."""
+        return any(member.connected() for member in self.members)
+
+    def reconnecting(self):
+        """Check if any connection in the pool is reconnecting."""
+        return any(member.reconnecting() for member in self.members)
+
+    def close(self):
+        """Close every connection in the pool."""
+        for member in self.members:
+            try:
+                member.close()
+            except Exception as e:
+                logger.error(f"Error closing pooled connection: {e}")
+
+    def next_request_id(self) -> str:
+        """Allocate a correlation ID unique across the whole pool."""
+        return str(next(self._request_ids))
+
+    def select(self, size: int, lane: str = 'normal', ordered: bool = False) -> ws_interface:
+        """Pick the least busy connected member for a message of ``size`` bytes.
+
+        Busy means requests the pool has dispatched to the member and not
+        seen finish; callers that use a member directly are not counted.
+
+        Args:
+            size: Message size in bytes
+            lane: Write priority of the message, one of ``LANES``
+            ordered: Pick the first usable member instead of the least busy,
+                so successive messages keep their order
+
+        Returns:
+            Connection to use
+        """
+        bulk = lane == 'bulk' or (lane != 'control' and size >= self.bulk_threshold)
+        members = self._bulk if bulk else self._small
+        candidates = [member for member in members if member.connected()]
+        if not candidates:
+            # Preferred lane is down, use whatever is still connected
+            candidates = [member for member in self.members if member.connected()]
+        if not candidates:
+            # Nothing is up; a member that is reconnecting will wait for itself
+            candidates = [member for member in self.members if member.reconnecting()]
+        if not candidates:
+            raise ConnectionError("No pooled WebSocket connection available")
+        if ordered:
+            return candidates[0]
+        return min(candidates, key=lambda member: self._load[member])
+
+    def _dispatch(self, size: int, lane: str, call: Callable[[ws_interface], Any], requests: int = 1) -> Any:
+        """Run ``call`` on the least busy member, counting it as busy until the call returns."""
+        with self._lock:
+            member = self.select(size, lane)
+            load = self._load[member]
+            load[0] += requests
+            load[1] += size
+        try:
+            return call(member)
+        finally:
+            with self._lock:
+                load[0] -= requests
+                load[1] -= size
+
+    def send_direct(self, json_message, timeout=8.0, request_id: Optional[str] = None):
+        """Send a message on the least busy connection and return the reply text."""
+        return self._dispatch(len(json_message), 'normal',
+                              lambda member: member.send_direct(json_message, timeout, request_id))
+
+    def send_request(self, json_message, timeout=8.0, request_id: Optional[str] = None):
+        """Send a message on the least busy connection and return the parsed reply."""
+        return self._dispatch(len(json_message), 'normal',
+                              lambda member: member.send_request(json_message, timeout, request_id))
+
+    def exchange(self, json_message, timeout=8.0, request_id: Optional[str] = None,
+                 lane: str = 'normal') -> Tuple[str, Any]:
+        """Send a message on the least busy connection and return (text, parsed) of the reply."""
+        return self._dispatch(len(json_message), lane,
+                              lambda member: member.exchange(json_message, timeout, request_id, lane))
+
+    def send_oneway(self, json_message, timeout=8.0, lane: str = 'normal'):
+        """Send a message that expects no reply on the least busy connection."""
+        return self._dispatch(len(json_message), lane,
+                              lambda member: member.send_oneway(json_message, timeout, lane))
+
+    def send_nowait(self, json_message, lane: str = 'normal', done: Optional[Callable] = None, timeout=8.0):
+        """Queue a message that expects no reply.
+
+        Queued messages of the same size class share one connection while it
+        is up, so they are written in the order they were queued.
+        """
+        return self.select(len(json_message), lane, ordered=True).send_nowait(json_message, lane, done, timeout)
+
+    def flush(self, timeout: float = 8.0) -> bool:
+        """Block until every connection has written its queued messages."""
+        deadline = time.monotonic() + timeout
+        return all([member.flush(max(deadline - time.monotonic(), 0)) for member in self.members])
+
+    def outbound(self) -> int:
+        """Number of queued messages not yet written across the pool."""
+        return sum(member.outbound() for member in self.members)
+
+    def send_batch(self, items: List[Tuple[str, Optional[str]]], timeout=30.0, lane: str = 'normal') -> List[Any]:
+        """Send a whole batch on the least busy connection for its total size."""
+        size = sum(len(json_message) for json_message, _ in items)
+        return self._dispatch(size, lane, lambda member: member.send_batch(items, timeout, lane), len(items))
+
+    def in_flight(self) -> int:
+        """Number of requests in flight across the pool."""
+        return sum(member.in_flight() for member in self.members)
+
+    def get_region(self):
+        """Get the region from connection information."""
+        return self.members[0].get_region()
+
+    def get_agent(self):
+        """Get the agent from connection information."""
+        return self.members[0].get_agent()
+
+    def get_plugin(self):
+        """Get the plugin from connection information."""
+        return self.members[0].get_plugin()
+
+
+# host:port -> (DER certificate, (region, agent, plugin)), shared by all interfaces
+_identity_cache: Dict[str, Tuple[bytes, Tuple[str, str, str]]] = {}
+
+
+def _parse_identity(der: bytes) -> Tuple[str, str, str]:
+    """Split a certificate common name of the form region_agent_plugin."""
+    # cryptography is slow to import and only needed once a session is open
+    from cryptography import x509
+    from cryptography.x509.oid import NameOID
+
+    cert = x509.load_der_x509_certificate(der)
+    names = cert.subject.get_attributes_for_oid(NameOID.COMMON_NAME)
+    common_name = names[0].value if names else cert.subject.rfc4514_string().replace('CN=', '')
+    region, agent, plugin = common_name.split('_')[:3]
+    return region, agent, plugin
+
+
+def _reply_request_id(reply: Any) -> Optional[str]:
+    """Return the correlation ID echoed in a reply, if the controller sent one."""
+    if not isinstance(reply, dict):
+        return None
+    request_id = reply.get('request_id')
+    if request_id is None:
+        info = reply.get('message_info')
+        if isinstance(info, dict):
+            request_id = info.get('request_id')
+    return None if request_id is None else str(request_id)
@@ -0,0 +1,166 @@
+"""
+Websocket link settings: message size limits, buffering and compression.
+
+``websockets.connect`` defaults to a 1 MiB incoming message limit, which a
+large ``agentslist`` reply or ``jardata`` echo runs into, and deflates every
+message, including ``jardata`` and other fields that are already gzip+base64.
+``ws_settings`` holds the values used for the apisocket, dataplane and
+logstreamer connections, with presets for common cases. Compression can
+stop above a message size, so small JSON messages are still deflated while
+large, already compressed ones go out as they are.
+"""
+import logging
+from typing import Any, Dict, Optional
+
+from websockets.extensions.permessage_deflate import ClientPerMessageDeflateFactory, PerMessageDeflate
+from websockets.frames import CONT, CTRL_OPCODES, Frame
+
+from .metrics import RATIO_BUCKETS, SIZE_BUCKETS
+from .metrics import registry as default_registry
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+PRESETS: Dict[str, Dict[str, Any]] = {
+    # What websockets.connect does when nothing is passed
+    'default': {'compression': True, 'compress_limit': None, 'max_size': 2 ** 20, 'max_queue': 16,
+                'write_limit': 2 ** 15},
+    # Large messages allowed; only messages below 64 KiB are deflated
+    'throughput': {'compression': True, 'compress_limit': 64 * 1024, 'max_size': 256 * 2 ** 20, 'max_queue': 64,
+                   'write_limit': 2 ** 20},
+    # As 'throughput' without deflate, for fast links where CPU is the limit
+    'uncompressed': {'compression': False, 'compress_limit': None, 'max_size': 256 * 2 ** 20, 'max_queue': 64,
+                     'write_limit': 2 ** 20},
+}
+
+
+class ws_settings:
+    """Connection options passed to ``websockets.connect``."""
+
+    def __init__(self, compression: bool = True, compress_limit: Optional[int] = 64 * 1024,
+                 compression_level: Optional[int] = None, max_size: Optional[int] = 256 * 2 ** 20,
+                 max_queue: Optional[int] = 64, write_limit: int = 2 ** 20):
+        """Initialize the settings; the defaults are the 'throughput' preset.
+
+        Args:
+            compression: Offer permessage-deflate to the server
+            compress_limit: Send messages larger than this many bytes
+                uncompressed, or None to deflate every message
+            compression_level: zlib level for outgoing messages (default: zlib's)
+            max_size: Largest incoming message in bytes, or None for no limit
+            max_queue: Incoming frames buffered before reading from the socket pauses
+            write_limit: Outgoing bytes buffered before a send waits for the socket
+        """
+        self.compression = compression
+        self.compress_limit = compress_limit
+        self.compression_level = compression_level
+        self.max_size = max_size
+        self.max_queue = max_queue
+        self.write_limit = write_limit
+
+    @classmethod
+    def preset(cls, name: str, **overrides) -> 'ws_settings':
+        """Settings from a named preset.
+
+        Args:
+            name: One of ``PRESETS``
+            **overrides: Values replacing the preset's
+
+        Returns:
+            New ws_settings
+        """
+        if name not in PRESETS:
+            raise ValueError(f"Unknown websocket preset: {name}")
+        return cls(**{**PRESETS[name], **overrides})
+
+    def connect_kwargs(self, metrics=None, link: str = 'apisocket') -> Dict[str, Any]:
+        """Keyword arguments for ``websockets.connect``.
+
+        Args:
+            metrics: MetricsRegistry for compression metrics (default: the shared registry)
+            link: Label of the connection in those metrics
+
+        Returns:
+            Dict of connect arguments
+        """
+        kwargs: Dict[str, Any] = {
+            'max_size': self.max_size,
+            'max_queue': self.max_queue,
+            'write_limit': self.write_limit,
+            # Deflate, when wanted, is negotiated through our own extension
+            'compression': None,
+        }
+        if self.compression:
+            kwargs['extensions'] = [_deflate_factory(self, metrics if metrics is not None else default_registry, link)]
+        return kwargs
+
+    def __repr__(self):
+        return (f"ws_settings(compression={self.compression}, compress_limit={self.compress_limit}, "
+                f"max_size={self.max_size}, max_queue={self.max_queue}, write_limit={self.write_limit})")
+
+
+class _selective_deflate(PerMessageDeflate):
+    """permessage-deflate that sends large messages uncompressed and reports ratios.
+
+    RFC 7692 lets either side leave any message uncompressed (RSV1 unset),
+    so the server needs no support for this beyond the extension itself.
+    """
+
+    def __init__(self, negotiated: PerMessageDeflate, compress_limit: Optional[int], metrics, link: str):
+        super().__init__(negotiated.remote_no_context_takeover, negotiated.local_no_context_takeover,
+                         negotiated.remote_max_window_bits, negotiated.local_max_window_bits,
+                         negotiated.compress_settings)
+        self.compress_limit = compress_limit
+        self.metrics = metrics
+        self.link = link
+        self._skipping = False  # Current outgoing message is sent uncompressed
+
+    def encode(self, frame: Frame) -> Frame:
+        if frame.opcode in CTRL_OPCODES:
+            return frame
+        if frame.opcode is not CONT:
+            self._skipping = self.compress_limit is not None and len(frame.data) > self.compress_limit
+            if self._skipping:
+                self.metrics.inc('cresco_ws_deflate_skipped_total', {'link': self.link})
+        if self._skipping:
+            return frame
+
+        encoded = super().encode(frame)
+        self._observe('sent', len(encoded.data), len(frame.data))
+        return encoded
+
+    def decode(self, frame: Frame, *, max_size: Optional[int] = None) -> Frame:
+        compressed = frame.opcode not in CTRL_OPCODES and (frame.rsv1 or (frame.opcode is CONT and self.decode_cont_data))
+        decoded = super().decode(frame, max_size=max_size)
+        if compressed:
+            self._observe('received', len(frame.data), len(decoded.data))
+        return decoded
+
+    def _observe(self, direction: str, wire: int, original: int):
+        labels = {'link': self.link, 'direction': direction}
+        self.metrics.observe('cresco_ws_wire_bytes', labels, wire, SIZE_BUCKETS)
+        if original:
+            self.metrics.observe('cresco_ws_compression_ratio', labels, wire / original, RATIO_BUCKETS)
+
+
+class _deflate_factory(ClientPerMessageDeflateFactory):
+    """Offers permessage-deflate and wraps the negotiated extension in ``_selective_deflate``."""
+
+    def __init__(self, settings: ws_settings, metrics, link: str):
+        compress_settings = {'memLevel': 5}
+        if settings.compression_level is not None:
+            compress_settings['level'] = settings.compression_level
+        super().__init__(compress_settings=compress_settings)
+        self.compress_limit = settings.compress_limit
+        self.metrics = metrics
+        self.link = link
+
+    def process_response_params(self, params, accepted_extensions):
+        negotiated = super().process_response_params(params, accepted_extensions)
+        logger.debug(f"Negotiated permessage-deflate on {self.link}: {negotiated!r}")
+        return _selective_deflate(negotiated, self.compress_limit, self.metrics, self.link)
+
+
+default_registry.describe('cresco_ws_wire_bytes', 'Size on the wire of deflated websocket frames, by link and direction')
+default_registry.describe('cresco_ws_compression_ratio', 'Deflated size / original size of websocket frames')
+default_registry.describe('cresco_ws_deflate_skipped_total', 'Messages sent uncompressed for exceeding compress_limit')
@@ -0,0 +1,101 @@
+"""
+Per-destination circuit breakers, against a stand-in with one slow agent.
+"""
+import asyncio
+import time
+
+import pytest
+
+from pycrescolib.breaker import OPEN, breaker_registry, circuit_open
+from pycrescolib.clientlib import AsyncClientlib, clientlib
+from pycrescolib.metrics import MetricsRegistry
+from pycrescolib.standin import standin_server
+
+REGION = 'region-0'
+SLOW = 'agent-000000'
+HEALTHY = 'agent-000001'
+RESET = 0.5
+
+
+def agent_info(client, agent, timeout=8.0):
+    """Name of the agent a ``getagentinfo`` reply describes, or None."""
+    reply = client.messaging.global_agent_msgevent(True, 'CONFIG', {'action': 'getagentinfo'},
+                                                   REGION, agent, timeout=timeout)
+    return (reply or {}).get('agent-data', {}).get('name')
+
+
+@pytest.fixture
+def server():
+    with standin_server(port=0, agents=2, regions=1, agent_delays={SLOW: 2.0}) as server:
+        yield server
+
+
+@pytest.fixture
+def breakers():
+    return breaker_registry(failure_threshold=2, reset_timeout=RESET, metrics=MetricsRegistry())
+
+
+def test_timeouts_open_only_their_agents_breaker(server, breakers):
+    client = clientlib('localhost', server.port, 'any-key', circuit_breakers=breakers)
+    assert client.connect()
+    try:
+        assert agent_info(client, HEALTHY) == HEALTHY
+        assert agent_info(client, SLOW, timeout=0.2) is None
+        assert agent_info(client, SLOW, timeout=0.2) is None
+        assert breakers.states()[f'{REGION}/{SLOW}']['state'] == OPEN
+
+        # The open breaker answers at once without sending anything
+        sent = server.requests
+        start = time.perf_counter()
+        assert agent_info(client, SLOW, timeout=5.0) is None
+        assert time.perf_counter() - start < 0.1
+        assert server.requests == sent
+        rejected = breakers.metrics.snapshot()['counters']['cresco_circuit_rejected_total']
+        assert rejected == [{'labels': {'dst_region': REGION, 'dst_agent': SLOW}, 'value': 1}]
+
+        # Other agents on the same socket are unaffected
+        assert agent_info(client, HEALTHY) == HEALTHY
+
+        # Once the agent recovers, the half-open probe closes the breaker
+        server.agent_delays.clear()
+        time.sleep(RESET)
+        assert agent_info(client, SLOW) == SLOW
+        assert breakers.states() == {}
+        assert agent_info(client, SLOW) == SLOW
+    finally:
+        client.close()
+
+
+def test_failed_probe_reopens_the_breaker(server, breakers):
+    client = clientlib('localhost', server.port, 'any-key', circuit_breakers=breakers)
+    assert client.connect()
+    try:
+        for _ in range(2):
+            agent_info(client, SLOW, timeout=0.2)
+        time.sleep(RESET)
+        assert agent_info(client, SLOW, timeout=0.2) is None
+        assert breakers.states()[f'{REGION}/{SLOW}']['state'] == OPEN
+        assert breakers.states()[f'{REGION}/{SLOW}']['retry_in'] > 0
+    finally:
+        client.close()
+
+
+def test_async_open_breaker_raises(server, breakers):
+    async def main():
+        async with AsyncClientlib('localhost', server.port, 'any-key', circuit_breakers=breakers) as client:
+            for _ in range(2):
+                with pytest.raises(TimeoutError):
+                    await client.messaging.global_agent_msgevent(True, 'CONFIG', {'action': 'getagentinfo'},
+                                                                 REGION, SLOW, timeout=0.2)
+            start = time.perf_counter()
+            with pytest.raises(circuit_open):
+                await client.messaging.global_agent_msgevent(True, 'CONFIG', {'action': 'getagentinfo'},
+                                                             REGION, SLOW)
+            elapsed = time.perf_counter() - start
+            reply = await client.messaging.global_agent_msgevent(True, 'CONFIG', {'action': 'getagentinfo'},
+                                                                 REGION, HEALTHY)
+            return elapsed, reply['agent-data']['name']
+
+    elapsed, name = asyncio.run(main())
+    assert elapsed < 0.1
+    assert name == HEALTHY
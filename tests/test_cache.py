@@ -0,0 +1,106 @@
+"""
+Response cache: TTLs, scoped invalidation, and isolation between callers.
+"""
+import threading
+import time
+
+import pytest
+
+from pycrescolib.cache import _MISSING, response_cache
+from pycrescolib.clientlib import clientlib
+from pycrescolib.metrics import MetricsRegistry
+from pycrescolib.standin import standin_server
+
+
+@pytest.fixture
+def cache():
+    return response_cache(metrics=MetricsRegistry())
+
+
+def test_hits_are_copies(cache):
+    value = {'agents': [{'name': 'agent-000000', 'plugins': '3'}]}
+    cache.put('listagents', 'key', value)
+
+    # Changing the stored object or a returned one leaves the entry alone
+    value['agents'].clear()
+    first = cache.get('listagents', 'key')
+    first['agents'][0].pop('name')
+    second = cache.get('listagents', 'key')
+    assert second == {'agents': [{'name': 'agent-000000', 'plugins': '3'}]}
+    assert second is not first
+
+
+def test_expiry_and_disabled_actions(cache):
+    cache.ttls['listagents'] = -1
+    cache.put('listagents', 'key', [1])
+    assert cache.get('listagents', 'key') is _MISSING
+
+
+def test_invalidation_is_scoped(cache):
+    cache.put('getagentinfo', 'a', {'n': 1}, 'region-0', 'agent-a')
+    cache.put('getagentinfo', 'b', {'n': 2}, 'region-0', 'agent-b')
+    cache.put('getagentinfo', 'c', {'n': 3}, 'region-1', 'agent-c')
+    cache.put('listagents', 'all', [1])
+    assert cache.invalidate('region-0', 'agent-a') == 2  # Its own entry and the fleet-wide one
+    assert cache.get('getagentinfo', 'b') == {'n': 2}
+    assert cache.get('getagentinfo', 'c') == {'n': 3}
+
+
+def test_unpicklable_values_are_not_cached(cache):
+    cache.put('listagents', 'key', {'callback': lambda: None})
+    assert cache.get('listagents', 'key') is _MISSING
+
+
+def test_callers_cannot_corrupt_cached_results():
+    with standin_server(port=0, agents=3, regions=1) as server:
+        client = clientlib('localhost', server.port, 'any-key', cache=True, metrics=MetricsRegistry())
+        assert client.connect()
+        try:
+            agents = client.globalcontroller.get_agent_list()
+            names = [agent['name'] for agent in agents]
+            for agent in agents:
+                agent.pop('name')
+            agents.clear()
+
+            before = server.requests
+            assert [agent['name'] for agent in client.globalcontroller.get_agent_list()] == names
+            assert server.requests == before
+        finally:
+            client.close()
+
+
+def test_reads_overlapping_a_change_are_not_cached():
+    with standin_server(port=0, agents=3, regions=1, agent_delays={'agent-000001': 0.5}) as server:
+        client = clientlib('localhost', server.port, 'any-key', cache=True, metrics=MetricsRegistry())
+        assert client.connect()
+        try:
+            # Once the controller is seen to echo request IDs, RPCs overlap
+            assert client.api.get_global_region() is not None
+            sent = server.requests
+            results = []
+            reader = threading.Thread(
+                target=lambda: results.append(client.agents.get_agent_info('region-0', 'agent-000001')))
+            reader.start()
+            deadline = time.monotonic() + 5
+            while server.requests == sent and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            # The change is applied and invalidated while the read is still waiting
+            client.globalcontroller.remove_pipeline('pipeline-1')
+            reader.join()
+            assert results[0]['name'] == 'agent-000001'
+
+            before = server.requests
+            client.agents.get_agent_info('region-0', 'agent-000001')
+            assert server.requests == before + 1
+        finally:
+            client.close()
+
+
+def test_put_skips_values_read_before_an_invalidation(cache):
+    generation = cache.generation
+    cache.invalidate('region-0', 'agent-a')
+    cache.put('getagentinfo', 'a', {'n': 1}, 'region-0', 'agent-a', generation=generation)
+    assert cache.get('getagentinfo', 'a') is _MISSING
+    cache.put('getagentinfo', 'a', {'n': 1}, 'region-0', 'agent-a', generation=cache.generation)
+    assert cache.get('getagentinfo', 'a') == {'n': 1}
@@ -0,0 +1,85 @@
+"""
+Request coalescing in ``messaging_sync``: identical concurrent reads share
+one request, and nothing else is merged.
+"""
+import concurrent.futures
+import time
+
+import pytest
+
+from pycrescolib.clientlib import clientlib
+from pycrescolib.standin import standin_server
+
+REGION = 'region-0'
+AGENT = 'agent-000000'
+CALLERS = 4
+
+
+@pytest.fixture
+def server():
+    with standin_server(port=0, agents=2, regions=1, latency=0.3) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    client = clientlib('localhost', server.port, 'any-key')
+    assert client.connect()
+    yield client
+    client.close()
+
+
+def concurrently(call):
+    """Replies of CALLERS threads making ``call`` at once."""
+    with concurrent.futures.ThreadPoolExecutor(CALLERS) as pool:
+        return list(pool.map(lambda _: call(), range(CALLERS)))
+
+
+def test_identical_reads_share_one_request(server, client):
+    before = server.requests
+    replies = concurrently(lambda: client.messaging.global_agent_msgevent(
+        True, 'CONFIG', {'action': 'getagentinfo'}, REGION, AGENT))
+    assert server.requests - before == 1
+    assert all(reply['agent-data']['name'] == AGENT for reply in replies)
+
+    # Every caller can change its reply without the others seeing it
+    assert len({id(reply) for reply in replies}) == CALLERS
+    assert len({id(reply['agent-data']) for reply in replies}) == CALLERS
+    replies[0]['agent-data'].pop('name')
+    assert all(reply['agent-data']['name'] == AGENT for reply in replies[1:])
+
+
+@pytest.mark.parametrize('event_type, payload', [
+    ('EXEC', {'action': 'pluginmethod', 'value': 1}),
+    ('CONFIG', {'action': 'pluginadd', 'configparams': 'e30='}),
+], ids=['plugin-exec', 'write'])
+def test_other_actions_are_never_merged(server, client, event_type, payload):
+    before = server.requests
+    concurrently(lambda: client.messaging.global_plugin_msgevent(
+        True, event_type, dict(payload), REGION, AGENT, 'plugin/0'))
+    assert server.requests - before == CALLERS
+
+
+def test_coalescing_can_be_turned_off(server, client):
+    client.messaging.coalesce = False
+    before = server.requests
+    concurrently(lambda: client.messaging.global_agent_msgevent(
+        True, 'CONFIG', {'action': 'getagentinfo'}, REGION, AGENT))
+    assert server.requests - before == CALLERS
+
+
+def test_followers_wait_as_long_as_the_request_they_joined(server, client):
+    def read(timeout):
+        return client.messaging.global_agent_msgevent(True, 'CONFIG', {'action': 'getagentinfo'},
+                                                      REGION, AGENT, timeout=timeout)
+
+    before = server.requests
+    with concurrent.futures.ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(read, 8.0)
+        while server.requests == before:
+            time.sleep(0.01)
+        # Far shorter than the stand-in's latency
+        follower = pool.submit(read, 0.05)
+        assert follower.result()['agent-data']['name'] == AGENT
+        assert leader.result()['agent-data']['name'] == AGENT
+    assert server.requests - before == 1
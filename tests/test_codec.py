@@ -0,0 +1,136 @@
+"""
+gzip+base64 payload codec, checked against the ``base64`` + ``gzip`` calls
+the library used before the streaming codec.
+"""
+import base64
+import gzip
+import random
+
+import pytest
+
+from pycrescolib import utils
+from pycrescolib.utils import CODEC_CHUNK
+
+SIZES = [0, 1, 2, 3, 4, 255, 256, 257, CODEC_CHUNK - 1, CODEC_CHUNK, CODEC_CHUNK + 1,
+         3 * CODEC_CHUNK + 2, 3 * 2 ** 20 + 7]
+
+
+def payload(size: int) -> bytes:
+    """Text-like bytes of ``size`` that compress about as well as JSON replies."""
+    rng = random.Random(size)
+    words = [b'agent', b'region', b'plugin', b'"name":', b'true,', b'1700000000000', b'{', b'}']
+    data = b' '.join(rng.choice(words) for _ in range(size // 4 + 1))
+    return data[:size]
+
+
+def baseline_encode(data: bytes) -> str:
+    return base64.b64encode(gzip.compress(data)).decode()
+
+
+def baseline_decode(param: str) -> bytes:
+    return gzip.decompress(base64.b64decode(param))
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_round_trip_with_baseline(size):
+    data = payload(size)
+    assert baseline_decode(utils.compress_data(data)) == data
+    assert utils.decompress_param(baseline_encode(data)) == data.decode()
+    assert utils.decompress_param(utils.compress_param(data.decode())) == data.decode()
+
+
+@pytest.mark.parametrize('size', [1, 1000, CODEC_CHUNK + 5, 3 * 2 ** 20 + 7])
+@pytest.mark.parametrize('wrap', [
+    lambda text: text + '\n',
+    lambda text: text + '\r\n',
+    lambda text: '\n'.join(text[i:i + 76] for i in range(0, len(text), 76)) + '\n',
+    lambda text: '\r\n'.join(text[i:i + 64] for i in range(0, len(text), 64)),
+    lambda text: ' '.join(text[i:i + 5] for i in range(0, len(text), 5)),
+], ids=['newline', 'crlf', 'mime', 'pem', 'spaces'])
+def test_whitespace_is_skipped_like_baseline(size, wrap):
+    data = payload(size)
+    param = wrap(baseline_encode(data))
+    assert baseline_decode(param) == data
+    assert utils.decompress_param(param) == data.decode()
+    assert utils.decompress_param(param.encode()) == data.decode()
+
+
+def test_mime_base64_from_encodebytes():
+    data = payload(CODEC_CHUNK * 2)
+    param = base64.encodebytes(gzip.compress(data)).decode()
+    assert utils.decompress_param(param) == data.decode()
+
+
+@pytest.mark.parametrize('chunk_size', [4, 12, 100, 4096 + 3])
+def test_iter_decompress_chunk_sizes(chunk_size):
+    data = payload(20000)
+    param = baseline_encode(data)
+    wrapped = '\n'.join(param[i:i + 76] for i in range(0, len(param), 76))
+    for text in (param, wrapped):
+        assert b''.join(utils.iter_decompress(text, chunk_size)) == data
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 4096])
+def test_iter_compress_chunk_sizes(chunk_size):
+    data = payload(20000)
+    assert baseline_decode(''.join(utils.iter_compress(data, chunk_size=chunk_size))) == data
+    assert baseline_decode(''.join(utils.iter_compress(data.decode(), chunk_size=chunk_size))) == data
+
+
+def test_concatenated_members():
+    first, second = payload(1000), payload(CODEC_CHUNK)
+    param = base64.b64encode(gzip.compress(first) + gzip.compress(second)).decode()
+    assert utils.decompress_param(param) == (first + second).decode()
+
+
+def test_json_round_trip():
+    value = {'agents': [{'name': f'agent-{i:06d}', 'is_active': True} for i in range(5000)]}
+    param = utils.compress_param(utils.json_serialize(value))
+    assert utils.decompress_json(param) == value
+    assert utils.decompress_json(param + '\n') == value
+
+
+@pytest.mark.parametrize('param', [
+    baseline_encode(payload(1000))[:-1],  # Truncated base64
+    base64.b64encode(gzip.compress(payload(1000))[:-10]).decode(),  # Truncated gzip
+    base64.b64encode(b'not gzip at all').decode(),
+])
+def test_broken_payloads_raise(param):
+    with pytest.raises(Exception):
+        baseline_decode(param)
+    with pytest.raises(Exception):
+        utils.decompress_param(param)
+
+
+@pytest.fixture
+def restore_policy():
+    policy = utils.get_compression_policy()
+    yield
+    utils.set_compression_policy(policy)
+
+
+@pytest.mark.parametrize('name', list(utils.COMPRESSION_POLICIES))
+@pytest.mark.parametrize('size', [0, 255, 256, 2 ** 20 - 1, 2 ** 20])
+def test_every_policy_is_readable_by_baseline(name, size, restore_policy):
+    utils.set_compression_policy(name)
+    data = payload(size)
+    assert baseline_decode(utils.compress_data(data)) == data
+    assert baseline_decode(utils.compress_param(data.decode())) == data
+
+
+@pytest.mark.parametrize('level', range(10))
+def test_explicit_levels_are_readable_by_baseline(level):
+    data = payload(5000)
+    param = utils.compress_param(data.decode(), level=level)
+    assert baseline_decode(param) == data
+    assert utils.decompress_param(param) == data.decode()
+
+
+def test_policy_levels(restore_policy):
+    policy = utils.set_compression_policy('default')
+    assert policy.level_for(100) == 0
+    assert policy.level_for(1000) == 6
+    assert policy.level_for(2 ** 20) == 1
+    assert utils.set_compression_policy('legacy').level_for(0) == 9
+    with pytest.raises(ValueError):
+        utils.set_compression_policy('smallest')
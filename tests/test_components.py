@@ -0,0 +1,201 @@
+"""
+Component operations (agents, globalcontroller, admin, api) on the sync and
+asyncio clients, which share one implementation through ``operation``.
+"""
+import asyncio
+import threading
+import zipfile
+
+import pytest
+
+from pycrescolib import base_classes
+from pycrescolib.base_classes import CrescoMessageBase, operation
+from pycrescolib.clientlib import AsyncClientlib, clientlib
+from pycrescolib.standin import standin_server
+
+REGION = 'region-0'
+AGENT = 'agent-000000'
+
+
+@pytest.fixture(scope='module')
+def server():
+    with standin_server(port=0, agents=5, regions=1) as server:
+        yield server
+
+
+@pytest.fixture
+def jar(tmp_path):
+    path = tmp_path / 'plugin.jar'
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('META-INF/MANIFEST.MF', 'Bundle-SymbolicName: io.cresco.test\nBundle-Version: 1.0.0\n')
+        archive.writestr('data.bin', b'x' * 10000)
+    return str(path)
+
+
+def calls(client, jar):
+    """The same calls for either client; async ones return coroutines."""
+    return {
+        'active': client.agents.is_controller_active(REGION, AGENT),
+        'info': client.agents.get_agent_info(REGION, AGENT),
+        'plugins': client.agents.list_plugin_agent(REGION, AGENT),
+        'upload': client.agents.upload_plugin_agent(REGION, AGENT, jar),
+        'repo_pull': client.agents.repo_pull_plugin_agent(REGION, AGENT, jar),
+        'agents': client.globalcontroller.get_agent_list(REGION),
+        'regions': client.globalcontroller.get_region_list(),
+        'pipeline_status': client.globalcontroller.get_pipeline_status('no-such-pipeline'),
+        'global_upload': client.globalcontroller.upload_plugin_global(jar),
+        'global_region': client.api.get_global_region(),
+        'restart': client.admin.restartcontroller(REGION, AGENT),
+    }
+
+
+def check(results):
+    assert results['active'] is True
+    assert results['info']['name'] == AGENT
+    assert isinstance(results['plugins'], list)
+    assert results['upload']['status_code'] == '10'
+    assert 'status_code' in results['repo_pull']
+    assert [agent['name'] for agent in results['agents']] == [f'agent-{i:06d}' for i in range(5)]
+    assert results['regions']
+    assert isinstance(results['pipeline_status'], int)
+    assert results['global_upload']['status_code'] == '10'
+    assert results['global_region'] is not None
+    assert results['restart'] is None
+
+
+def test_sync_client(server, jar):
+    client = clientlib('localhost', server.port, 'any-key')
+    assert client.connect()
+    try:
+        check(calls(client, jar))
+    finally:
+        client.close()
+
+
+def test_async_client(server, jar):
+    async def main():
+        async with AsyncClientlib('localhost', server.port, 'any-key') as client:
+            pending = calls(client, jar)
+            assert all(asyncio.iscoroutine(call) for call in pending.values())
+            values = await asyncio.gather(*pending.values())
+            return dict(zip(pending, values))
+
+    check(asyncio.run(main()))
+
+
+def test_async_jar_reading_leaves_the_event_loop(server, jar, monkeypatch):
+    threads = []
+    read_jar = base_classes.read_jar
+
+    def recording_read_jar(path):
+        threads.append(threading.current_thread())
+        return read_jar(path)
+
+    monkeypatch.setattr(base_classes, 'read_jar', recording_read_jar)
+
+    async def main():
+        async with AsyncClientlib('localhost', server.port, 'any-key') as client:
+            await client.agents.upload_plugin_agent(REGION, AGENT, jar)
+            return threading.current_thread()
+
+    loop_thread = asyncio.run(main())
+    assert threads and threads[0] is not loop_thread
+
+
+def test_async_cache_hits(server):
+    async def main():
+        async with AsyncClientlib('localhost', server.port, 'any-key', cache=True) as client:
+            first = await client.globalcontroller.get_agent_list(REGION)
+            before = server.requests
+            second = await client.globalcontroller.get_agent_list(REGION)
+            return first, second, server.requests - before
+
+    first, second, sent = asyncio.run(main())
+    assert first == second and sent == 0
+
+
+class fake_messaging:
+    """Replies to ``send`` with ``reply``, raising it if it is an exception."""
+
+    def __init__(self, reply, asynchronous):
+        self.reply = reply
+        self.asynchronous = asynchronous
+
+    def send(self):
+        if not self.asynchronous:
+            return self._result()
+
+        async def send_async():
+            await asyncio.sleep(0)
+            return self._result()
+        return send_async()
+
+    def _result(self):
+        if isinstance(self.reply, Exception):
+            raise self.reply
+        return self.reply
+
+
+class component(CrescoMessageBase):
+
+    @operation("Error reading", default={})
+    def read(self):
+        reply = yield self.messaging.send()
+        return reply['value']
+
+    @operation("Error writing")
+    def write(self):
+        reply = yield self.messaging.send()
+        return reply
+
+    @operation()
+    def recovering(self):
+        try:
+            reply = yield self.messaging.send()
+        except TimeoutError:
+            return 'recovered'
+        return reply
+
+
+class component_async(component):
+    asynchronous = True
+
+
+def run(asynchronous, method, reply):
+    instance = (component_async if asynchronous else component)(fake_messaging(reply, asynchronous))
+    result = getattr(instance, method)()
+    return asyncio.run(result) if asynchronous else result
+
+
+@pytest.mark.parametrize('asynchronous', [False, True], ids=['sync', 'async'])
+def test_operation_driver(asynchronous):
+    assert run(asynchronous, 'read', {'value': 1}) == 1
+    assert run(asynchronous, 'read', TimeoutError()) == {}
+    assert run(asynchronous, 'read', {}) == {}  # KeyError in the body is handled the same way
+    with pytest.raises(TimeoutError):
+        run(asynchronous, 'write', TimeoutError())
+    # A step's exception is raised where it was yielded
+    assert run(asynchronous, 'recovering', TimeoutError()) == 'recovered'
+
+
+def test_operation_default_is_a_copy():
+    instance = component(fake_messaging(TimeoutError(), False))
+    first = instance.read()
+    first['changed'] = True
+    assert instance.read() == {}
+
+
+def test_batch_replies_decode_like_the_component(server):
+    client = clientlib('localhost', server.port, 'any-key')
+    assert client.connect()
+    try:
+        client.agents.add_plugin_agent(REGION, AGENT, {'pluginname': 'io.cresco.test'})
+        with client.messaging.batch() as batch:
+            batch.global_agent_msgevent(True, 'CONFIG', {'action': 'pluginlist'}, REGION, AGENT)
+            batch.global_agent_msgevent(True, 'CONFIG', {'action': 'getagentinfo'}, REGION, AGENT)
+        plugins, unrelated = batch.results
+        assert client.agents.decode_plugin_list(plugins) == client.agents.list_plugin_agent(REGION, AGENT)
+        assert len(client.agents.decode_plugin_list(plugins)) == 1
+        assert client.agents.decode_plugin_list(unrelated) == []
+    finally:
+        client.close()
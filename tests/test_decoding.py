@@ -0,0 +1,70 @@
+"""
+Reply decoder: where fields are decoded, by size and caller.
+"""
+import asyncio
+import threading
+
+import pytest
+
+from pycrescolib import decoding
+from pycrescolib.decoding import reply_decoder
+from pycrescolib.metrics import MetricsRegistry
+from pycrescolib.utils import compress_param, json_serialize
+
+
+@pytest.fixture
+def decoder():
+    decoder = reply_decoder(threshold=1000, threads=2, metrics=MetricsRegistry())
+    yield decoder
+    decoder.close()
+
+
+@pytest.fixture
+def threads(monkeypatch):
+    """Names of the threads ``decompress_json`` ran on."""
+    names = []
+    decompress_json = decoding.decompress_json
+
+    def recording_decompress_json(param):
+        names.append(threading.current_thread().name)
+        return decompress_json(param)
+
+    monkeypatch.setattr(decoding, 'decompress_json', recording_decompress_json)
+    return names
+
+
+def field(agents):
+    value = {'agents': [{'name': f'agent-{i:06d}', 'region': f'region-{i % 7}'} for i in range(agents)]}
+    return value, compress_param(json_serialize(value))
+
+
+def test_mode():
+    decoder = reply_decoder(threshold=100, threads=2, processes=1, process_threshold=1000)
+    assert decoder.mode(99) == 'inline'
+    assert decoder.mode(100) == 'thread'
+    assert decoder.mode(1000) == 'process'
+    assert reply_decoder(threshold=100, threads=0).mode(10 ** 9) == 'inline'
+    assert reply_decoder(threshold=100, processes=0).mode(10 ** 9) == 'thread'
+
+
+def test_decode_async_offloads_large_fields(decoder, threads):
+    small_value, small = field(1)
+    large_value, large = field(2000)
+    assert len(small) < decoder.threshold <= len(large)
+
+    async def main():
+        return await decoder.decode_async(small), await decoder.decode_async(large), threading.current_thread().name
+
+    small_result, large_result, loop_thread = asyncio.run(main())
+    assert (small_result, large_result) == (small_value, large_value)
+    assert threads[0] == loop_thread
+    assert threads[1].startswith('cresco-decode')
+    modes = {series['labels']['mode'] for series in decoder.metrics.snapshot()['histograms']['cresco_decode_seconds']}
+    assert modes == {'inline', 'thread'}
+
+
+def test_sync_decode_stays_on_the_calling_thread(decoder, threads):
+    value, param = field(2000)
+    assert decoder.mode(len(param)) == 'thread'
+    assert decoder.decode(param) == value
+    assert threads == [threading.current_thread().name]
@@ -0,0 +1,74 @@
+"""
+JAR metadata: ``get_jar_info`` and ``read_jar``, with and without the
+opt-in on-disk cache.
+"""
+import hashlib
+import os
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+from pycrescolib import utils
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def jar(tmp_path):
+    path = tmp_path / 'plugin.jar'
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('META-INF/MANIFEST.MF', 'Bundle-SymbolicName: io.cresco.test\nBundle-Version: 1.2.3\n')
+        archive.writestr('data.bin', os.urandom(5000))
+    # Older than the window in which modified files are not cached
+    os.utime(path, (1700000000, 1700000000))
+    return str(path)
+
+
+@pytest.fixture
+def restore_cache():
+    cache = utils.get_jar_cache()
+    yield
+    utils.set_jar_cache(cache)
+
+
+def test_jar_info(jar):
+    with open(jar, 'rb') as f:
+        data = f.read()
+    info = utils.get_jar_info(jar)
+    assert info == {'pluginname': 'io.cresco.test', 'version': '1.2.3', 'md5': hashlib.md5(data).hexdigest()}
+    assert utils.read_jar(jar) == (info, data)
+
+
+def test_cache_is_off_by_default(jar, tmp_path):
+    home = tmp_path / 'home'
+    home.mkdir()
+    env = {key: value for key, value in os.environ.items() if key != 'PYCRESCOLIB_JAR_CACHE'}
+    env.update(HOME=str(home), XDG_CACHE_HOME=str(home / '.cache'), PYTHONPATH=ROOT)
+    code = ('import sys; from pycrescolib import utils; '
+            'assert utils.get_jar_cache() is None; utils.get_jar_info(sys.argv[1])')
+    subprocess.run([sys.executable, '-c', code, jar], env=env, check=True)
+    assert list(home.iterdir()) == []
+
+
+@pytest.mark.parametrize('setting, enabled', [
+    ('on', True), ('off', False), ('', False), (None, False), (False, False), (True, True),
+])
+def test_set_jar_cache(setting, enabled, restore_cache):
+    cache = utils.set_jar_cache(setting)
+    assert (cache is not None) == enabled
+    assert utils.get_jar_cache() is cache
+
+
+def test_opt_in_cache_answers_without_reading(jar, tmp_path, restore_cache, monkeypatch):
+    path = str(tmp_path / 'jarinfo.json')
+    utils.set_jar_cache(path)
+    info = utils.get_jar_info(jar)
+    utils.get_jar_cache().save()
+    assert os.path.exists(path)
+
+    # A fresh cache on the same file knows the JAR without hashing it
+    utils.set_jar_cache(path)
+    monkeypatch.setattr(utils, '_md5_file', lambda *args: pytest.fail("JAR was hashed"))
+    assert utils.get_jar_info(jar) == info
@@ -0,0 +1,122 @@
+"""
+Metrics registry: series bookkeeping, the Prometheus text format, the
+exporters, and what a client records for its calls.
+"""
+import urllib.error
+import urllib.request
+
+import pytest
+
+from pycrescolib.clientlib import clientlib
+from pycrescolib.metrics import Histogram, MetricsRegistry
+from pycrescolib.standin import standin_server
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry()
+    registry.describe('jobs_total', 'Jobs run')
+    return registry
+
+
+def test_series_are_keyed_by_labels_in_any_order(registry):
+    registry.inc('jobs_total', {'queue': 'a', 'kind': 'x'})
+    registry.inc('jobs_total', {'kind': 'x', 'queue': 'a'}, 2)
+    registry.inc('jobs_total', {'queue': 'b'})
+    registry.set('depth', {'queue': 'a'}, 5)
+    registry.set('depth', {'queue': 'a'}, 3)
+
+    snapshot = registry.snapshot()
+    assert sorted(snapshot['counters']['jobs_total'], key=lambda series: series['value']) == [
+        {'labels': {'queue': 'b'}, 'value': 1},
+        {'labels': {'kind': 'x', 'queue': 'a'}, 'value': 3},
+    ]
+    assert snapshot['gauges']['depth'] == [{'labels': {'queue': 'a'}, 'value': 3}]
+
+    registry.enabled = False
+    registry.inc('jobs_total', {'queue': 'b'})
+    assert {'labels': {'queue': 'b'}, 'value': 1} in registry.snapshot()['counters']['jobs_total']
+
+    registry.reset()
+    assert registry.snapshot()['counters'] == {}
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram((1.0, 2.0, 4.0))
+    assert histogram.quantile(0.5) is None
+    for value in (0.5, 1.0, 1.5, 3.0, 10.0):
+        histogram.observe(value)
+    # Bounds are inclusive, like Prometheus' le
+    assert histogram.cumulative() == [2, 3, 4, 5]
+    assert histogram.count == 5 and histogram.sum == 16.0
+    assert histogram.quantile(0.2) == pytest.approx(0.5)
+    assert histogram.quantile(0.5) == pytest.approx(1.5)
+    # Values past the last bound are reported at it
+    assert histogram.quantile(0.99) == 4.0
+
+
+def test_prometheus_text_format(registry):
+    registry.inc('jobs_total', {'queue': 'say "hi"\n'})
+    registry.set('depth', None, 2.5)
+    registry.observe('job_seconds', {'queue': 'a'}, 0.003, buckets=(0.001, 0.01))
+
+    assert registry.to_prometheus().splitlines() == [
+        '# HELP jobs_total Jobs run',
+        '# TYPE jobs_total counter',
+        'jobs_total{queue="say \\"hi\\"\\n"} 1',
+        '# TYPE depth gauge',
+        'depth 2.5',
+        '# TYPE job_seconds histogram',
+        'job_seconds_bucket{queue="a",le="0.001"} 0',
+        'job_seconds_bucket{queue="a",le="0.01"} 1',
+        'job_seconds_bucket{queue="a",le="+Inf"} 1',
+        'job_seconds_sum{queue="a"} 0.003',
+        'job_seconds_count{queue="a"} 1',
+    ]
+
+
+def test_file_and_http_exporters(registry, tmp_path):
+    registry.inc('jobs_total', {'queue': 'a'})
+    path = tmp_path / 'cresco.prom'
+    registry.write_prometheus(str(path))
+    assert path.read_text() == registry.to_prometheus()
+    assert [entry.name for entry in tmp_path.iterdir()] == ['cresco.prom']
+
+    server = registry.start_http_exporter(0)
+    try:
+        url = f'http://127.0.0.1:{server.server_address[1]}'
+        with urllib.request.urlopen(f'{url}/metrics') as response:
+            assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+            assert response.read().decode('utf-8') == registry.to_prometheus()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f'{url}/other')
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_client_records_each_call():
+    metrics = MetricsRegistry()
+    with standin_server(port=0, agents=2, regions=1, agent_delays={'agent-000001': 1.0}) as server:
+        client = clientlib('localhost', server.port, 'any-key', metrics=metrics)
+        assert client.connect()
+        try:
+            for _ in range(3):
+                client.agents.get_agent_info('region-0', 'agent-000000')
+            client.messaging.global_agent_msgevent(True, 'CONFIG', {'action': 'getagentinfo'},
+                                                   'region-0', 'agent-000001', timeout=0.1)
+        finally:
+            client.close()
+
+    labels = {'message_type': 'global_agent_msgevent', 'action': 'getagentinfo', 'dst_region': 'region-0'}
+    snapshot = metrics.snapshot()
+
+    def series(kind, name):
+        return [entry for entry in snapshot[kind].get(name, []) if entry['labels'] == labels]
+
+    assert series('counters', 'cresco_rpc_requests_total')[0]['value'] == 4
+    assert series('counters', 'cresco_rpc_timeouts_total')[0]['value'] == 1
+    assert series('histograms', 'cresco_rpc_latency_seconds')[0]['count'] == 3
+    assert series('histograms', 'cresco_rpc_response_bytes')[0]['count'] == 3
+    assert snapshot['histograms']['cresco_ws_connect_seconds'][0]['count'] == 1
+    assert 'cresco_rpc_requests_total{action="getagentinfo"' in metrics.to_prometheus()
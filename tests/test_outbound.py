@@ -0,0 +1,95 @@
+"""
+Fire-and-forget messages: queued by the caller, written in batches by the
+event loop, with failures reported to ``on_send_error``.
+"""
+import asyncio
+import threading
+import time
+
+from pycrescolib.clientlib import clientlib
+from pycrescolib.metrics import MetricsRegistry
+from pycrescolib.standin import standin_server
+from pycrescolib.wc_interface import ws_interface
+
+AGENTS = 200
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def broadcast(client, agents):
+    for agent in agents:
+        assert client.messaging.global_agent_msgevent(
+            False, 'CONFIG', {'action': 'pluginadd', 'configparams': '{}'}, agent['region'], agent['name']) is None
+
+
+def test_broadcast_returns_at_once_and_is_delivered_in_batches(monkeypatch):
+    batches = []
+    writable = threading.Event()
+    write_batch = ws_interface._write_batch
+
+    async def held_write_batch(self, batch):
+        # Nothing is written until the test allows it
+        while not writable.is_set():
+            await asyncio.sleep(0.01)
+        batches.append(len(batch))
+        return await write_batch(self, batch)
+
+    monkeypatch.setattr(ws_interface, '_write_batch', held_write_batch)
+
+    with standin_server(port=0, agents=AGENTS, regions=4) as server:
+        client = clientlib('localhost', server.port, 'any-key', metrics=MetricsRegistry())
+        assert client.connect()
+        try:
+            start = time.perf_counter()
+            broadcast(client, server.agents)
+            elapsed = time.perf_counter() - start
+            assert server.requests == 0
+            assert client.ws_interface.outbound() > 0
+
+            writable.set()
+            assert client.messaging.flush(timeout=10)
+            assert wait_for(lambda: server.requests == AGENTS)
+            assert sum(len(plugins) for plugins in server.plugins.values()) == AGENTS
+        finally:
+            client.close()
+
+    assert elapsed < 1.0
+    assert sum(batches) == AGENTS
+    assert len(batches) < AGENTS
+
+
+def test_failed_writes_reach_on_send_error():
+    failures = []
+    metrics = MetricsRegistry()
+    reported = threading.Event()
+
+    def on_send_error(message_info, error):
+        failures.append((message_info['dst_agent'], type(error)))
+        if len(failures) == 3:
+            reported.set()
+
+    server = standin_server(port=0, agents=3, regions=1).start()
+    client = clientlib('localhost', server.port, 'any-key', metrics=metrics, on_send_error=on_send_error)
+    try:
+        assert client.connect()
+        client.ws_interface.reconnect_wait = 0.2
+        server.stop()
+        assert wait_for(lambda: not client.ws_interface.connected())
+
+        start = time.perf_counter()
+        broadcast(client, server.agents)
+        assert time.perf_counter() - start < 0.5
+
+        assert reported.wait(5)
+        assert sorted(failures) == [(agent['name'], ConnectionError) for agent in server.agents]
+        errors = metrics.snapshot()['counters']['cresco_ws_outbound_errors_total']
+        assert errors == [{'labels': {}, 'value': 3}]
+    finally:
+        client.close()
@@ -0,0 +1,99 @@
+"""
+Pooled apisocket connections: least-loaded dispatch and the bulk reservation.
+"""
+import concurrent.futures
+import json
+import time
+
+import pytest
+
+from pycrescolib.clientlib import clientlib
+from pycrescolib.recording import SENT, read_recording
+from pycrescolib.standin import standin_server
+
+REGION = 'region-0'
+SLOW = 'agent-000000'
+FAST = 'agent-000001'
+BULK_THRESHOLD = 4096
+
+
+@pytest.fixture
+def server():
+    with standin_server(port=0, agents=2, regions=1, agent_delays={SLOW: 0.5}) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server, tmp_path):
+    client = clientlib('localhost', server.port, 'any-key', pool_size=3, bulk_threshold=BULK_THRESHOLD,
+                       record=str(tmp_path / 'pool.rec'))
+    assert client.connect()
+    client.messaging.coalesce = False
+    yield client
+    client.close()
+
+
+def agent_info(client, agent):
+    reply = client.messaging.global_agent_msgevent(True, 'CONFIG', {'action': 'getagentinfo'}, REGION, agent)
+    return reply['agent-data']['name']
+
+
+def sent_actions(client):
+    """Actions written on each pool member, in member order."""
+    client.recorder.flush()
+    channels = {member._channel: index for index, member in enumerate(client.ws_interface.members)}
+    actions = [[] for _ in channels]
+    for record in read_recording(client.recorder.path):
+        if record.direction == SENT:
+            actions[channels[record.channel]].append(json.loads(record.frame)['message_payload']['action'])
+    return actions
+
+
+def test_requests_go_to_the_least_loaded_connection(client):
+    pool = client.ws_interface
+    small, bulk = pool.members[:2], pool.members[2]
+    # Until a connection has seen the controller echo request IDs, it sends
+    # one request at a time
+    for member in small:
+        request_id = pool.next_request_id()
+        member.exchange(json.dumps({
+            'message_info': {'message_type': 'global_controller_msgevent', 'message_event_type': 'EXEC',
+                             'is_rpc': True, 'request_id': request_id},
+            'message_payload': {'action': 'globalinfo'},
+        }), request_id=request_id)
+
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        slow = [executor.submit(agent_info, client, SLOW) for _ in range(2)]
+        deadline = time.monotonic() + 5
+        while pool.in_flight() < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # One slow request on each small connection, none on the bulk one
+        assert [member.in_flight() for member in small] == [1, 1]
+        assert bulk.in_flight() == 0
+
+        # A fast request is not stuck behind either slow one
+        start = time.perf_counter()
+        assert agent_info(client, FAST) == FAST
+        assert time.perf_counter() - start < 0.4
+        assert [future.result() for future in slow] == [SLOW, SLOW]
+
+
+def test_large_messages_use_the_bulk_connection(client):
+    jar = {'action': 'pluginupload', 'jardata': 'x' * BULK_THRESHOLD}
+    assert client.messaging.global_agent_msgevent(True, 'CONFIG', jar, REGION, FAST)['status_code'] == '10'
+    assert agent_info(client, FAST) == FAST
+    # Control messages stay off the bulk connection whatever their size
+    control = {'action': 'iscontrolleractive', 'padding': 'x' * BULK_THRESHOLD}
+    assert client.messaging.global_agent_msgevent(True, 'EXEC', control, REGION, FAST)['is_controller_active']
+
+    actions = sent_actions(client)
+    assert actions[2] == ['pluginupload']
+    assert sorted(actions[0] + actions[1]) == ['getagentinfo', 'iscontrolleractive']
+
+
+def test_bulk_falls_back_to_small_connections_when_down(client):
+    client.ws_interface.members[2].close()
+    jar = {'action': 'pluginupload', 'jardata': 'x' * BULK_THRESHOLD}
+    assert client.messaging.global_agent_msgevent(True, 'CONFIG', jar, REGION, FAST)['status_code'] == '10'
+    small, _, bulk = sent_actions(client)
+    assert 'pluginupload' in small and not bulk
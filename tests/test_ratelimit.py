@@ -0,0 +1,139 @@
+"""
+Token buckets and the rate limiter, on a fake clock.
+"""
+import threading
+
+import pytest
+
+from pycrescolib import ratelimit
+from pycrescolib.metrics import MetricsRegistry
+from pycrescolib.ratelimit import rate_limited, rate_limiter, token_bucket
+
+CONTROLLER = {'message_type': 'global_controller_msgevent'}
+
+
+def to_agent(agent, region='region-0'):
+    return {'message_type': 'global_agent_msgevent', 'dst_region': region, 'dst_agent': agent}
+
+
+class fake_clock:
+    """Stands in for the ``time`` module; ``sleep`` advances the clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+        self.gate = None  # When set, sleep blocks until it is
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = fake_clock()
+    monkeypatch.setattr(ratelimit, 'time', clock)
+    return clock
+
+
+def test_bucket_refill_and_burst(clock):
+    bucket = token_bucket(rate=10, burst=3)
+    for _ in range(3):
+        assert bucket.delay(clock.now) == 0
+        bucket.take()
+    assert bucket.delay(clock.now) == pytest.approx(0.1)
+
+    clock.now += 0.25
+    assert bucket.tokens == 0
+    assert bucket.delay(clock.now) == 0
+    assert bucket.tokens == pytest.approx(2.5)
+
+    # Refill stops at the burst size
+    clock.now += 60
+    assert bucket.idle(clock.now)
+    assert bucket.tokens == 3
+
+
+def test_default_burst_is_one_second_of_rate(clock):
+    assert token_bucket(rate=20).burst == 20
+    assert token_bucket(rate=0.5).burst == 1
+    with pytest.raises(ValueError):
+        token_bucket(rate=0)
+
+
+def test_block_waits_for_its_slot(clock):
+    limiter = rate_limiter(rate=10, burst=2, metrics=MetricsRegistry())
+    for _ in range(4):
+        limiter.acquire(CONTROLLER)
+    # Each caller past the burst waits one refill interval for its slot
+    assert clock.sleeps == [pytest.approx(0.1), pytest.approx(0.1)]
+    assert limiter.waiting() == 0
+
+
+def test_reject_fails_at_once(clock):
+    metrics = MetricsRegistry()
+    limiter = rate_limiter(rate=10, burst=2, policy='reject', metrics=metrics)
+    limiter.acquire(CONTROLLER)
+    limiter.acquire(CONTROLLER)
+    with pytest.raises(rate_limited):
+        limiter.acquire(CONTROLLER)
+    assert clock.sleeps == []
+    assert metrics.snapshot()['counters']['cresco_ratelimit_rejected_total'] == [
+        {'labels': {'scope': 'controller'}, 'value': 1}]
+
+    clock.now += 0.1
+    limiter.acquire(CONTROLLER)
+
+
+def test_full_queue_rejects_further_callers(clock):
+    limiter = rate_limiter(rate=1, burst=1, max_queue=2, metrics=MetricsRegistry())
+    limiter.acquire(CONTROLLER)
+
+    clock.gate = threading.Event()
+    waiters = [threading.Thread(target=limiter.acquire, args=(CONTROLLER,)) for _ in range(2)]
+    for waiter in waiters:
+        waiter.start()
+    while limiter.waiting() < 2:
+        threading.Event().wait(0.01)
+
+    with pytest.raises(rate_limited, match='already waiting'):
+        limiter.acquire(CONTROLLER)
+
+    clock.gate.set()
+    for waiter in waiters:
+        waiter.join()
+    assert limiter.waiting() == 0
+
+
+def test_max_wait_rejects_long_waits(clock):
+    limiter = rate_limiter(rate=1, burst=1, max_wait=1.5, metrics=MetricsRegistry())
+    limiter.acquire(CONTROLLER)
+    limiter.acquire(CONTROLLER)  # Waits 1s
+    clock.now -= 1  # As if the second caller were still waiting
+    with pytest.raises(rate_limited, match='exceeds'):
+        limiter.acquire(CONTROLLER)  # Would wait 2s
+
+
+def test_destination_buckets_sit_beside_the_controller_bucket(clock):
+    metrics = MetricsRegistry()
+    limiter = rate_limiter(rate=100, burst=3, destination_rate=1, destination_burst=1, policy='reject',
+                           metrics=metrics)
+
+    limiter.acquire(to_agent('agent-a'))
+    with pytest.raises(rate_limited, match='destination region-0/agent-a'):
+        limiter.acquire(to_agent('agent-a'))
+    # Other agents and the controller itself have their own room
+    limiter.acquire(to_agent('agent-b'))
+    limiter.acquire(CONTROLLER)
+
+    # Every message also counts against the controller bucket
+    with pytest.raises(rate_limited, match='controller'):
+        limiter.acquire(to_agent('agent-c'))
+    assert sorted(series['labels']['scope']
+                  for series in metrics.snapshot()['counters']['cresco_ratelimit_rejected_total']) == [
+        'controller', 'destination']
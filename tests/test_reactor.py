@@ -0,0 +1,128 @@
+"""
+Shared reactor: streams run as tasks on a fixed set of loop threads that
+the client owns and stops on close.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pycrescolib.clientlib import clientlib
+from pycrescolib.reactor import reactor
+from pycrescolib.standin import standin_server
+
+CONNECT_TIMEOUT = 5.0
+
+
+def reactor_threads():
+    return [thread for thread in threading.enumerate() if thread.name.startswith('cresco-reactor')]
+
+
+class collector:
+    """Callback that signals once it has been called."""
+
+    def __init__(self):
+        self.messages = []
+        self.done = threading.Event()
+
+    def __call__(self, message):
+        self.messages.append(message)
+        self.done.set()
+
+
+def test_loops_start_on_first_use_and_streams_go_to_the_least_loaded():
+    shared = reactor(threads=2)
+    assert not shared.running() and not reactor_threads()
+    try:
+        first, second, third = shared.acquire(), shared.acquire(), shared.acquire()
+        assert shared.running() and len(reactor_threads()) == 2
+        assert first is not second and third is first
+        assert first.is_running() and second.is_running()
+        assert shared.streams() == 3
+
+        shared.release(first)
+        shared.release(first)
+        shared.release(first)  # Extra releases do not go below zero
+        assert shared.streams() == 1
+        assert shared.acquire() is first
+    finally:
+        shared.stop()
+
+    assert not shared.running() and not reactor_threads()
+    assert shared.streams() == 0
+    with pytest.raises(ValueError):
+        reactor(threads=0)
+
+
+def test_stop_cancels_tasks_still_scheduled():
+    shared = reactor()
+    loop = shared.acquire()
+    started = threading.Event()
+    cancelled = threading.Event()
+
+    async def forever():
+        started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    asyncio.run_coroutine_threadsafe(forever(), loop)
+    assert started.wait(5)
+    start = time.perf_counter()
+    shared.stop()
+    assert cancelled.is_set()
+    assert time.perf_counter() - start < 2.0
+    assert not reactor_threads()
+
+
+def test_client_streams_share_the_reactor_and_stop_with_the_client():
+    with standin_server(port=0, agents=2, regions=1, log_interval=0.05) as server:
+        client = clientlib('localhost', server.port, 'any-key', shared_reactor=True, reactor_threads=2)
+        try:
+            received = {name: collector() for name in ('a', 'b', 'c')}
+            planes = {name: client.get_dataplane(f'stream-{name}', callback=callback)
+                      for name, callback in received.items()}
+            logs = collector()
+            streamer = client.get_logstreamer('logs', callback=logs)
+
+            for stream in [*planes.values(), streamer]:
+                assert stream.connect(timeout=CONNECT_TIMEOUT)
+                assert stream._thread is None
+            # Four streams, two loop threads, no thread per stream
+            assert len(reactor_threads()) == 2
+            assert client.reactor.streams() == 4
+            assert len({stream._event_loop for stream in [*planes.values(), streamer]}) == 2
+
+            # Closing one stream leaves the shared loops running for the others
+            assert client.close_dataplane('stream-a')
+            assert client.reactor.streams() == 3
+            assert client.reactor.running()
+            planes['b'].send('still-running')
+            assert received['b'].done.wait(5)
+            streamer.update_config('region-0', 'agent-000000')
+            assert logs.done.wait(5)
+            assert not received['a'].messages
+        finally:
+            client.close()
+
+        assert not client.reactor.running()
+        assert not reactor_threads()
+
+
+def test_without_a_shared_reactor_each_stream_has_its_own_thread():
+    with standin_server(port=0, agents=2, regions=1) as server:
+        client = clientlib('localhost', server.port, 'any-key')
+        try:
+            assert client.reactor is None
+            planes = [client.get_dataplane(f'stream-{index}') for index in range(2)]
+            for plane in planes:
+                assert plane.connect(timeout=CONNECT_TIMEOUT)
+            assert all(plane._thread.is_alive() for plane in planes)
+            assert planes[0]._event_loop is not planes[1]._event_loop
+        finally:
+            client.close()
+
+        assert not any(plane._thread.is_alive() for plane in planes)
@@ -0,0 +1,67 @@
+"""
+Recordings: pairing recorded replies with their requests, and replaying them.
+"""
+import json
+
+from pycrescolib.recording import load_exchanges, replay_server, traffic_recorder
+
+
+def request(action, request_id=None):
+    message_info = {'message_type': 'global_controller_msgevent', 'message_event_type': 'EXEC', 'is_rpc': True}
+    if request_id is not None:
+        message_info['request_id'] = request_id
+    return json.dumps({'message_info': message_info, 'message_payload': {'action': action}})
+
+
+def record(path, frames):
+    with traffic_recorder(str(path)) as recorder:
+        channel = recorder.channel()
+        for sent, frame in frames:
+            (recorder.sent if sent else recorder.received)(channel, frame)
+
+
+def replies(path):
+    return [(payload['action'], json.loads(reply)['answer']) for _, payload, reply, _ in load_exchanges(str(path))]
+
+
+def test_replies_are_paired_by_request_id(tmp_path):
+    path = tmp_path / 'session.rec'
+    record(path, [
+        (True, request('a', 1)),
+        (True, request('b', 2)),
+        (True, request('c', 3)),
+        (False, json.dumps({'answer': 'c', 'message_info': {'request_id': 3}})),
+        (False, json.dumps({'answer': 'b', 'request_id': '2'})),
+        (False, json.dumps({'answer': 'a', 'request_id': 1})),
+    ])
+    assert replies(path) == [('a', 'a'), ('b', 'b'), ('c', 'c')]
+
+
+def test_replies_without_ids_are_paired_in_order(tmp_path):
+    path = tmp_path / 'session.rec'
+    record(path, [
+        (True, request('a', 1)),
+        (True, request('b', 2)),
+        (True, request('c')),
+        (False, json.dumps({'answer': 'a'})),
+        (False, json.dumps({'answer': 'b'})),
+        (False, json.dumps({'answer': 'c'})),
+        # A reply for an ID already answered in order is not paired again
+        (True, request('d', 4)),
+        (False, json.dumps({'answer': 'stale', 'request_id': 1})),
+        (False, json.dumps({'answer': 'd', 'message_info': {'request_id': 4}})),
+    ])
+    assert replies(path) == [('a', 'a'), ('b', 'b'), ('c', 'c'), ('d', 'd')]
+
+
+def test_replay_drops_recorded_ids(tmp_path):
+    path = tmp_path / 'session.rec'
+    record(path, [
+        (True, request('listagents', 7)),
+        (False, json.dumps({'answer': 'x', 'request_id': 7, 'message_info': {'request_id': 7}})),
+    ])
+    server = replay_server(str(path), port=0)
+    reply, delay = server.respond({'message_type': 'global_controller_msgevent', 'message_event_type': 'EXEC',
+                                   'is_rpc': True, 'request_id': 99}, {'action': 'listagents'})
+    assert reply == {'answer': 'x', 'message_info': {}}
+    assert delay == 0.0 and server.replayed == 1
@@ -0,0 +1,86 @@
+"""
+Reply routing on the apisocket against the stand-in controller.
+
+Every test checks that each caller gets the reply to its own request,
+whether or not the controller echoes ``request_id`` and whether or not its
+replies arrive in request order.
+"""
+import asyncio
+import concurrent.futures
+
+import pytest
+
+from pycrescolib.clientlib import AsyncClientlib, clientlib
+from pycrescolib.standin import standin_server
+
+REGION = 'region-0'
+AGENTS = ['agent-000000', 'agent-000001', 'agent-000002']
+
+
+def agent_info(client, agent, timeout=8.0):
+    """Name of the agent a ``getagentinfo`` reply describes, or None."""
+    reply = client.messaging.global_agent_msgevent(True, 'CONFIG', {'action': 'getagentinfo'},
+                                                   REGION, agent, timeout=timeout)
+    return (reply or {}).get('agent-data', {}).get('name')
+
+
+@pytest.fixture
+def server(request):
+    options = dict(agents=len(AGENTS), regions=1)
+    options.update(getattr(request, 'param', {}))
+    with standin_server(port=0, **options) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    client = clientlib('localhost', server.port, 'any-key', circuit_breakers=False)
+    assert client.connect()
+    yield client
+    client.close()
+
+
+@pytest.mark.parametrize('server', [
+    dict(echo_request_id=True, agent_delays={'agent-000000': 0.3}),
+    dict(echo_request_id=False, ordered=False, agent_delays={'agent-000000': 0.3}),
+    dict(echo_request_id=False, agent_delays={'agent-000000': 0.3}),
+], indirect=True, ids=['echo', 'no-echo-unordered', 'no-echo-ordered'])
+def test_concurrent_calls_get_their_own_reply(server, client):
+    with concurrent.futures.ThreadPoolExecutor(len(AGENTS)) as pool:
+        names = list(pool.map(lambda agent: agent_info(client, agent), AGENTS * 2))
+    assert names == AGENTS * 2
+
+
+@pytest.mark.parametrize('server', [
+    dict(echo_request_id=True, agent_delays={'agent-000000': 0.3}),
+    dict(echo_request_id=False, ordered=False, agent_delays={'agent-000000': 0.3}),
+], indirect=True, ids=['echo', 'no-echo-unordered'])
+def test_batch_replies_match_items(server, client):
+    with client.messaging.batch() as batch:
+        for agent in AGENTS:
+            batch.global_agent_msgevent(True, 'CONFIG', {'action': 'getagentinfo'}, REGION, agent)
+    assert [reply['agent-data']['name'] for reply in batch.results] == AGENTS
+
+
+@pytest.mark.parametrize('server', [
+    dict(echo_request_id=False, ordered=False, agent_delays={'agent-000000': 0.3}),
+], indirect=True)
+def test_async_concurrent_calls_get_their_own_reply(server):
+    async def main():
+        async with AsyncClientlib('localhost', server.port, 'any-key', circuit_breakers=False) as client:
+            replies = await asyncio.gather(*[
+                client.messaging.global_agent_msgevent(True, 'CONFIG', {'action': 'getagentinfo'}, REGION, agent)
+                for agent in AGENTS])
+        return [reply['agent-data']['name'] for reply in replies]
+
+    assert asyncio.run(main()) == AGENTS
+
+
+@pytest.mark.parametrize('server', [
+    dict(echo_request_id=False, agent_delays={'slow': 1.0}),
+], indirect=True)
+def test_late_reply_without_ids_is_not_handed_to_the_next_call(server, client):
+    assert agent_info(client, 'slow', timeout=0.4) is None
+    # The slow reply is still on its way; it must not answer these
+    assert [agent_info(client, agent) for agent in AGENTS] == AGENTS
+    assert client.messaging.ws_interface.connected()
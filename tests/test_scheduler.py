@@ -0,0 +1,99 @@
+"""
+Write scheduler lanes: control ahead of bulk, without starving bulk.
+"""
+import asyncio
+
+import pytest
+
+from pycrescolib.wc_interface import write_scheduler
+
+
+async def write(scheduler, lane, order, hold=0.0):
+    await scheduler.acquire(lane)
+    order.append(lane)
+    if hold:
+        await asyncio.sleep(hold)
+    scheduler.release()
+
+
+def test_control_goes_ahead_of_queued_bulk():
+    async def main():
+        scheduler = write_scheduler()
+        order = []
+        await scheduler.acquire('normal')  # A write in progress
+        tasks = [asyncio.ensure_future(write(scheduler, lane, order))
+                 for lane in ('bulk', 'bulk', 'normal', 'control', 'control')]
+        await asyncio.sleep(0)
+        assert scheduler.waiting() == {'control': 2, 'normal': 1, 'bulk': 2}
+        scheduler.release()
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(main()) == ['control', 'control', 'normal', 'bulk', 'bulk']
+
+
+def test_bulk_on_an_idle_socket_lets_scheduled_control_go_first():
+    async def main():
+        scheduler = write_scheduler()
+        order = []
+        bulk = asyncio.ensure_future(write(scheduler, 'bulk', order))
+        control = asyncio.ensure_future(write(scheduler, 'control', order))
+        await asyncio.gather(bulk, control)
+        return order
+
+    assert asyncio.run(main()) == ['control', 'bulk']
+
+
+def test_bulk_goes_after_bulk_every_overtakes():
+    async def main():
+        scheduler = write_scheduler(bulk_every=3, max_bulk_wait=60)
+        order = []
+        await scheduler.acquire('normal')
+        tasks = [asyncio.ensure_future(write(scheduler, 'bulk', order))]
+        tasks += [asyncio.ensure_future(write(scheduler, 'control', order)) for _ in range(8)]
+        await asyncio.sleep(0)
+        scheduler.release()
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(main()) == ['control'] * 3 + ['bulk'] + ['control'] * 5
+
+
+def test_bulk_progresses_under_sustained_control_traffic():
+    async def main():
+        scheduler = write_scheduler(bulk_every=1000, max_bulk_wait=0.1)
+        order = []
+        stop = asyncio.Event()
+
+        async def control_sender():
+            while not stop.is_set():
+                await write(scheduler, 'control', order, hold=0.005)
+
+        senders = [asyncio.ensure_future(control_sender()) for _ in range(4)]
+        await asyncio.sleep(0.02)
+        assert sum(scheduler.waiting().values()) > 0  # Control writers are always queued
+        waited = await asyncio.wait_for(scheduler.acquire('bulk'), 2)
+        scheduler.release()
+        stop.set()
+        await asyncio.gather(*senders)
+        return waited
+
+    waited = asyncio.run(main())
+    assert waited == pytest.approx(0.1, abs=0.08)
+
+
+def test_cancelled_waiter_does_not_block_the_socket():
+    async def main():
+        scheduler = write_scheduler()
+        order = []
+        await scheduler.acquire('normal')
+        cancelled = asyncio.ensure_future(write(scheduler, 'control', order))
+        waiting = asyncio.ensure_future(write(scheduler, 'normal', order))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        scheduler.release()
+        await asyncio.wait_for(waiting, 1)
+        return order
+
+    assert asyncio.run(main()) == ['normal']
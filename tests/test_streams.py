@@ -0,0 +1,110 @@
+"""
+Dataplane and logstreamer readiness: connect() returns when the activation
+frame arrives, or at once when the socket cannot be opened.
+"""
+import json
+import threading
+import time
+
+import pytest
+
+from pycrescolib.clientlib import clientlib
+from pycrescolib.dataplane import dataplane
+from pycrescolib.logstreamer import logstreamer
+from pycrescolib.standin import standin_server
+
+SERVICE_KEY = 'stream-key'
+CONNECT_TIMEOUT = 5.0
+
+
+@pytest.fixture
+def server():
+    with standin_server(port=0, agents=2, regions=1, service_key=SERVICE_KEY, log_interval=0.05) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    client = clientlib('localhost', server.port, SERVICE_KEY)
+    yield client
+    client.close()
+
+
+class collector:
+    """Callback that keeps what it is given and signals after ``count`` messages."""
+
+    def __init__(self, count=1):
+        self.messages = []
+        self.count = count
+        self.done = threading.Event()
+
+    def __call__(self, message):
+        self.messages.append(message)
+        if len(self.messages) >= self.count:
+            self.done.set()
+
+
+def test_dataplane_connect_returns_on_activation(server, client):
+    received = collector()
+    receiver = client.get_dataplane('stream-a', callback=received)
+    # A second subscriber to the same stream, outside the client's bookkeeping
+    sender = dataplane('localhost', server.port, 'stream-a', SERVICE_KEY)
+    try:
+        start = time.perf_counter()
+        assert receiver.connect(timeout=CONNECT_TIMEOUT)
+        assert sender.connect(timeout=CONNECT_TIMEOUT)
+        # Far sooner than the timeout: connect waits on the activation frame
+        assert time.perf_counter() - start < 1.0
+        assert receiver.is_active() and receiver._activated.is_set()
+
+        sender.send('frame-1')
+        assert received.done.wait(5)
+        assert received.messages[0] == 'frame-1'
+    finally:
+        sender.close()
+
+
+def test_dataplane_binary_frames_reach_the_binary_callback(client):
+    received = collector()
+    receiver = client.get_dataplane('stream-b', binary_callback=received)
+    assert receiver.connect(timeout=CONNECT_TIMEOUT)
+    receiver.send_binary(b'\x00\x01payload')
+    # The stand-in delivers to every socket on the stream, the sender included
+    assert received.done.wait(5)
+    assert received.messages == [b'\x00\x01payload']
+
+
+def test_dataplane_failed_connect_does_not_wait_for_the_timeout(server):
+    rejected = dataplane('localhost', server.port, 'stream-c', 'wrong-key')
+    try:
+        start = time.perf_counter()
+        assert not rejected.connect(timeout=CONNECT_TIMEOUT)
+        assert time.perf_counter() - start < 2.0
+        assert not rejected.is_active()
+    finally:
+        rejected.close()
+
+
+def test_logstreamer_connect_returns_on_activation_and_receives_lines(client):
+    received = collector(count=2)
+    streamer = client.get_logstreamer('logs', callback=received)
+
+    start = time.perf_counter()
+    assert streamer.connect(timeout=CONNECT_TIMEOUT)
+    assert time.perf_counter() - start < 1.0
+    assert streamer.isActive
+
+    streamer.update_config('region-0', 'agent-000000')
+    assert received.done.wait(5)
+    line = json.loads(received.messages[0])
+    assert (line['region_id'], line['agent_id'], line['loglevel']) == ('region-0', 'agent-000000', 'Trace')
+
+
+def test_logstreamer_failed_connect_does_not_wait_for_the_timeout(server):
+    rejected = logstreamer('localhost', server.port, 'wrong-key')
+    try:
+        start = time.perf_counter()
+        assert not rejected.connect(timeout=CONNECT_TIMEOUT)
+        assert time.perf_counter() - start < 2.0
+    finally:
+        rejected.close()
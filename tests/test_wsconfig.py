@@ -0,0 +1,121 @@
+"""
+Websocket link settings: presets, and deflate chosen per message size on
+each link.
+"""
+import threading
+
+import pytest
+
+from pycrescolib.clientlib import clientlib
+from pycrescolib.metrics import MetricsRegistry
+from pycrescolib.standin import standin_server
+from pycrescolib.wsconfig import PRESETS, ws_settings
+
+REGION = 'region-0'
+AGENT = 'agent-000000'
+COMPRESS_LIMIT = 16 * 1024
+
+
+def counter(metrics, name, labels):
+    return sum(series['value'] for series in metrics.snapshot()['counters'].get(name, [])
+               if series['labels'] == labels)
+
+
+def frames(metrics, link, direction):
+    """Deflated frames seen on a link in one direction."""
+    return sum(series['count'] for series in metrics.snapshot()['histograms'].get('cresco_ws_wire_bytes', [])
+               if series['labels'] == {'link': link, 'direction': direction})
+
+
+def test_presets_and_overrides():
+    assert vars(ws_settings()) == {**PRESETS['throughput'], 'compression_level': None}
+    settings = ws_settings.preset('throughput', compress_limit=1024, max_size=None)
+    assert (settings.compress_limit, settings.max_size, settings.max_queue) == (1024, None, 64)
+    with pytest.raises(ValueError):
+        ws_settings.preset('fastest')
+
+    # Deflate is only ever offered through the selective extension
+    kwargs = ws_settings.preset('uncompressed').connect_kwargs(MetricsRegistry())
+    assert kwargs['compression'] is None and 'extensions' not in kwargs
+    kwargs = ws_settings.preset('default').connect_kwargs(MetricsRegistry(), 'dataplane')
+    assert kwargs['compression'] is None and kwargs['max_size'] == 2 ** 20
+    [factory] = kwargs['extensions']
+    assert (factory.compress_limit, factory.link) == (None, 'dataplane')
+
+
+def test_client_takes_a_preset_name_or_settings():
+    assert clientlib('localhost', 1, 'key', websocket='uncompressed').ws_settings.compression is False
+    settings = ws_settings(compress_limit=1024)
+    client = clientlib('localhost', 1, 'key', websocket=settings)
+    assert client.ws_settings is settings
+    assert client.ws_interface.settings is settings
+    assert client.get_dataplane('stream').settings is settings
+    with pytest.raises(ValueError):
+        clientlib('localhost', 1, 'key', websocket='fastest')
+
+
+def test_apisocket_deflates_small_messages_and_skips_large_ones():
+    metrics = MetricsRegistry()
+    with standin_server(port=0, agents=2, regions=1) as server:
+        client = clientlib('localhost', server.port, 'any-key', metrics=metrics,
+                           websocket=ws_settings(compress_limit=COMPRESS_LIMIT))
+        assert client.connect()
+        try:
+            assert client.agents.get_agent_info(REGION, AGENT)['name'] == AGENT
+            assert frames(metrics, 'apisocket', 'sent') == 1
+            assert frames(metrics, 'apisocket', 'received') == 1
+
+            jar = {'action': 'pluginupload', 'jardata': 'x' * (COMPRESS_LIMIT + 1)}
+            assert client.messaging.global_agent_msgevent(True, 'CONFIG', jar, REGION, AGENT)['status_code'] == '10'
+        finally:
+            client.close()
+
+    # The upload went out as it was; only the reply to it was deflated
+    assert counter(metrics, 'cresco_ws_deflate_skipped_total', {'link': 'apisocket'}) == 1
+    assert frames(metrics, 'apisocket', 'sent') == 1
+    assert frames(metrics, 'apisocket', 'received') == 2
+    ratios = metrics.snapshot()['histograms']['cresco_ws_compression_ratio']
+    assert all(series['sum'] / series['count'] < 1 for series in ratios)
+
+
+def test_uncompressed_links_do_not_negotiate_deflate():
+    metrics = MetricsRegistry()
+    with standin_server(port=0, agents=2, regions=1) as server:
+        client = clientlib('localhost', server.port, 'any-key', metrics=metrics, websocket='uncompressed')
+        assert client.connect()
+        try:
+            assert client.agents.get_agent_info(REGION, AGENT)['name'] == AGENT
+            assert client.ws_interface.ws.protocol.extensions == []
+        finally:
+            client.close()
+
+    assert 'cresco_ws_wire_bytes' not in metrics.snapshot()['histograms']
+
+
+def test_dataplane_uses_the_client_settings_under_its_own_label():
+    metrics = MetricsRegistry()
+    received = []
+    delivered = threading.Event()
+
+    def on_binary(message):
+        received.append(message)
+        if len(received) == 2:
+            delivered.set()
+
+    with standin_server(port=0, agents=2, regions=1) as server:
+        client = clientlib('localhost', server.port, 'any-key', metrics=metrics,
+                           websocket=ws_settings(compress_limit=COMPRESS_LIMIT))
+        try:
+            plane = client.get_dataplane('stream', binary_callback=on_binary)
+            assert plane.connect(timeout=5)
+            plane.send_binary(b'small')
+            plane.send_binary(b'\x00' * (COMPRESS_LIMIT + 1))
+            assert delivered.wait(5)
+        finally:
+            client.close()
+
+    assert [len(message) for message in received] == [5, COMPRESS_LIMIT + 1]
+    # The stream name and the small frame were deflated, the large frame was not
+    assert frames(metrics, 'dataplane', 'sent') == 2
+    assert counter(metrics, 'cresco_ws_deflate_skipped_total', {'link': 'dataplane'}) == 1
+    assert frames(metrics, 'apisocket', 'sent') == 0